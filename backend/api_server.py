@@ -2,32 +2,62 @@
 """
 Einfacher HTTP Server für das Frontend.
 Serviert die ZIP-Archive und erlaubt CORS für die PWA.
+
+Jede Verbindung läuft in einem eigenen Thread, ein langsamer Download
+blockiert also keine anderen Requests. HTTP/1.1 mit Keep-Alive: Alle
+Antworten haben eine Content-Length, Dateien gehen per sendfile bzw. in
+Blöcken raus, ohne sie in den Speicher zu lesen.
 """
 import os
 import json
 from pathlib import Path
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import parse_qs, urlparse
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import parse_qs, unquote, urlparse
 
 from dotenv import load_dotenv
 
+from archive_catalog import ArchiveCatalog
+from month_pack import locate_day_file, open_day_member
+from zip_archive import ZipIndex
+
 load_dotenv()
 
 ARTICLES_DIR = Path(os.getenv('OUTPUT_DIR', './articles'))
+catalog = ArchiveCatalog(ARTICLES_DIR, float(os.getenv('CATALOG_CHECK_INTERVAL', 2)))
+zip_index = ZipIndex()
+# Sekunden, nach denen eine inaktive Keep-Alive-Verbindung geschlossen wird
+KEEP_ALIVE_TIMEOUT = float(os.getenv('KEEP_ALIVE_TIMEOUT', 15))
 
 class APIHandler(SimpleHTTPRequestHandler):
+    # Keep-Alive: Jede Antwort braucht Content-Length (oder schliesst die Verbindung)
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEP_ALIVE_TIMEOUT
+    # Header und Body sind getrennte Writes - ohne TCP_NODELAY bremst Nagle jede Antwort
+    disable_nagle_algorithm = True
+
     def end_headers(self):
         # CORS Headers für PWA
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         super().end_headers()
-    
+        self.headers_sent = True
+
     def do_OPTIONS(self):
         self.send_response(200)
+        self.send_header('Content-Length', '0')
         self.end_headers()
-    
+
+    def send_error_response(self, e):
+        """Antwortet mit 500 - oder bricht die Verbindung ab, wenn die Antwort schon läuft."""
+        if self.headers_sent:
+            # Content-Length ist bereits versprochen, der Client muss neu verbinden
+            self.close_connection = True
+            return
+        self.send_json(500, {'error': str(e)})
+
     def do_GET(self):
+        self.headers_sent = False
         parsed = urlparse(self.path)
         
         # API Endpoints
@@ -35,117 +65,206 @@ class APIHandler(SimpleHTTPRequestHandler):
             self.serve_latest()
         elif parsed.path == '/api/list':
             self.serve_list()
+        elif parsed.path.startswith('/api/catalog/'):
+            self.serve_day_catalog(parsed.path.split('/')[-1])
         elif parsed.path.startswith('/api/download/'):
             date = parsed.path.split('/')[-1]
             self.serve_zip(date)
+        elif parsed.path.startswith('/api/article/'):
+            member = unquote(parsed.path[len('/api/article/'):])
+            self.serve_article(member)
         else:
             super().do_GET()
     
+    def send_json(self, status, data):
+        """Sendet eine JSON-Antwort."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_catalog(self, cached):
+        """Sendet eine vorserialisierte Katalog-Antwort (304 bei passendem ETag)."""
+        etag = f'"{cached.etag}"'
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(cached.body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(cached.body)
+
     def serve_latest(self):
         """Gibt das neueste verfügbare Datum zurück."""
         try:
-            # Alle ZIP-Dateien finden
-            zips = sorted(ARTICLES_DIR.glob('*.zip'), reverse=True)
-            
-            if not zips:
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({'error': 'No archives found'}).encode())
+            latest = catalog.latest_response()
+
+            if not latest:
+                self.send_json(404, {'error': 'No archives found'})
                 return
-            
-            latest = zips[0]
-            date = latest.stem
-            
-            # Manifest laden falls vorhanden
-            manifest_path = ARTICLES_DIR / date / 'manifest.json'
-            manifest = {}
-            if manifest_path.exists():
-                with open(manifest_path, 'r') as f:
-                    manifest = json.load(f)
-            
-            response = {
-                'date': date,
-                'download_url': f'/api/download/{date}',
-                'manifest': manifest
-            }
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
-            
+
+            self.send_catalog(latest)
+
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+            self.send_error_response(e)
     
     def serve_list(self):
         """Gibt eine Liste aller verfügbaren Archive zurück."""
         try:
-            zips = sorted(ARTICLES_DIR.glob('*.zip'), reverse=True)
-            archives = []
-            
-            for zip_file in zips:
-                date = zip_file.stem
-                manifest_path = ARTICLES_DIR / date / 'manifest.json'
-                manifest = {}
-                if manifest_path.exists():
-                    with open(manifest_path, 'r') as f:
-                        manifest = json.load(f)
-                
-                archives.append({
-                    'date': date,
-                    'download_url': f'/api/download/{date}',
-                    'manifest': manifest
-                })
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({'archives': archives}).encode())
-            
+            self.send_catalog(catalog.list_response())
+
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+            self.send_error_response(e)
     
+    def serve_day_catalog(self, date):
+        """Gibt den Katalog eines Tages zurück (alle Artikel)."""
+        try:
+            day = catalog.day_response(date)
+            if not day:
+                self.send_json(404, {'error': 'Catalog not found'})
+                return
+
+            self.send_catalog(day)
+
+        except Exception as e:
+            self.send_error_response(e)
+
+    def parse_range(self, size, etag):
+        """Wertet Range/If-Range aus.
+
+        Returns:
+            (start, end) inklusive, None für die ganze Datei oder False,
+            wenn der Bereich nicht erfüllbar ist
+        """
+        header = self.headers.get('Range', '')
+        if not header.startswith('bytes=') or ',' in header:
+            return None  # Mehrere Bereiche werden nicht unterstützt
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range != etag:
+            return None
+
+        first, _, last = header[6:].strip().partition('-')
+        try:
+            if not first:
+                # Suffix: die letzten N Bytes
+                length = int(last)
+                if length <= 0:
+                    return False
+                return max(0, size - length), size - 1
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        except ValueError:
+            return None
+        if start >= size or start > end:
+            return False
+        return start, end
+
     def serve_zip(self, date):
-        """Serviert eine ZIP-Datei."""
+        """Serviert eine ZIP-Datei (ETag/304, Byte-Ranges, sendfile), lose oder aus dem Monats-Pack."""
         try:
-            zip_path = ARTICLES_DIR / f"{date}.zip"
+            day_file = locate_day_file(ARTICLES_DIR, zip_index, f"{date}.zip")
             
-            if not zip_path.exists():
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
+            if not day_file:
+                self.send_json(404, {'error': 'Archive not found'})
+                return
+
+            etag = f'"{day_file.etag or catalog.archive_etag(day_file.path)}"'
+            if etag in self.headers.get('If-None-Match', ''):
+                self.send_response(304)
+                self.send_header('ETag', etag)
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'Archive not found'}).encode())
                 return
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/zip')
-            self.send_header('Content-Disposition', f'attachment; filename="{date}.zip"')
-            self.send_header('Content-Length', str(zip_path.stat().st_size))
-            self.end_headers()
-            
-            with open(zip_path, 'rb') as f:
-                self.wfile.write(f.read())
+
+            with open(day_file.path, 'rb') as f:
+                size = day_file.size if day_file.packed else os.fstat(f.fileno()).st_size
+                byte_range = self.parse_range(size, etag)
+
+                if byte_range is False:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{size}')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                start, end = byte_range or (0, size - 1)
+                self.send_response(206 if byte_range else 200)
+                self.send_header('Content-Type', 'application/zip')
+                self.send_header('Content-Disposition', f'attachment; filename="{date}.zip"')
+                self.send_header('Content-Length', str(end - start + 1))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                if byte_range:
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+                self.end_headers()
+
+                # Kernel-sendfile statt die Datei in den Speicher zu lesen
+                if end >= start:
+                    self.connection.sendfile(f, offset=day_file.offset + start, count=end - start + 1)
                 
         except Exception as e:
-            self.send_response(500)
-            self.send_header('Content-Type', 'application/json')
+            self.send_error_response(e)
+
+    def serve_article(self, member):
+        """Serviert einen einzelnen Artikel aus dem Tages-ZIP (<datum>/<kategorie>/<datei>.md)."""
+        try:
+            date = member.split('/', 1)[0]
+            article = open_day_member(ARTICLES_DIR, zip_index, date, member)
+            if not article:
+                self.send_json(404, {'error': 'Article not found'})
+                return
+
+            use_gzip = article.is_deflated and 'gzip' in self.headers.get('Accept-Encoding', '')
+            etag = f'"{article.info.CRC:08x}-{article.size}' + ('-gz"' if use_gzip else '"')
+            if etag in self.headers.get('If-None-Match', ''):
+                article.close()
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/markdown; charset=utf-8')
+            if use_gzip:
+                body = article.iter_gzip()
+                self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(article.gzip_size()))
+            else:
+                body = article.iter_content()
+                self.send_header('Content-Length', str(article.size))
+            self.send_header('ETag', etag)
+            self.send_header('Vary', 'Accept-Encoding')
             self.end_headers()
-            self.wfile.write(json.dumps({'error': str(e)}).encode())
+
+            for chunk in body:
+                self.wfile.write(chunk)
+
+        except Exception as e:
+            self.send_error_response(e)
+
+class APIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Mehrere Geräte synchronisieren oft gleichzeitig
+    request_queue_size = 64
+
 
 def run_server(port=8000):
     """Startet den API Server."""
-    server = HTTPServer(('0.0.0.0', port), APIHandler)
+    server = APIServer(('0.0.0.0', port), APIHandler)
     print(f"✓ API Server läuft auf http://localhost:{port}")
     print(f"  - /api/latest    - Neuestes Archiv")
     print(f"  - /api/list      - Alle Archive")
+    print(f"  - /api/catalog/YYYY-MM-DD  - Artikel eines Tages")
     print(f"  - /api/download/YYYY-MM-DD - ZIP herunterladen")
+    print(f"  - /api/article/YYYY-MM-DD/kategorie/datei.md - Einzelner Artikel")
     print("\nDrücke Ctrl+C zum Beenden")
     
     try:
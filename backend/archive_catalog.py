@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Archiv-Katalog - Liste aller Tages-Archive für /api/list und /api/latest.
+
+Statt bei jedem Request alle ZIPs zu suchen und jedes manifest.json zu
+parsen, hält der Katalog die fertig serialisierten Antworten samt ETag im
+Speicher. Neu aufgebaut wird nur, wenn ein Archiv hinzugekommen oder
+verschwunden ist oder sich ein Manifest geändert hat; dabei werden
+nur geänderte Manifeste neu gelesen. Die Prüfung läuft höchstens alle
+check_interval Sekunden.
+
+Die Manifeste enthalten pro Artikel einen Eintrag (siehe day_catalog.py).
+In /api/list und /api/latest stehen nur die Anzahlen, die Artikelliste
+eines Tages liefert day_response().
+
+Das Manifest eines Tages kommt aus dem Tages-Ordner (Scraper) oder, wo es
+keinen gibt (Server), aus dem Tages-ZIP. Tage in Monats-Packs (siehe
+month_pack.py) erscheinen wie lose Archive, ihre Manifeste werden einmal
+pro Pack gelesen.
+
+Zusätzlich liefert der Katalog starke ETags für die ZIP-Downloads: einen
+Hash über den Inhalt, der nur neu berechnet wird, wenn sich Grösse oder
+Änderungszeit der Datei ändern.
+"""
+import json
+import time
+import hashlib
+import zipfile
+import threading
+from pathlib import Path
+
+from day_catalog import MANIFEST_NAME
+from month_pack import list_packs, read_pack_manifests
+
+
+class CatalogResponse:
+    """Vorserialisierte JSON-Antwort mit ETag."""
+
+    def __init__(self, data):
+        self.body = json.dumps(data).encode('utf-8')
+        self.etag = hashlib.sha1(self.body).hexdigest()[:20]
+
+
+class ArchiveCatalog:
+    """Katalog der Tages-Archive in einem Artikel-Verzeichnis."""
+
+    def __init__(self, articles_dir, check_interval: float = 2.0):
+        """
+        Args:
+            articles_dir: Verzeichnis mit den <datum>.zip Archiven
+            check_interval: Mindestabstand in Sekunden zwischen zwei
+                Prüfungen auf Änderungen
+        """
+        self.articles_dir = Path(articles_dir)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._signature = None
+        self._manifests = {}  # Datum -> (Datei-Signatur, Manifest)
+        self._packs = {}  # Pfad -> (Datei-Signatur, {Datum: Manifest})
+        self._list = None
+        self._latest = None
+        self._days = {}  # Datum -> (Datei-Signatur, CatalogResponse)
+        self._etags = {}  # Pfad -> (Datei-Signatur, ETag)
+
+    def _stat(self, path):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _manifest_signature(self, date):
+        """Signatur der Manifest-Quelle eines losen Tages: Ordner, sonst Tages-ZIP."""
+        file_signature = self._stat(self.articles_dir / date / MANIFEST_NAME)
+        if file_signature is not None:
+            return file_signature
+        zip_signature = self._stat(self.articles_dir / f"{date}.zip")
+        return ('zip',) + zip_signature if zip_signature else None
+
+    def _read_manifest(self, date, file_signature):
+        """Liest das Manifest aus der Quelle, zu der file_signature gehört."""
+        try:
+            if file_signature[0] == 'zip':
+                with zipfile.ZipFile(self.articles_dir / f"{date}.zip") as zf:
+                    return json.loads(zf.read(f"{date}/{MANIFEST_NAME}"))
+            with open(self.articles_dir / date / MANIFEST_NAME, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, KeyError, zipfile.BadZipFile, ValueError):
+            # Datei zwischen Prüfung und Lesen ersetzt/gelöscht oder ZIP ohne Manifest:
+            # die geänderte Signatur löst beim nächsten Refresh ein neues Lesen aus
+            return {}
+
+    def _dates(self):
+        return sorted((p.stem for p in self.articles_dir.glob('*.zip')), reverse=True)
+
+    def _packed(self):
+        """Gibt {Datum: (Pack-Signatur, Manifest)} aller Tage in Monats-Packs zurück."""
+        packed = {}
+        packs = {}
+        for path in list_packs(self.articles_dir):
+            file_signature = self._stat(path)
+            if file_signature is None:
+                continue
+            cached = self._packs.get(path)
+            if not cached or cached[0] != file_signature:
+                cached = (file_signature, read_pack_manifests(path))
+            packs[path] = cached
+            for date, manifest in cached[1].items():
+                packed[date] = (('pack',) + file_signature, manifest)
+        self._packs = packs
+        return packed
+
+    def _load_manifest(self, date, file_signature, packed=None):
+        """Gibt das Manifest eines Tages zurück (gecacht, solange die Datei gleich bleibt)."""
+        cached = self._manifests.get(date)
+        if cached and cached[0] == file_signature:
+            return cached[1]
+
+        manifest = {}
+        if packed is not None:
+            manifest = packed[1]
+        elif file_signature is not None:
+            manifest = self._read_manifest(date, file_signature)
+        self._manifests[date] = (file_signature, manifest)
+        return manifest
+
+    def _refresh(self):
+        """Baut die Antworten neu auf, falls sich Archive oder Manifeste geändert haben."""
+        now = time.monotonic()
+        if self._list is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+
+        loose = self._dates()
+        manifest_stats = {date: self._manifest_signature(date) for date in loose}
+        # Lose Dateien haben Vorrang (gleicher Tag gerade im Pack und noch lose)
+        packed = {date: value for date, value in self._packed().items() if date not in manifest_stats}
+        manifest_stats.update({date: value[0] for date, value in packed.items()})
+        dates = sorted(manifest_stats, reverse=True)
+        signature = tuple((date, manifest_stats[date]) for date in dates)
+        if signature == self._signature:
+            return
+
+        archives = [{
+            'date': date,
+            'download_url': f'/api/download/{date}',
+            'manifest': {key: value
+                         for key, value in self._load_manifest(date, manifest_stats[date],
+                                                               packed.get(date)).items()
+                         if key != 'articles'}
+        } for date in dates]
+
+        # Manifeste gelöschter Tage vergessen
+        for date in set(self._manifests) - set(dates):
+            del self._manifests[date]
+            self._days.pop(date, None)
+
+        self._list = CatalogResponse({'archives': archives})
+        self._latest = CatalogResponse(archives[0]) if archives else None
+        self._signature = signature
+
+    def list_response(self):
+        """Antwort für /api/list."""
+        with self._lock:
+            self._refresh()
+            return self._list
+
+    def latest_response(self):
+        """Antwort für /api/latest (None, wenn es keine Archive gibt)."""
+        with self._lock:
+            self._refresh()
+            return self._latest
+
+    def day_response(self, date):
+        """Antwort für /api/catalog/<datum>: Manifest mit allen Artikeln (None, wenn unbekannt)."""
+        with self._lock:
+            self._refresh()
+            cached = self._manifests.get(date)
+            if cached is None or not cached[1]:
+                return None
+            day = self._days.get(date)
+            if day is None or day[0] != cached[0]:
+                day = (cached[0], CatalogResponse(cached[1]))
+                self._days[date] = day
+            return day[1]
+
+    def archive_etag(self, path):
+        """Starker ETag (Inhalts-Hash) für eine Datei, gecacht nach Grösse/mtime."""
+        path = Path(path)
+        file_signature = self._stat(path)
+        with self._lock:
+            cached = self._etags.get(path)
+        if cached and cached[0] == file_signature:
+            return cached[1]
+
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        etag = digest.hexdigest()[:20]
+
+        with self._lock:
+            self._etags[path] = (file_signature, etag)
+        return etag
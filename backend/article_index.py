@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Artikel-Index - Metadaten und Volltextsuche über alle Tages-Archive (SQLite).
+
+Der Scraper trägt jeden Artikel beim Speichern ein (save_articles), der
+Server listet und sucht darin, ohne ein einziges ZIP zu öffnen. Pro Artikel
+liegen die Metadaten (Titel, URL, Kategorie, Zusammenfassung, Grösse,
+Archiv und Pfad im Archiv) und der Text in der Tabelle articles; der
+FTS5-Index verweist nur darauf (external content), so dass Snippets direkt
+aus der Datenbank kommen.
+
+Tokenisierung: unicode61 mit remove_diacritics 2 - "zurich" findet
+"Zürich", "Aerzte" aber nicht "Ärzte". Deutsche Komposita werden über
+Präfix-Suche gefunden: Jeder Suchbegriff ist ein Präfix ("bundes" findet
+"Bundesrat"), die Präfix-Indexe halten das auch über Jahre schnell.
+
+Neu aufbauen (z.B. für bestehende Archive oder auf dem Server):
+    python3 article_index.py --rebuild
+"""
+import os
+import re
+import sqlite3
+import zipfile
+import threading
+from pathlib import Path
+
+from day_bundle import parse_article_markdown
+from month_pack import list_packs, locate_day_file, read_pack_manifests
+from zip_archive import ZipIndex
+
+# Spalten des FTS-Index und ihre Gewichtung für bm25 (Titel zählt am meisten)
+FTS_COLUMNS = ('title', 'summary', 'content')
+FTS_WEIGHTS = (10.0, 4.0, 1.0)
+
+SNIPPET_TOKENS = 16
+# Markdown-Fett, der Client rendert Snippets wie den Artikeltext
+SNIPPET_MARK = ('**', '**')
+
+DATE_FOLDER = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Felder in Listen und Suchergebnissen (ohne Artikeltext)
+METADATA_COLUMNS = ('id', 'path', 'archive', 'day', 'category', 'title', 'url', 'date',
+                    'summary', 'size')
+
+
+def build_match_query(query):
+    """
+    Übersetzt eine Benutzereingabe in eine FTS5-Abfrage.
+
+    Wörter werden zu Präfix-Begriffen, "in Anführungszeichen" zu Phrasen,
+    alle Begriffe müssen vorkommen. Operatoren der FTS5-Syntax werden nicht
+    interpretiert, jede Eingabe ergibt eine gültige Abfrage.
+
+    Returns:
+        FTS5-Abfrage oder None, wenn die Eingabe keine Wörter enthält
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', query):
+        tokens = re.findall(r'\w+', phrase or word)
+        if not tokens:
+            continue
+        if phrase:
+            terms.append('"' + ' '.join(tokens) + '"')
+        else:
+            terms.extend(f'"{token}"*' for token in tokens)
+    return ' '.join(terms) or None
+
+
+class ArticleIndex:
+    """Metadaten- und Volltext-Index der gespeicherten Artikel."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Pfad zur SQLite-Datei (wird bei Bedarf erstellt)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self._connect()
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL UNIQUE,
+                day TEXT NOT NULL,
+                category TEXT NOT NULL,
+                title TEXT NOT NULL,
+                url TEXT,
+                date TEXT,
+                summary TEXT,
+                content TEXT,
+                size INTEGER,
+                archive TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_day ON articles (day);
+            CREATE INDEX IF NOT EXISTS idx_articles_category ON articles (category, day);
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                {', '.join(FTS_COLUMNS)},
+                content='articles', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3 4'
+            );
+        """)
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        """Ergänzt Spalten, die in älteren Index-Dateien fehlen."""
+        columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(articles)")}
+        if 'size' not in columns:
+            self._conn.execute("ALTER TABLE articles ADD COLUMN size INTEGER")
+            print("ℹ Artikel-Index: Grössen fehlen, bitte article_index.py --rebuild ausführen")
+        if 'archive' not in columns:
+            self._conn.execute("ALTER TABLE articles ADD COLUMN archive TEXT")
+            self._conn.execute("UPDATE articles SET archive = day || '.zip'")
+
+    def _connect(self):
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._inode = self.path.stat().st_ino
+
+    def reopen(self):
+        """Öffnet eine neue Verbindung (z.B. nach fork())."""
+        with self._lock:
+            self._connect()
+
+    def refresh(self):
+        """Öffnet die Datenbank neu, falls die Datei ersetzt wurde (z.B. per rsync)."""
+        try:
+            inode = self.path.stat().st_ino
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if inode != self._inode:
+                self._conn.close()
+                self._connect()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def _delete(self, paths):
+        """Entfernt Artikel aus Tabelle und FTS-Index (ohne Commit)."""
+        removed = 0
+        for path in paths:
+            row = self._conn.execute(
+                f"SELECT id, {', '.join(FTS_COLUMNS)} FROM articles WHERE path = ?", (path,)
+            ).fetchone()
+            if row is None:
+                continue
+            # External content: Der Index braucht die alten Werte zum Löschen
+            self._conn.execute(
+                f"INSERT INTO articles_fts (articles_fts, rowid, {', '.join(FTS_COLUMNS)}) "
+                f"VALUES ('delete', ?, ?, ?, ?)",
+                tuple(row)
+            )
+            self._conn.execute("DELETE FROM articles WHERE id = ?", (row['id'],))
+            removed += 1
+        return removed
+
+    def _insert(self, article):
+        day, category = article['path'].split('/')[:2]
+        cursor = self._conn.execute(
+            "INSERT INTO articles (path, day, category, title, url, date, summary, content, "
+            "size, archive) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (article['path'], day, category, article['title'], article.get('url'),
+             article.get('date'), article.get('summary') or '', article.get('content') or '',
+             article.get('size'), article.get('archive') or f"{day}.zip")
+        )
+        self._conn.execute(
+            f"INSERT INTO articles_fts (rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?)",
+            (cursor.lastrowid, article['title'], article.get('summary') or '',
+             article.get('content') or '')
+        )
+
+    def add(self, article):
+        """
+        Nimmt einen Artikel auf (ersetzt einen bestehenden mit gleichem Pfad).
+
+        Args:
+            article: Dict mit path ("datum/kategorie/datei.md"), title, url,
+                date, summary, content, size (Bytes der Markdown-Datei) und
+                optional archive (Standard: ZIP des Tages)
+        """
+        with self._lock:
+            self._delete([article['path']])
+            self._insert(article)
+            self._conn.commit()
+
+    def remove(self, paths):
+        """Entfernt Artikel anhand ihres Pfads und gibt die Anzahl zurück."""
+        with self._lock:
+            removed = self._delete(paths)
+            self._conn.commit()
+        return removed
+
+    def set_archive(self, month, archive):
+        """Setzt das Archiv aller Artikel eines Monats (z.B. nach dem Packen, siehe month_pack.py)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE articles SET archive = ? WHERE day LIKE ? || '-%'", (archive, month)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def list(self, category=None, date_from=None, date_to=None, after=None, limit=50):
+        """
+        Listet Artikel-Metadaten, neueste Tage zuerst (Keyset-Pagination).
+
+        Args:
+            category: Nur Artikel dieser Kategorie
+            date_from, date_to: Nur Tages-Archive in diesem Bereich (YYYY-MM-DD, inklusive)
+            after: (Tag, ID) des letzten Artikels der vorherigen Seite
+            limit: Maximale Anzahl Artikel
+
+        Returns:
+            Liste von Dicts mit METADATA_COLUMNS
+        """
+        sql = f"SELECT {', '.join(METADATA_COLUMNS)} FROM articles WHERE 1"
+        params = []
+        if category:
+            sql += " AND category = ?"
+            params.append(category)
+        if date_from:
+            sql += " AND day >= ?"
+            params.append(date_from)
+        if date_to:
+            sql += " AND day <= ?"
+            params.append(date_to)
+        if after:
+            sql += " AND (day < ? OR (day = ? AND id < ?))"
+            params += [after[0], after[0], after[1]]
+        sql += " ORDER BY day DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, query, category=None, date_from=None, date_to=None, limit=20, offset=0):
+        """
+        Sucht Artikel, die besten Treffer zuerst.
+
+        Args:
+            query: Suchbegriffe (siehe build_match_query)
+            category: Nur Artikel dieser Kategorie
+            date_from, date_to: Nur Tages-Archive in diesem Bereich (YYYY-MM-DD, inklusive)
+            limit, offset: Seite der Trefferliste
+
+        Returns:
+            Liste von Dicts mit METADATA_COLUMNS und snippet
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        sql = (
+            f"SELECT {', '.join('a.' + col for col in METADATA_COLUMNS)}, "
+            f"snippet(articles_fts, -1, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet "
+            "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+            "WHERE articles_fts MATCH ?"
+        )
+        params = [*SNIPPET_MARK, match]
+        if category:
+            sql += " AND a.category = ?"
+            params.append(category)
+        if date_from:
+            sql += " AND a.day >= ?"
+            params.append(date_from)
+        if date_to:
+            sql += " AND a.day <= ?"
+            params.append(date_to)
+        sql += f" ORDER BY bm25(articles_fts, {', '.join(map(str, FTS_WEIGHTS))}) LIMIT ? OFFSET ?"
+        params += [limit, offset]
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def rebuild(self, articles_dir):
+        """
+        Baut den Index aus allen Tages-Archiven neu auf.
+
+        Pro Tag wird der Ordner mit den Markdown-Dateien gelesen, falls
+        vorhanden (Scraper), sonst das ZIP (Server) bzw. das ZIP im
+        Monats-Pack.
+
+        Returns:
+            Anzahl indexierter Artikel
+        """
+        articles_dir = Path(articles_dir)
+        days = {p.stem for p in articles_dir.glob('*.zip')}
+        days |= {p.name for p in articles_dir.iterdir() if p.is_dir() and DATE_FOLDER.match(p.name)}
+        for pack in list_packs(articles_dir):
+            days |= set(read_pack_manifests(pack))
+
+        with self._lock:
+            self._conn.execute("DELETE FROM articles")
+            self._conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')")
+            count = 0
+            for day in sorted(days):
+                for path, text, size, archive in _read_day(articles_dir, day):
+                    self._insert({**parse_article_markdown(text, path), 'size': size,
+                                  'archive': archive})
+                    count += 1
+            self._conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+            self._conn.commit()
+        return count
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _read_day(articles_dir, day):
+    """Liefert (Pfad, Markdown, Grösse in Bytes, Archiv) aller Artikel eines Tages aus Ordner, ZIP oder Pack."""
+    folder = articles_dir / day
+    md_files = sorted(folder.glob('*/*.md')) if folder.is_dir() else []
+    if md_files:
+        for md_file in md_files:
+            data = md_file.read_bytes()
+            yield md_file.relative_to(articles_dir).as_posix(), data.decode('utf-8'), len(data), None
+        return
+
+    day_file = locate_day_file(articles_dir, ZipIndex(), f"{day}.zip")
+    if day_file is None:
+        return
+    archive = day_file.path.relative_to(articles_dir).as_posix()
+    with day_file.open() as f, zipfile.ZipFile(f) as zf:
+        for name in sorted(zf.namelist()):
+            if name.endswith('.md'):
+                data = zf.read(name)
+                yield name, data.decode('utf-8'), len(data), archive
+
+
+def main():
+    import argparse
+    import time
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description='Volltext-Index der Artikel')
+    arg_parser.add_argument('--rebuild', action='store_true',
+                            help='Index aus allen Tages-Ordnern und ZIPs neu aufbauen')
+    arg_parser.add_argument('--search', metavar='BEGRIFFE',
+                            help='Suche ausführen und Treffer ausgeben')
+    arg_parser.add_argument('--articles', default=None,
+                            help='Artikel-Verzeichnis (Standard: OUTPUT_DIR oder ./articles)')
+    args = arg_parser.parse_args()
+
+    articles_dir = Path(args.articles or os.getenv('OUTPUT_DIR', './articles'))
+    index = ArticleIndex(articles_dir / 'search.db')
+
+    if args.rebuild:
+        started = time.perf_counter()
+        count = index.rebuild(articles_dir)
+        print(f"✓ Index neu aufgebaut: {count} Artikel in {time.perf_counter() - started:.1f}s "
+              f"({index.path})")
+
+    if args.search:
+        started = time.perf_counter()
+        results = index.search(args.search)
+        print(f"ℹ {len(results)} Treffer in {(time.perf_counter() - started) * 1000:.1f} ms")
+        for hit in results:
+            print(f"  {hit['day']} [{hit['category']}] {hit['title']}")
+            print(f"    {hit['snippet']}")
+
+    if not args.rebuild and not args.search:
+        print(f"ℹ {len(index)} Artikel im Index ({index.path})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Kompressions-Wörterbuch - zstd-Wörterbuch aus bisherigen Artikeln.
+
+NZZ-Artikel teilen viel Text (Markdown-Header, Links, Wendungen, Namen).
+Ein einmal trainiertes Wörterbuch macht die Tages-Bundles deutlich
+kleiner: Der Scraper schreibt neben .json.br/.json.gz eine Variante
+<datum>.json.dcz, komprimiert mit zstd und dem aktuellen Wörterbuch.
+
+Ausgeliefert wird nach "Compression Dictionary Transport" (RFC 9842):
+- /api/dictionary/<version> liefert das Wörterbuch einmal aus (unveränderlich,
+  ein Jahr cachebar) mit "Use-As-Dictionary: match=/api/bundle/*"
+- Der Browser speichert es und sendet danach bei Bundles "Available-Dictionary"
+  (SHA-256 des Wörterbuchs) und "Accept-Encoding: dcz"
+- Passt der Hash, liefert der Server .json.dcz mit "Content-Encoding: dcz",
+  der Browser entpackt selbst. Alle anderen Clients bekommen wie bisher br/gzip
+
+Ein dcz-Stream ist ein fester Header (Magic + SHA-256 des Wörterbuchs) und
+danach ein zstd-Frame, das Wörterbuch wird als Raw-Content verwendet.
+Versionen bleiben liegen: Clients mit einem älteren Wörterbuch bekommen für
+damit komprimierte Tage weiterhin dcz.
+
+Optional: Ohne das Paket zstandard oder ohne trainiertes Wörterbuch gibt es
+keine .dcz-Variante.
+
+    python3 compression_dict.py --train       # Neue Version aus den letzten 60 Tagen
+    python3 compression_dict.py --benchmark   # Grösse und Entpack-Zeit gegenüber ZIP/gzip/Brotli
+"""
+import io
+import os
+import re
+import gzip
+import json
+import time
+import base64
+import hashlib
+import zipfile
+from pathlib import Path
+
+from month_pack import list_packs, locate_day_file, read_pack_manifests
+from safe_io import atomic_write
+from zip_archive import ZipIndex
+
+DICT_DIR = 'dictionaries'
+DICT_SUFFIX = '.dict'
+# Grösse des Wörterbuchs (zstd-Standard, ein Download pro Version)
+DICT_SIZE = 112 * 1024
+ZSTD_LEVEL = 19
+
+# Header eines dcz-Streams (RFC 9842): Magic, danach SHA-256 des Wörterbuchs
+DCZ_MAGIC = b'\x5e\x2a\x4d\x18\x20\x00\x00\x00'
+DCZ_HEADER_SIZE = len(DCZ_MAGIC) + 32
+
+# Bundle-Match für Use-As-Dictionary
+DICT_MATCH = '/api/bundle/*'
+
+_VERSION = re.compile(r'^v(\d+)$')
+
+
+def load_zstandard():
+    """Importiert zstandard (optional) - None, wenn das Paket fehlt."""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def parse_available_dictionary(value):
+    """Liest den Header Available-Dictionary (":<base64>:") und gibt den SHA-256 zurück."""
+    value = (value or '').strip()
+    if len(value) < 3 or value[0] != ':' or value[-1] != ':':
+        return None
+    try:
+        digest = base64.b64decode(value[1:-1], validate=True)
+    except ValueError:
+        return None
+    return digest if len(digest) == 32 else None
+
+
+def dcz_dictionary_hash(header):
+    """SHA-256 des Wörterbuchs aus den ersten DCZ_HEADER_SIZE Bytes eines dcz-Streams."""
+    if len(header) < DCZ_HEADER_SIZE or not header.startswith(DCZ_MAGIC):
+        return None
+    return header[len(DCZ_MAGIC):DCZ_HEADER_SIZE]
+
+
+class CompressionDictionary:
+    """Eine Version des Wörterbuchs."""
+
+    def __init__(self, version, data):
+        self.version = version
+        self.data = data
+        self.sha256 = hashlib.sha256(data).digest()
+
+    @property
+    def header_hash(self):
+        """SHA-256 wie im Header Available-Dictionary."""
+        return ':' + base64.b64encode(self.sha256).decode('ascii') + ':'
+
+    def _zstd_dict(self, zstandard):
+        return zstandard.ZstdCompressionDict(self.data, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+
+    def compress(self, data, level=ZSTD_LEVEL):
+        """Komprimiert data als dcz-Stream."""
+        zstandard = load_zstandard()
+        compressor = zstandard.ZstdCompressor(level=level, dict_data=self._zstd_dict(zstandard))
+        return DCZ_MAGIC + self.sha256 + compressor.compress(data)
+
+    def decompress(self, payload):
+        """Entpackt einen dcz-Stream (für Tests und Benchmark)."""
+        if dcz_dictionary_hash(payload) != self.sha256:
+            raise ValueError("dcz-Stream passt nicht zu diesem Wörterbuch")
+        zstandard = load_zstandard()
+        decompressor = zstandard.ZstdDecompressor(dict_data=self._zstd_dict(zstandard))
+        return decompressor.decompress(payload[DCZ_HEADER_SIZE:])
+
+
+class DictionaryStore:
+    """Versionen des Wörterbuchs in articles/dictionaries/v<N>.dict."""
+
+    def __init__(self, articles_dir):
+        self.path = Path(articles_dir) / DICT_DIR
+        self._cache = {}  # Version -> (Datei-Signatur, CompressionDictionary)
+
+    def versions(self):
+        """Alle Versionen, älteste zuerst."""
+        numbers = []
+        for path in self.path.glob(f'v*{DICT_SUFFIX}'):
+            match = _VERSION.match(path.stem)
+            if match:
+                numbers.append(int(match.group(1)))
+        return [f'v{number}' for number in sorted(numbers)]
+
+    def get(self, version):
+        """Lädt eine Version (None, wenn es sie nicht gibt)."""
+        if not _VERSION.match(version or ''):
+            return None
+        path = self.path / f'{version}{DICT_SUFFIX}'
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self._cache.get(version)
+        if not cached or cached[0] != signature:
+            cached = (signature, CompressionDictionary(version, path.read_bytes()))
+            self._cache[version] = cached
+        return cached[1]
+
+    def latest(self):
+        """Neueste Version oder None."""
+        versions = self.versions()
+        return self.get(versions[-1]) if versions else None
+
+    def file_path(self, version):
+        return self.path / f'{version}{DICT_SUFFIX}'
+
+    def train(self, samples, size=DICT_SIZE):
+        """
+        Trainiert eine neue Version aus Beispiel-Texten und speichert sie.
+
+        Returns:
+            CompressionDictionary der neuen Version
+        """
+        zstandard = load_zstandard()
+        if zstandard is None:
+            raise RuntimeError("Paket zstandard nicht installiert (pip install zstandard)")
+
+        trained = zstandard.train_dictionary(size, samples).as_bytes()
+        # dcz verwendet das Wörterbuch als Raw-Content: ohne zstd-Magic und ID,
+        # sonst könnte ein Client es als formatiertes Wörterbuch interpretieren
+        data = trained[8:]
+
+        versions = self.versions()
+        version = f"v{int(versions[-1][1:]) + 1 if versions else 1}"
+        self.path.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.file_path(version), data)
+        return self.get(version)
+
+
+def _bundle_articles(articles_dir, day):
+    """Artikel eines Tages aus dem gzip-Bundle (lose oder im Monats-Pack)."""
+    day_file = locate_day_file(articles_dir, ZipIndex(), f"{day}.json.gz")
+    if day_file is None:
+        return []
+    with day_file.open() as f, gzip.GzipFile(fileobj=f) as gz:
+        return json.load(gz)['articles']
+
+
+def _bundle_days(articles_dir):
+    """Alle Tage mit Bundle, älteste zuerst."""
+    days = {p.name[:-len('.json.gz')] for p in Path(articles_dir).glob('*.json.gz')}
+    for pack in list_packs(articles_dir):
+        days |= set(read_pack_manifests(pack))
+    return sorted(days)
+
+
+def training_samples(articles_dir, days):
+    """Ein Sample pro Artikel, serialisiert wie im Bundle."""
+    samples = []
+    for day in days:
+        for article in _bundle_articles(articles_dir, day):
+            samples.append(json.dumps(article, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return samples
+
+
+def benchmark(articles_dir, days, dictionary):
+    """Vergleicht pro Tag Grösse und Entpack-Zeit von ZIP, gzip, Brotli, zstd und dcz."""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    zstandard = load_zstandard()
+    zip_index = ZipIndex()
+    totals = {}
+
+    def measure(name, size, decode):
+        start = time.perf_counter()
+        decode()
+        elapsed = (time.perf_counter() - start) * 1000
+        total = totals.setdefault(name, [0, 0.0])
+        total[0] += size
+        total[1] += elapsed
+        return f"{name} {size / 1024:7.1f} KB {elapsed:6.1f} ms"
+
+    print(f"→ Wörterbuch {dictionary.version} ({len(dictionary.data) / 1024:.0f} KB), {len(days)} Tage")
+    for day in days:
+        articles = _bundle_articles(articles_dir, day)
+        data = json.dumps({'version': 1, 'date': day, 'articles': articles},
+                          ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        results = []
+
+        zip_file = locate_day_file(articles_dir, zip_index, f"{day}.zip")
+        if zip_file:
+            with zip_file.open() as f:
+                zip_data = f.read()
+
+            def read_zip():
+                with zipfile.ZipFile(io.BytesIO(zip_data)) as zf:
+                    for name in zf.namelist():
+                        zf.read(name)
+            results.append(measure('zip', len(zip_data), read_zip))
+
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        results.append(measure('gzip', len(compressed), lambda: gzip.decompress(compressed)))
+        if brotli:
+            compressed_br = brotli.compress(data, quality=11)
+            results.append(measure('br', len(compressed_br), lambda: brotli.decompress(compressed_br)))
+
+        plain = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        results.append(measure('zstd', len(plain), lambda: zstandard.ZstdDecompressor().decompress(plain)))
+        dcz = dictionary.compress(data)
+        results.append(measure('dcz', len(dcz), lambda: dictionary.decompress(dcz)))
+
+        # Jeder Artikel einzeln (wie ein ZIP-Member) - hier zählt das Wörterbuch am meisten
+        members = [dictionary.compress(json.dumps(article, ensure_ascii=False).encode('utf-8'))
+                   for article in articles]
+        results.append(measure('dcz/artikel', sum(map(len, members)),
+                               lambda: [dictionary.decompress(member) for member in members]))
+
+        print(f"  {day} ({len(articles)} Artikel, {len(data) / 1024:.0f} KB JSON): " + ' | '.join(results))
+
+    print("\nSumme:")
+    for name, (size, elapsed) in totals.items():
+        print(f"  {name:11} {size / 1024:9.1f} KB {elapsed:8.1f} ms")
+
+
+def main():
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description='zstd-Wörterbuch für die Tages-Bundles')
+    arg_parser.add_argument('--articles', default=os.getenv('OUTPUT_DIR', './articles'),
+                            help='Artikel-Verzeichnis (Standard: OUTPUT_DIR)')
+    arg_parser.add_argument('--train', action='store_true',
+                            help='Neue Version aus den letzten Tagen trainieren')
+    arg_parser.add_argument('--days', type=int, default=60,
+                            help='Anzahl Tage für das Training (Standard: 60)')
+    arg_parser.add_argument('--benchmark', action='store_true',
+                            help='Grösse und Entpack-Zeit gegenüber ZIP, gzip und Brotli vergleichen')
+    arg_parser.add_argument('--benchmark-days', type=int, default=7,
+                            help='Anzahl Tage für den Benchmark (Standard: 7, die neuesten)')
+    args = arg_parser.parse_args()
+
+    if load_zstandard() is None:
+        print("✗ Paket zstandard nicht installiert (pip install zstandard)")
+        raise SystemExit(1)
+
+    articles_dir = Path(args.articles)
+    store = DictionaryStore(articles_dir)
+    days = _bundle_days(articles_dir)
+
+    if args.train:
+        # Die neuesten Tage für den Benchmark zurückhalten
+        held_out = args.benchmark_days if args.benchmark else 0
+        train_days = days[:len(days) - held_out][-args.days:]
+        samples = training_samples(articles_dir, train_days)
+        print(f"→ Trainiere Wörterbuch aus {len(samples)} Artikeln ({len(train_days)} Tage)...")
+        dictionary = store.train(samples)
+        print(f"✓ Wörterbuch {dictionary.version} gespeichert: {store.file_path(dictionary.version)} "
+              f"({len(dictionary.data) / 1024:.0f} KB)")
+        print("ℹ Neue Bundles erhalten die .dcz-Variante beim nächsten Scraper-Run")
+
+    if args.benchmark:
+        dictionary = store.latest()
+        if dictionary is None:
+            print("✗ Kein Wörterbuch vorhanden (zuerst --train)")
+            raise SystemExit(1)
+        benchmark(articles_dir, days[-args.benchmark_days:], dictionary)
+
+    if not args.train and not args.benchmark:
+        for version in store.versions():
+            dictionary = store.get(version)
+            print(f"  {version}: {len(dictionary.data) / 1024:.0f} KB, {dictionary.header_hash}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tages-Bundles - Alle Artikel eines Tages als vorkomprimiertes JSON.
+
+Zusätzlich zum ZIP mit den Markdown-Dateien schreibt der Scraper pro Tag
+<datum>.json mit einem Array aller Artikel (Metadaten als Felder, Inhalt
+als Markdown) sowie gzip- und Brotli-komprimierte Varianten
+(<datum>.json.gz, <datum>.json.br). Der Server liefert per Content
+Negotiation die passende Datei aus; der Client muss weder ein ZIP
+entpacken noch die Markdown-Header parsen.
+
+Mit trainiertem Wörterbuch kommt <datum>.json.dcz dazu (zstd mit
+Wörterbuch, siehe compression_dict.py) - nur für Clients, die das
+Wörterbuch schon haben.
+"""
+import re
+import gzip
+import json
+from pathlib import Path
+
+from compression_dict import DictionaryStore, dcz_dictionary_hash, load_zstandard, DCZ_HEADER_SIZE
+from safe_io import atomic_write
+
+BUNDLE_VERSION = 1
+
+# Endung -> Content-Encoding, bevorzugte zuerst
+ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+
+
+def parse_article_markdown(text, path):
+    """
+    Zerlegt eine vom Scraper geschriebene Markdown-Datei in ihre Felder.
+
+    Entspricht parseMarkdown() im Frontend (ZipLoader.jsx): Header bis zur
+    Trennlinie, danach der Inhalt ohne führenden Titel und Leerzeilen.
+    """
+    lines = text.split('\n')
+    title = ''
+    date = ''
+    category = 'allgemein'
+    url = ''
+    summary = ''
+    body_start = 0
+
+    for i, line in enumerate(lines):
+        if line.startswith('# ') and not title:
+            title = line[2:].strip()
+        elif 'Datum:' in line:
+            match = re.search(r'\*?\*?Datum:\*?\*?\s*(.+)', line)
+            if match:
+                date = match.group(1).strip()
+        elif 'Kategorie:' in line:
+            match = re.search(r'\*?\*?Kategorie:\*?\*?\s*(.+)', line)
+            if match:
+                category = match.group(1).strip()
+        elif 'Zusammenfassung:' in line:
+            match = re.search(r'\*?\*?Zusammenfassung:\*?\*?\s*(.+)', line)
+            if match:
+                summary = match.group(1).strip()
+        elif 'Original auf NZZ.ch öffnen' in line or 'URL:' in line:
+            match = re.search(r'\[.*?\]\((https?://[^)]+)\)', line)
+            if match:
+                url = match.group(1).strip()
+            elif 'URL:' in line:
+                url = line.split('URL:')[1].strip()
+        elif line.startswith('---'):
+            body_start = i + 1
+            break
+
+    body_lines = lines[body_start:]
+    if body_lines and body_lines[0].strip().startswith('# '):
+        body_lines = body_lines[1:]
+    while body_lines and body_lines[0].strip() == '':
+        body_lines = body_lines[1:]
+
+    return {
+        'path': path,
+        'title': title or 'Unbekannter Titel',
+        'url': url,
+        'date': date,
+        'category': category.lower(),
+        'summary': summary,
+        'content': '\n'.join(body_lines)
+    }
+
+
+def write_day_bundle(date_folder, members=None):
+    """
+    Schreibt das Bundle für einen Tages-Ordner neben das ZIP.
+
+    Args:
+        date_folder: Tages-Ordner (articles/<datum>)
+        members: Optional die Pfade der Artikel ("datum/kategorie/datei.md",
+            z.B. aus dem Tages-Katalog), sonst werden alle *.md gesucht
+
+    Returns:
+        Dict mit Anzahl Artikel und Grösse pro Variante in Bytes
+    """
+    date_folder = Path(date_folder)
+    if members is None:
+        members = sorted(p.relative_to(date_folder.parent).as_posix()
+                         for p in date_folder.rglob('*.md'))
+
+    articles = []
+    for path in members:
+        md_file = date_folder.parent / path
+        articles.append(parse_article_markdown(md_file.read_text(encoding='utf-8'), path))
+
+    # Neueste zuerst, wie im Client
+    articles.sort(key=lambda a: a['date'], reverse=True)
+
+    bundle = {'version': BUNDLE_VERSION, 'date': date_folder.name, 'articles': articles}
+    data = json.dumps(bundle, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    base = date_folder.with_suffix('.json')
+    sizes = {'json': len(data)}
+
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    atomic_write(base.with_name(base.name + '.gz'), compressed)
+    sizes['gzip'] = len(compressed)
+
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        base.with_name(base.name + '.br').unlink(missing_ok=True)
+    if brotli:
+        compressed = brotli.compress(data, quality=11)
+        atomic_write(base.with_name(base.name + '.br'), compressed)
+        sizes['br'] = len(compressed)
+
+    dictionary = DictionaryStore(date_folder.parent).latest() if load_zstandard() else None
+    dcz_path = base.with_name(base.name + '.dcz')
+    if dictionary:
+        compressed = dictionary.compress(data)
+        atomic_write(dcz_path, compressed)
+        sizes['dcz'] = len(compressed)
+    else:
+        dcz_path.unlink(missing_ok=True)
+
+    # Unkomprimiert zuletzt: Es markiert das Bundle als vollständig
+    atomic_write(base, data)
+
+    return {'articles': len(articles), 'sizes': sizes}
+
+
+def read_dcz_hash(fp):
+    """SHA-256 des Wörterbuchs, mit dem ein .json.dcz komprimiert ist."""
+    return dcz_dictionary_hash(fp.read(DCZ_HEADER_SIZE))
+
+
+def bundle_variant(articles_dir, date, accept_encoding, available_dictionary=None):
+    """
+    Wählt die Datei für einen Request per Content Negotiation.
+
+    Args:
+        articles_dir: Verzeichnis mit den Bundles
+        date: Datum des Bundles
+        accept_encoding: Funktion, die für eine Kodierung die Qualität
+            aus Accept-Encoding liefert (0 = nicht akzeptiert)
+        available_dictionary: SHA-256 aus Available-Dictionary - dcz nur,
+            wenn das Bundle mit genau diesem Wörterbuch komprimiert ist
+
+    Returns:
+        (Pfad, Content-Encoding oder None) oder None, wenn es kein Bundle gibt
+    """
+    base = Path(articles_dir) / f"{date}.json"
+    if not base.exists():
+        return None
+
+    if available_dictionary and accept_encoding('dcz'):
+        variant = base.with_name(base.name + '.dcz')
+        try:
+            with open(variant, 'rb') as f:
+                if read_dcz_hash(f) == available_dictionary:
+                    return variant, 'dcz'
+        except FileNotFoundError:
+            pass
+
+    for suffix, encoding in ENCODINGS:
+        variant = base.with_name(base.name + suffix)
+        if accept_encoding(encoding) and variant.exists():
+            return variant, encoding
+    return base, None
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tages-Katalog - manifest.json mit einem Eintrag pro Artikel.
+
+Der Scraper pflegt den Katalog beim Speichern und Löschen von Artikeln
+(statt bei jedem Run die Kategorie-Ordner zu zählen). Pro Artikel stehen
+darin eine stabile ID (aus der URL), Titel, Kategorie, URL, SHA-256 und
+Grösse der Markdown-Datei sowie der Pfad im Tages-ZIP. Anzahl pro
+Kategorie und Gesamtzahl werden daraus abgeleitet und bleiben für
+bestehende Clients im Manifest.
+
+ZIP und JSON-Bundle nehmen ihre Dateiliste aus dem Katalog, der Server
+liefert ihn unter /api/catalog/<datum> aus. Nach einem abgebrochenen Run
+gleicht reconcile() den Katalog mit den gespeicherten Dateien ab.
+"""
+import json
+import hashlib
+from pathlib import Path
+
+from day_bundle import parse_article_markdown
+from safe_io import atomic_write_json
+
+MANIFEST_NAME = 'manifest.json'
+CATALOG_VERSION = 2
+
+
+def article_id(url):
+    """Stabile ID eines Artikels (gleiche URL = gleiche ID, auch über Tage)."""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+
+def catalog_entry(member, data, article):
+    """
+    Baut den Katalog-Eintrag für eine gespeicherte Markdown-Datei.
+
+    Args:
+        member: Pfad im Tages-ZIP ("datum/kategorie/datei.md")
+        data: Inhalt der Datei (Bytes)
+        article: Dict mit title, category und url
+    """
+    url = article.get('url') or ''
+    return {
+        'id': article_id(url or member),
+        'member': member,
+        'title': article['title'],
+        'category': article['category'],
+        'url': url,
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'size': len(data)
+    }
+
+
+class DayCatalog:
+    """Katalog der Artikel eines Tages-Ordners."""
+
+    def __init__(self, date_folder):
+        """
+        Args:
+            date_folder: Tages-Ordner (articles/<datum>)
+        """
+        self.date_folder = Path(date_folder)
+        self.path = self.date_folder / MANIFEST_NAME
+        self._entries = {}  # Pfad im ZIP -> Eintrag
+        self._load()
+
+    def _load(self):
+        manifest = None
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except ValueError:
+                # Nur bei Manifesten aus der Zeit vor den atomaren Schreibvorgängen
+                print(f"⚠ Manifest unlesbar, baue Katalog aus den Dateien neu auf: {self.path}")
+
+        if manifest is not None and 'articles' in manifest:
+            self._entries = {entry['member']: entry for entry in manifest['articles']}
+        elif self.date_folder.is_dir():
+            # Altes Manifest (nur Anzahlen): einmalig aus den Dateien aufbauen
+            self.reconcile()
+
+    def reconcile(self):
+        """
+        Gleicht den Katalog mit den Markdown-Dateien im Tages-Ordner ab.
+
+        Neue oder geänderte Dateien (SHA-256) werden aufgenommen, Einträge
+        ohne Datei entfernt - z.B. wenn ein Run nach dem Speichern eines
+        Artikels, aber vor dem Schreiben des Manifests abgebrochen wurde.
+
+        Returns:
+            Dict mit Anzahl aufgenommener ('added') und entfernter ('removed') Einträge
+        """
+        root = self.date_folder.parent
+        stats = {'added': 0, 'removed': 0}
+        found = set()
+        for md_file in sorted(self.date_folder.glob('*/*.md')):
+            member = md_file.relative_to(root).as_posix()
+            found.add(member)
+            data = md_file.read_bytes()
+            entry = self._entries.get(member)
+            if entry is not None and entry['sha256'] == hashlib.sha256(data).hexdigest():
+                continue
+            article = parse_article_markdown(data.decode('utf-8'), member)
+            article['category'] = md_file.parent.name
+            self._entries[member] = catalog_entry(member, data, article)
+            stats['added'] += 1
+
+        stats['removed'] = self.remove([member for member in self._entries if member not in found])
+        return stats
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, member):
+        return member in self._entries
+
+    @property
+    def articles(self):
+        """Alle Einträge, sortiert nach Pfad im ZIP."""
+        return [self._entries[member] for member in sorted(self._entries)]
+
+    @property
+    def members(self):
+        """Pfade aller Artikel im Tages-ZIP (sortiert)."""
+        return sorted(self._entries)
+
+    def add(self, entry):
+        """Nimmt einen Artikel auf (ersetzt einen Eintrag mit gleichem Pfad)."""
+        self._entries[entry['member']] = entry
+
+    def remove(self, members):
+        """Entfernt Artikel anhand ihres Pfads und gibt die Anzahl zurück."""
+        removed = 0
+        for member in members:
+            if self._entries.pop(member, None) is not None:
+                removed += 1
+        return removed
+
+    def to_manifest(self):
+        categories = {}
+        for entry in self._entries.values():
+            categories[entry['category']] = categories.get(entry['category'], 0) + 1
+
+        return {
+            'version': CATALOG_VERSION,
+            'date': self.date_folder.name,
+            'total_articles': len(self._entries),
+            'categories': dict(sorted(categories.items())),
+            'articles': self.articles
+        }
+
+    def save(self):
+        """Schreibt manifest.json (atomar, siehe safe_io.py)."""
+        self.date_folder.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.path, self.to_manifest(), indent=2, ensure_ascii=False)
+        return self.path
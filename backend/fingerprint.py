@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Fingerprints - Erkennung von doppelten und fast gleichen Artikeln.
+
+Pro Artikel werden aus dem extrahierten Text (vor der AI-Bereinigung)
+zwei Werte berechnet:
+
+- content_hash: SHA-256 über den normalisierten Text (Kleinbuchstaben,
+  nur Wörter) - findet exakt gleiche Artikel unter neuer URL
+- simhash: 64-Bit-SimHash über Wort-Trigramme - fast gleiche Texte
+  (z.B. ein aktualisierter Lead) unterscheiden sich nur in wenigen Bits
+
+Für die Suche wird der SimHash in BANDS Teile zerlegt. Zwei SimHashes mit
+höchstens BANDS - 1 unterschiedlichen Bits stimmen in mindestens einem
+Teil exakt überein, so dass die Kandidaten per Index-Abfrage gefunden
+werden (siehe TrackingStore.find_duplicate). Schon ein geänderter Titel
+verschiebt bei einem typischen Artikel 3-4 Bits, unabhängige Texte
+unterscheiden sich in rund 32 Bits.
+"""
+import re
+import hashlib
+import unicodedata
+from collections import Counter
+
+SIMHASH_BITS = 64
+BANDS = 6
+MAX_DISTANCE = BANDS - 1
+SHINGLE_SIZE = 3
+
+# Bits pro Teil: 11, 11, 11, 11, 10, 10
+_BAND_SIZES = [SIMHASH_BITS // BANDS + (1 if i < SIMHASH_BITS % BANDS else 0) for i in range(BANDS)]
+
+
+def normalize_words(text):
+    """Zerlegt einen Text in normalisierte Wörter (ohne Markdown und Satzzeichen)."""
+    return re.findall(r'\w+', unicodedata.normalize('NFKC', text).lower())
+
+
+def simhash(words):
+    """64-Bit-SimHash über die Wort-Trigramme eines Textes."""
+    shingles = Counter(
+        ' '.join(words[i:i + SHINGLE_SIZE])
+        for i in range(max(1, len(words) - SHINGLE_SIZE + 1))
+    )
+    weights = [0] * SIMHASH_BITS
+    for shingle, count in shingles.items():
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+def bands(value):
+    """Zerlegt einen SimHash in BANDS Teile."""
+    parts = []
+    for size in _BAND_SIZES:
+        parts.append(value & ((1 << size) - 1))
+        value >>= size
+    return tuple(parts)
+
+
+def hamming_distance(a, b):
+    """Anzahl unterschiedlicher Bits zweier SimHashes."""
+    return bin(a ^ b).count('1')
+
+
+def fingerprint(text, min_words=80):
+    """
+    Berechnet den Fingerprint eines Artikeltextes.
+
+    Args:
+        text: Extrahierter Artikeltext (Markdown)
+        min_words: Kürzere Texte (z.B. Paywall-Teaser) erhalten keinen
+            Fingerprint - sie sind sich zu ähnlich für einen Vergleich
+
+    Returns:
+        Dict mit content_hash und simhash oder None
+    """
+    words = normalize_words(text)
+    if len(words) < min_words:
+        return None
+    return {
+        'content_hash': hashlib.sha256(' '.join(words).encode('utf-8')).hexdigest(),
+        'simhash': simhash(words)
+    }
@@ -3,16 +3,31 @@
 Flask API Server mit Authentication für NZZ Reader.
 """
 import os
+import gzip
 import json
+import zipfile
+import threading
 import bcrypt
 import jwt
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from functools import wraps
+from itertools import groupby
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
 from dotenv import load_dotenv
+from werkzeug.wsgi import wrap_file
+
+from archive_catalog import ArchiveCatalog
+from article_index import ArticleIndex
+from compression_dict import DICT_MATCH, DictionaryStore, parse_available_dictionary
+from day_bundle import ENCODINGS, bundle_variant, read_dcz_hash
+from month_pack import locate_day_file, open_day_member
+from tracking_store import TrackingStore
+from user_store import UserStore
+from zip_archive import ZipIndex
 
 load_dotenv()
 
@@ -25,27 +40,78 @@ USERS_FILE = Path(__file__).parent / 'users.json'
 SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 TOKEN_EXPIRY_HOURS = 24
 
-# ==================== User Management ====================
+# Gleichzeitige bcrypt-Operationen pro Prozess und maximal wartende Requests.
+# Zusammen kleiner als die Threads pro Worker halten, sonst blockieren Logins die Downloads.
+BCRYPT_WORKERS = int(os.getenv('BCRYPT_WORKERS', 2))
+BCRYPT_MAX_PENDING = int(os.getenv('BCRYPT_MAX_PENDING', 2))
+BCRYPT_QUEUE_TIMEOUT = float(os.getenv('BCRYPT_QUEUE_TIMEOUT', 0))
+
+# Archiv-Liste im Speicher, prüft höchstens alle CATALOG_CHECK_INTERVAL Sekunden auf Änderungen
+catalog = ArchiveCatalog(ARTICLES_DIR, float(os.getenv('CATALOG_CHECK_INTERVAL', 2)))
+
+# Downloads durch Apache (mod_xsendfile) bzw. nginx (internal location) ausliefern lassen
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', '0').lower() in ('1', 'true', 'yes')
+X_ACCEL_REDIRECT_PREFIX = os.getenv('X_ACCEL_REDIRECT_PREFIX', '')
+
+# Central Directories der Tages-ZIPs und Monats-Packs
+zip_index = ZipIndex()
+
+# Tracking-Datenbank (vom Scraper synchronisiert) für /api/sync
+tracking = TrackingStore(ARTICLES_DIR / 'tracking.db')
+SYNC_MAX_ARTICLES = int(os.getenv('SYNC_MAX_ARTICLES', 200))
 
-def load_users():
-    """Lädt User aus JSON-Datei."""
-    if not USERS_FILE.exists():
-        return {'users': []}
-    with open(USERS_FILE, 'r') as f:
-        return json.load(f)
+# Artikel-Index (vom Scraper synchronisiert) für /api/articles und /api/search
+search_index = ArticleIndex(ARTICLES_DIR / 'search.db')
+# Kompressions-Wörterbücher für dcz-Bundles (siehe compression_dict.py)
+dictionaries = DictionaryStore(ARTICLES_DIR)
 
-def save_users(data):
-    """Speichert User in JSON-Datei."""
-    with open(USERS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+SEARCH_MAX_RESULTS = int(os.getenv('SEARCH_MAX_RESULTS', 50))
+LIST_MAX_ARTICLES = int(os.getenv('LIST_MAX_ARTICLES', 200))
+
+# ==================== User Management ====================
+
+# Index im Speicher, wird nur bei Änderung der Datei neu geladen
+users = UserStore(USERS_FILE)
+
+class ServerBusy(Exception):
+    """Zu viele gleichzeitige bcrypt-Operationen."""
+
+_bcrypt_lock = threading.Lock()
+_bcrypt_pool = None  # (PID, Executor, Semaphore) - pro Prozess, nach fork() neu
+
+def run_bcrypt(func, *args):
+    """Führt eine bcrypt-Operation im begrenzten Executor dieses Prozesses aus.
+
+    Höchstens BCRYPT_WORKERS Hashes laufen gleichzeitig und höchstens
+    BCRYPT_MAX_PENDING warten, damit Logins weder alle CPU-Kerne noch alle
+    Request-Threads belegen und Downloads weiterlaufen. Ist kein Platz frei
+    (nach BCRYPT_QUEUE_TIMEOUT Sekunden, Standard: sofort), gibt es 503.
+    """
+    global _bcrypt_pool
+    with _bcrypt_lock:
+        if _bcrypt_pool is None or _bcrypt_pool[0] != os.getpid():
+            _bcrypt_pool = (
+                os.getpid(),
+                ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix='bcrypt'),
+                threading.BoundedSemaphore(BCRYPT_WORKERS + BCRYPT_MAX_PENDING)
+            )
+        _, pool, slots = _bcrypt_pool
+
+    if not slots.acquire(timeout=BCRYPT_QUEUE_TIMEOUT):
+        raise ServerBusy()
+    try:
+        return pool.submit(func, *args).result()
+    finally:
+        slots.release()
 
 def hash_password(password):
     """Hasht ein Passwort mit bcrypt."""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    hashed = run_bcrypt(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt())
+    return hashed.decode('utf-8')
 
 def check_password(password, hashed):
     """Prüft ob Passwort mit Hash übereinstimmt."""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    return run_bcrypt(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
 
 def generate_token(user):
     """Generiert JWT Token für User."""
@@ -66,6 +132,13 @@ def decode_token(token):
     except jwt.InvalidTokenError:
         return None
 
+@app.errorhandler(ServerBusy)
+def server_busy(e):
+    """Antwort, wenn der bcrypt-Executor ausgelastet ist."""
+    response = jsonify({'error': 'Server ausgelastet, bitte erneut versuchen'})
+    response.headers['Retry-After'] = '5'
+    return response, 503
+
 # ==================== Auth Middleware ====================
 
 def token_required(f):
@@ -123,8 +196,7 @@ def login():
     if not email or not password:
         return jsonify({'error': 'Email und Passwort erforderlich'}), 400
 
-    users_data = load_users()
-    user = next((u for u in users_data['users'] if u['email'] == email), None)
+    user = users.find_by_email(email)
 
     if not user or not check_password(password, user['password']):
         return jsonify({'error': 'Ungültige Anmeldedaten'}), 401
@@ -164,8 +236,7 @@ def change_password(payload):
     if len(new_password) < 6:
         return jsonify({'error': 'Passwort muss mindestens 6 Zeichen lang sein'}), 400
 
-    users_data = load_users()
-    user = next((u for u in users_data['users'] if u['id'] == payload['user_id']), None)
+    user = users.find_by_id(payload['user_id'])
 
     if not user:
         return jsonify({'error': 'User nicht gefunden'}), 404
@@ -173,8 +244,8 @@ def change_password(payload):
     if not check_password(old_password, user['password']):
         return jsonify({'error': 'Altes Passwort falsch'}), 401
 
-    user['password'] = hash_password(new_password)
-    save_users(users_data)
+    if not users.set_password(user['id'], hash_password(new_password)):
+        return jsonify({'error': 'User nicht gefunden'}), 404
 
     return jsonify({'message': 'Passwort erfolgreich geändert'})
 
@@ -184,15 +255,14 @@ def change_password(payload):
 @admin_required
 def list_users(payload):
     """Listet alle User (Admin only)."""
-    users_data = load_users()
-    users = [{
+    user_list = [{
         'id': u['id'],
         'email': u['email'],
         'is_admin': u.get('is_admin', False),
         'created_at': u.get('created_at')
-    } for u in users_data['users']]
+    } for u in users.list()]
 
-    return jsonify({'users': users})
+    return jsonify({'users': user_list})
 
 @app.route('/api/users', methods=['POST'])
 @admin_required
@@ -208,26 +278,14 @@ def create_user(payload):
     if len(password) < 6:
         return jsonify({'error': 'Passwort muss mindestens 6 Zeichen lang sein'}), 400
 
-    users_data = load_users()
-
-    # Prüfe ob Email bereits existiert
-    if any(u['email'] == email for u in users_data['users']):
+    # Prüfe ob Email bereits existiert (vor dem teuren Hashen)
+    if users.find_by_email(email):
         return jsonify({'error': 'Email bereits vergeben'}), 400
 
-    # Neue User-ID generieren
-    max_id = max([int(u['id']) for u in users_data['users']], default=0)
-    new_id = str(max_id + 1)
-
-    new_user = {
-        'id': new_id,
-        'email': email,
-        'password': hash_password(password),
-        'is_admin': False,
-        'created_at': datetime.utcnow().isoformat() + 'Z'
-    }
-
-    users_data['users'].append(new_user)
-    save_users(users_data)
+    # ID-Vergabe und erneute Prüfung unter dem Schreib-Lock
+    new_user = users.create(email, hash_password(password))
+    if not new_user:
+        return jsonify({'error': 'Email bereits vergeben'}), 400
 
     return jsonify({
         'message': 'User erstellt',
@@ -242,19 +300,13 @@ def create_user(payload):
 @admin_required
 def delete_user(payload, user_id):
     """Löscht User (Admin only)."""
-    users_data = load_users()
-
     # Verhindere Löschen des eigenen Accounts
     if user_id == payload['user_id']:
         return jsonify({'error': 'Du kannst deinen eigenen Account nicht löschen'}), 400
 
-    user = next((u for u in users_data['users'] if u['id'] == user_id), None)
-    if not user:
+    if not users.delete(user_id):
         return jsonify({'error': 'User nicht gefunden'}), 404
 
-    users_data['users'] = [u for u in users_data['users'] if u['id'] != user_id]
-    save_users(users_data)
-
     return jsonify({'message': 'User gelöscht'})
 
 @app.route('/api/users/<user_id>/reset-password', methods=['POST'])
@@ -270,45 +322,62 @@ def reset_user_password(payload, user_id):
     if len(new_password) < 6:
         return jsonify({'error': 'Passwort muss mindestens 6 Zeichen lang sein'}), 400
 
-    users_data = load_users()
-    user = next((u for u in users_data['users'] if u['id'] == user_id), None)
-
-    if not user:
+    if not users.find_by_id(user_id):
         return jsonify({'error': 'User nicht gefunden'}), 404
 
-    user['password'] = hash_password(new_password)
-    save_users(users_data)
+    if not users.set_password(user_id, hash_password(new_password)):
+        return jsonify({'error': 'User nicht gefunden'}), 404
 
     return jsonify({'message': 'Passwort zurückgesetzt'})
 
 # ==================== Article Endpoints (Protected) ====================
 
+def compressed_json(data):
+    """Kompakte JSON-Antwort, gzip-komprimiert falls der Client es akzeptiert."""
+    body = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    response = Response(body, mimetype='application/json')
+    if request.accept_encodings['gzip']:
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'private, no-store'
+    return response
+
+def send_packed(day_file, mimetype):
+    """Liefert eine Datei aus einem Monats-Pack aus (ETag/304 und Byte-Ranges wie send_file)."""
+    response = Response(wrap_file(request.environ, day_file.open(), buffer_size=64 * 1024),
+                        mimetype=mimetype, direct_passthrough=True)
+    response.content_length = day_file.size
+    if day_file.etag:
+        response.set_etag(day_file.etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request, accept_ranges=True, complete_length=day_file.size)
+
+def iter_gunzip(day_file, chunk_size=64 * 1024):
+    """Entpackt eine gzip-Datei (z.B. Bundle im Monats-Pack) beim Ausliefern."""
+    with day_file.open() as f, gzip.GzipFile(fileobj=f) as gz:
+        for chunk in iter(lambda: gz.read(chunk_size), b''):
+            yield chunk
+
+def catalog_response(cached):
+    """Liefert eine vorserialisierte Katalog-Antwort (304 bei passendem ETag)."""
+    response = Response(cached.body, mimetype='application/json')
+    response.set_etag(cached.etag)
+    # Privat (Token) und immer revalidieren - dank ETag meist nur ein 304
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
 @app.route('/api/latest', methods=['GET'])
 @token_required
 def get_latest(payload):
     """Gibt das neueste verfügbare Datum zurück."""
     try:
-        zips = sorted(ARTICLES_DIR.glob('*.zip'), reverse=True)
+        latest = catalog.latest_response()
 
-        if not zips:
+        if not latest:
             return jsonify({'error': 'No archives found'}), 404
 
-        latest = zips[0]
-        date = latest.stem
-
-        manifest_path = ARTICLES_DIR / date / 'manifest.json'
-        manifest = {}
-        if manifest_path.exists():
-            with open(manifest_path, 'r') as f:
-                manifest = json.load(f)
-
-        response = {
-            'date': date,
-            'download_url': f'/api/download/{date}',
-            'manifest': manifest
-        }
-
-        return jsonify(response)
+        return catalog_response(latest)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -318,24 +387,20 @@ def get_latest(payload):
 def get_list(payload):
     """Gibt eine Liste aller verfügbaren Archive zurück."""
     try:
-        zips = sorted(ARTICLES_DIR.glob('*.zip'), reverse=True)
-        archives = []
+        return catalog_response(catalog.list_response())
 
-        for zip_file in zips:
-            date = zip_file.stem
-            manifest_path = ARTICLES_DIR / date / 'manifest.json'
-            manifest = {}
-            if manifest_path.exists():
-                with open(manifest_path, 'r') as f:
-                    manifest = json.load(f)
-
-            archives.append({
-                'date': date,
-                'download_url': f'/api/download/{date}',
-                'manifest': manifest
-            })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        return jsonify({'archives': archives})
+@app.route('/api/catalog/<date>', methods=['GET'])
+@token_required
+def get_day_catalog(payload, date):
+    """Gibt den Katalog eines Tages zurück (alle Artikel mit ID, Titel, Hash, Grösse, Pfad im ZIP)."""
+    try:
+        day = catalog.day_response(date)
+        if not day:
+            return jsonify({'error': 'Catalog not found'}), 404
+        return catalog_response(day)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -343,19 +408,323 @@ def get_list(payload):
 @app.route('/api/download/<date>', methods=['GET'])
 @token_required
 def download_zip(payload, date):
-    """Serviert eine ZIP-Datei."""
+    """Serviert eine ZIP-Datei (ETag/304 und Byte-Ranges zum Fortsetzen), lose oder aus dem Monats-Pack."""
     try:
-        zip_path = ARTICLES_DIR / f"{date}.zip"
+        day_file = locate_day_file(ARTICLES_DIR, zip_index, f"{date}.zip")
 
-        if not zip_path.exists():
+        if not day_file:
             return jsonify({'error': 'Archive not found'}), 404
 
-        return send_file(
-            zip_path,
+        if day_file.packed:
+            response = send_packed(day_file, 'application/zip')
+            response.headers['Content-Disposition'] = f'attachment; filename="{date}.zip"'
+            return response
+
+        zip_path = day_file.path
+        etag = catalog.archive_etag(zip_path)
+
+        # Auslieferung durch den vorgeschalteten Webserver (nginx)
+        if X_ACCEL_REDIRECT_PREFIX:
+            response = Response(mimetype='application/zip')
+            response.set_etag(etag)
+            response.headers['Content-Disposition'] = f'attachment; filename="{date}.zip"'
+            response.headers['X-Accel-Redirect'] = f"{X_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{date}.zip"
+            return response.make_conditional(request)
+
+        # send_file beantwortet If-None-Match/Range selbst; die Datei wird über
+        # wsgi.file_wrapper (Gunicorn: sendfile) bzw. X-Sendfile übertragen
+        response = send_file(
+            zip_path.resolve(),
             mimetype='application/zip',
             as_attachment=True,
-            download_name=f"{date}.zip"
+            download_name=f"{date}.zip",
+            conditional=True,
+            etag=etag,
+            max_age=0
         )
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sync', methods=['GET'])
+@token_required
+def sync_articles(payload):
+    """Liefert nur Artikel, die seit dem Cursor des Clients hinzugekommen sind.
+
+    Query-Parameter:
+        since: Cursor aus der letzten Antwort (ohne: nur aktueller Cursor)
+        date: Optional nur Artikel dieses Tages
+        limit: Maximale Anzahl Artikel (Standard/Maximum: SYNC_MAX_ARTICLES)
+    """
+    try:
+        since = request.args.get('since', type=int)
+        date = request.args.get('date')
+        limit = max(1, min(request.args.get('limit', SYNC_MAX_ARTICLES, type=int), SYNC_MAX_ARTICLES))
+
+        tracking.refresh()
+        # Cursor vor der Abfrage lesen: später eingefügte Artikel kommen beim nächsten Sync
+        top = tracking.cursor
+        if since is None:
+            return compressed_json({'cursor': top, 'articles': [], 'more': False})
+
+        rows = tracking.articles_since(since, limit + 1, date)
+        more = len(rows) > limit
+        rows = rows[:limit]
+
+        articles = []
+        unresolved = False
+        for scraped_date, group in groupby(rows, key=lambda row: row['scraped_date']):
+            day_file = locate_day_file(ARTICLES_DIR, zip_index, f"{scraped_date}.zip")
+            if not day_file:
+                unresolved = True
+                break
+            with day_file.open() as f, zipfile.ZipFile(f) as zf:
+                for row in group:
+                    try:
+                        markdown = zf.read(row['filename']).decode('utf-8')
+                    except KeyError:
+                        unresolved = True
+                        break
+                    articles.append({
+                        'id': row['id'],
+                        'date': scraped_date,
+                        'path': row['filename'],
+                        'markdown': markdown
+                    })
+            if unresolved:
+                break
+
+        if unresolved:
+            # Artikel ist getrackt, aber (noch) nicht im Tages-ZIP, z.B. ZIP noch nicht
+            # geschrieben oder synchronisiert: Cursor nur bis zum letzten gelieferten
+            # Artikel, damit der Rest beim nächsten Sync kommt. Ohne gelieferte Artikel
+            # kein "more" - der Client fragt sonst sofort wieder nach.
+            cursor = articles[-1]['id'] if articles else since
+            more = bool(articles)
+        elif more:
+            cursor = rows[-1]['id']
+        else:
+            cursor = max(top, since, rows[-1]['id'] if rows else 0)
+
+        return compressed_json({'cursor': cursor, 'articles': articles, 'more': more})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/article/<date>/<path:member>', methods=['GET'])
+@token_required
+def get_article(payload, date, member):
+    """Liefert einen einzelnen Artikel (Markdown) direkt aus dem Tages-ZIP.
+
+    Deflate-komprimierte Artikel gehen bei Accept-Encoding: gzip ohne
+    Entpacken als gzip-Stream raus.
+    """
+    try:
+        article = open_day_member(ARTICLES_DIR, zip_index, date, f"{date}/{member}")
+        if not article:
+            return jsonify({'error': 'Article not found'}), 404
+
+        use_gzip = article.is_deflated and bool(request.accept_encodings['gzip'])
+        # Pro Inhalt und Kodierung eindeutig
+        etag = f"{article.info.CRC:08x}-{article.size}" + ('-gz' if use_gzip else '')
+        if request.if_none_match.contains(etag):
+            article.close()
+            response = Response(status=304)
+        elif use_gzip:
+            response = Response(article.iter_gzip(), mimetype='text/markdown')
+            response.headers['Content-Encoding'] = 'gzip'
+            response.headers['Content-Length'] = str(article.gzip_size())
+        else:
+            response = Response(article.iter_content(), mimetype='text/markdown')
+            response.headers['Content-Length'] = str(article.size)
+
+        response.set_etag(etag)
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/bundle/<date>', methods=['GET'])
+@token_required
+def get_bundle(payload, date):
+    """Liefert alle Artikel eines Tages als JSON (dcz/Brotli/gzip nach Accept-Encoding)."""
+    try:
+        available_dictionary = parse_available_dictionary(request.headers.get('Available-Dictionary'))
+        variant = bundle_variant(ARTICLES_DIR, date, lambda encoding: request.accept_encodings[encoding],
+                                 available_dictionary)
+        if not variant:
+            return packed_bundle(date, available_dictionary)
+
+        path, encoding = variant
+        response = send_file(
+            path.resolve(),
+            mimetype='application/json',
+            conditional=True,
+            etag=catalog.archive_etag(path),
+            max_age=0
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding, Available-Dictionary'
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def packed_bundle(date, available_dictionary=None):
+    """Bundle eines Tages aus dem Monats-Pack (dort liegen nur .json.dcz/.br/.gz)."""
+    if available_dictionary and request.accept_encodings['dcz']:
+        day_file = locate_day_file(ARTICLES_DIR, zip_index, f"{date}.json.dcz")
+        if day_file:
+            with day_file.open() as f:
+                matches = read_dcz_hash(f) == available_dictionary
+            if matches:
+                response = send_packed(day_file, 'application/json')
+                response.headers['Content-Encoding'] = 'dcz'
+                response.headers['Vary'] = 'Accept-Encoding, Available-Dictionary'
+                return response
+
+    for suffix, encoding in ENCODINGS:
+        if not request.accept_encodings[encoding]:
+            continue
+        day_file = locate_day_file(ARTICLES_DIR, zip_index, f"{date}.json{suffix}")
+        if day_file:
+            response = send_packed(day_file, 'application/json')
+            response.headers['Content-Encoding'] = encoding
+            response.headers['Vary'] = 'Accept-Encoding, Available-Dictionary'
+            return response
+
+    day_file = locate_day_file(ARTICLES_DIR, zip_index, f"{date}.json.gz")
+    if not day_file:
+        return jsonify({'error': 'Bundle not found'}), 404
+
+    # Client ohne gzip: beim Ausliefern entpacken
+    response = Response(iter_gunzip(day_file), mimetype='application/json')
+    if day_file.etag:
+        response.set_etag(f"{day_file.etag}-json")
+    response.headers['Vary'] = 'Accept-Encoding, Available-Dictionary'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
+
+@app.route('/api/dictionary', methods=['GET'])
+@token_required
+def get_dictionary_info(payload):
+    """Aktuelles Kompressions-Wörterbuch (Version und URL) für dcz-Bundles."""
+    try:
+        dictionary = dictionaries.latest()
+        if not dictionary:
+            return jsonify({'error': 'No dictionary'}), 404
+
+        response = jsonify({
+            'version': dictionary.version,
+            'url': f'/api/dictionary/{dictionary.version}',
+            'hash': dictionary.header_hash,
+            'size': len(dictionary.data)
+        })
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/dictionary/<version>', methods=['GET'])
+@token_required
+def get_dictionary(payload, version):
+    """Liefert eine Version des Wörterbuchs - unveränderlich, der Browser speichert es als Dictionary."""
+    try:
+        dictionary = dictionaries.get(version)
+        if not dictionary:
+            return jsonify({'error': 'Dictionary not found'}), 404
+
+        response = send_file(
+            dictionaries.file_path(version).resolve(),
+            mimetype='application/octet-stream',
+            conditional=True,
+            etag=dictionary.header_hash.strip(':'),
+            max_age=365 * 24 * 3600
+        )
+        response.headers['Use-As-Dictionary'] = f'match="{DICT_MATCH}", id="{version}"'
+        response.headers['Cache-Control'] = f'private, max-age={365 * 24 * 3600}, immutable'
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/articles', methods=['GET'])
+@token_required
+def list_articles(payload):
+    """Listet Artikel-Metadaten ohne Artikeltext, neueste Tage zuerst.
+
+    Query-Parameter:
+        category: Optional nur diese Kategorie
+        from, to: Optional nur Tage in diesem Bereich (YYYY-MM-DD)
+        cursor: Cursor aus der vorherigen Antwort für die nächste Seite
+        limit: Artikel pro Seite (Standard/Maximum: LIST_MAX_ARTICLES)
+    """
+    try:
+        limit = max(1, min(request.args.get('limit', LIST_MAX_ARTICLES, type=int), LIST_MAX_ARTICLES))
+        after = None
+        if request.args.get('cursor'):
+            # Cursor: "<tag>:<id>" des letzten Artikels der vorherigen Seite
+            day, _, article_id = request.args['cursor'].rpartition(':')
+            if not day or not article_id.isdigit():
+                return jsonify({'error': 'Ungültiger Cursor'}), 400
+            after = (day, int(article_id))
+
+        search_index.refresh()
+        articles = search_index.list(
+            category=request.args.get('category'),
+            date_from=request.args.get('from'),
+            date_to=request.args.get('to'),
+            after=after,
+            limit=limit + 1
+        )
+        cursor = None
+        if len(articles) > limit:
+            articles = articles[:limit]
+            cursor = f"{articles[-1]['day']}:{articles[-1]['id']}"
+
+        return compressed_json({'articles': articles, 'cursor': cursor})
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/search', methods=['GET'])
+@token_required
+def search_articles(payload):
+    """Volltextsuche über alle Archive.
+
+    Query-Parameter:
+        q: Suchbegriffe (Präfixe, "Phrase" in Anführungszeichen)
+        category: Optional nur diese Kategorie
+        from, to: Optional nur Tage in diesem Bereich (YYYY-MM-DD)
+        limit, offset: Seite der Trefferliste (Maximum: SEARCH_MAX_RESULTS)
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Suchbegriff (q) erforderlich'}), 400
+        limit = max(1, min(request.args.get('limit', 20, type=int), SEARCH_MAX_RESULTS))
+        offset = max(0, request.args.get('offset', 0, type=int))
+
+        search_index.refresh()
+        # Einer mehr, um zu erkennen, ob es weitere Treffer gibt
+        results = search_index.search(
+            query,
+            category=request.args.get('category'),
+            date_from=request.args.get('from'),
+            date_to=request.args.get('to'),
+            limit=limit + 1,
+            offset=offset
+        )
+        more = len(results) > limit
+
+        return compressed_json({'query': query, 'results': results[:limit], 'more': more})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -369,7 +738,22 @@ def health_check():
 
 # ==================== Server ====================
 
+def warm_up():
+    """Lädt Archiv-Katalog und User-Index.
+
+    Mit gunicorn.conf.py (preload_app) läuft das im Master vor dem Forken,
+    die Worker erben die fertigen Caches.
+    """
+    archives = json.loads(catalog.list_response().body)['archives']
+    print(f"✓ Katalog geladen: {len(archives)} Archive, {len(users.list())} User")
+
+def reopen_after_fork():
+    """Öffnet Verbindungen neu, die nicht über fork() geteilt werden dürfen."""
+    tracking.reopen()
+    search_index.reopen()
+
 if __name__ == '__main__':
+    # Nur für die Entwicklung - Produktion: gunicorn flask_server:app (siehe gunicorn.conf.py)
     port = int(os.getenv('PORT', 8000))
     print(f"✓ Flask API Server läuft auf http://localhost:{port}")
     print(f"  - /api/auth/login - Login")
@@ -378,4 +762,5 @@ if __name__ == '__main__':
     print(f"  - /api/users      - User-Verwaltung (Admin)")
     print("\nDrücke Ctrl+C zum Beenden")
 
-    app.run(host='0.0.0.0', port=port, debug=True)
+    debug = os.getenv('FLASK_DEBUG', '0').lower() in ('1', 'true', 'yes')
+    app.run(host='0.0.0.0', port=port, debug=debug, threaded=True)
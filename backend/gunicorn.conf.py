@@ -0,0 +1,136 @@
+"""
+Gunicorn-Konfiguration für den Produktionsbetrieb von flask_server.
+
+Start (aus dem backend-Verzeichnis, die Datei wird automatisch gelesen):
+    gunicorn flask_server:app
+
+- Mehrere Worker-Prozesse mit je mehreren Threads (gthread), damit lange
+  Downloads und Logins sich nicht gegenseitig blockieren.
+- preload_app: Die App wird einmal im Master geladen, Archiv-Katalog und
+  User-Index werden dort vorgewärmt und von den Workern per fork() geerbt.
+- SIGHUP (deploy.sh) lädt die Backend-Module neu und startet die Worker
+  sanft neu. Mit GUNICORN_RELOAD_ON_PUBLISH=1 löst der Master das selbst
+  aus, sobald neue Archive veröffentlicht wurden.
+"""
+import os
+import sys
+import time
+import signal
+import threading
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', 2))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+preload_app = os.getenv('GUNICORN_PRELOAD', '1').lower() in ('1', 'true', 'yes')
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+RELOAD_ON_PUBLISH = os.getenv('GUNICORN_RELOAD_ON_PUBLISH', '0').lower() in ('1', 'true', 'yes')
+PUBLISH_CHECK_INTERVAL = float(os.getenv('GUNICORN_PUBLISH_CHECK_INTERVAL', 30))
+
+
+def _app_module():
+    """Das geladene flask_server-Modul (None, solange die App nicht geladen ist)."""
+    return sys.modules.get('flask_server')
+
+
+def _warm_up(server):
+    module = _app_module()
+    if module is None:
+        return
+    try:
+        module.warm_up()
+    except Exception as e:
+        server.log.warning(f"⚠ Vorwärmen fehlgeschlagen: {e}")
+
+
+def _reload_app(server):
+    """
+    Lädt die Backend-Module neu (bei preload_app verwendet gunicorn sonst die alte App).
+
+    Schlägt der Import fehl, laufen die neuen Worker mit der bisherigen App weiter.
+    """
+    previous = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if name.startswith('__') or not path:
+            continue
+        if Path(path).resolve().parent == BACKEND_DIR:
+            previous[name] = sys.modules.pop(name)
+
+    old_callable = server.app.callable
+    server.app.callable = None
+    try:
+        server.app.wsgi()
+    except BaseException as e:
+        server.log.error(f"✗ Neuladen fehlgeschlagen, verwende bisherige App: {e}")
+        sys.modules.update(previous)
+        server.app.callable = old_callable
+        return False
+    return True
+
+
+def _publish_signature(articles_dir):
+    """Signatur der veröffentlichten Archive und Bundles (nur stat, keine Locks)."""
+    entries = []
+    for pattern in ('*.zip', '*.json', 'packs/*.pack'):
+        for path in articles_dir.glob(pattern):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path.relative_to(articles_dir).as_posix(), st.st_mtime_ns, st.st_size))
+    return sorted(entries)
+
+
+def _watch_publish(server):
+    """
+    Thread im Master: Sendet SIGHUP, wenn sich die Archive geändert haben.
+
+    Der Sync kopiert mehrere Dateien nacheinander, deshalb wird erst neu
+    geladen, wenn die Signatur ein ganzes Intervall lang stabil war.
+    Der Thread fasst keine Caches oder Locks der App an, damit fork()
+    im Master sicher bleibt.
+    """
+    articles_dir = Path(os.getenv('OUTPUT_DIR', './articles'))
+    published = _publish_signature(articles_dir)
+    while True:
+        time.sleep(PUBLISH_CHECK_INTERVAL)
+        current = _publish_signature(articles_dir)
+        if current == published:
+            continue
+        time.sleep(PUBLISH_CHECK_INTERVAL)
+        if _publish_signature(articles_dir) != current:
+            continue  # Sync läuft noch, beim nächsten Durchlauf erneut prüfen
+        published = current
+        server.log.info("→ Neue Archive veröffentlicht, lade Worker neu")
+        os.kill(os.getpid(), signal.SIGHUP)
+
+
+def when_ready(server):
+    _warm_up(server)
+    if RELOAD_ON_PUBLISH:
+        threading.Thread(target=_watch_publish, args=(server,),
+                         name='publish-watch', daemon=True).start()
+
+
+def on_reload(server):
+    if server.cfg.preload_app and _reload_app(server):
+        _warm_up(server)
+
+
+def post_fork(server, worker):
+    module = _app_module()
+    if module is not None:
+        module.reopen_after_fork()
+
+
+def post_worker_init(worker):
+    # Ohne preload_app lädt jeder Worker die App selbst
+    if not worker.cfg.preload_app:
+        _warm_up(worker)
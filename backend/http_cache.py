@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+HTTP-Cache für den Scraper - Transport-Adapter für requests.Session.
+
+Antworten auf GET-Requests werden mit ETag/Last-Modified in einer
+SQLite-Datei abgelegt. Innerhalb der TTL kommt die Antwort direkt aus dem
+Cache, danach wird mit If-None-Match/If-Modified-Since nachgefragt; bei
+304 wird der gespeicherte Body verwendet. Requests mit
+"Cache-Control: no-cache" (z.B. die Artikel-Liste) werden immer
+nachgefragt. Der Cache dient gleichzeitig als
+Korpus der Roh-HTML-Seiten, z.B. um neue Extraktoren gegen echte Seiten
+laufen zu lassen (iter_responses).
+"""
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Header, die zusammen mit dem Body gespeichert werden
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def build_response(url, entry, request=None):
+    """Baut eine requests.Response aus einem Cache-Eintrag."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = 'OK'
+    resp.url = url
+    resp.request = request
+    resp.headers = CaseInsensitiveDict(entry['headers'])
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    resp._content = entry['body']
+    resp.from_cache = True
+    return resp
+
+
+class HTTPCache:
+    """Persistente Ablage von HTTP-Antworten (SQLite, Body zlib-komprimiert)."""
+
+    def __init__(self, path, max_bytes: int = 500 * 1024 * 1024, max_age_days: float = 30):
+        """
+        Args:
+            path: Pfad zur SQLite-Datei (wird bei Bedarf erstellt)
+            max_bytes: Maximale Gesamtgrösse der komprimierten Bodies
+            max_age_days: Einträge, die so lange nicht mehr validiert wurden, fliegen raus
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 24 * 3600
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                validated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_validated ON responses (validated_at)")
+        self._conn.commit()
+
+    def get(self, url):
+        """Gibt den Eintrag für eine URL zurück (Dict) oder None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers, body, fetched_at, validated_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'headers': json.loads(row[0]),
+            'body': zlib.decompress(row[1]),
+            'fetched_at': row[2],
+            'validated_at': row[3]
+        }
+
+    def put(self, url, headers, body):
+        """Speichert eine Antwort (nur die Header aus STORED_HEADERS)."""
+        stored = {name: headers[name] for name in STORED_HEADERS if name in headers}
+        compressed = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, headers, body, size, fetched_at, validated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, json.dumps(stored), compressed, len(compressed), now, now)
+            )
+            self._conn.commit()
+
+    def touch(self, url):
+        """Markiert einen Eintrag als soeben validiert (nach 304)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET validated_at = ? WHERE url = ?", (time.time(), url)
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """Entfernt alte Einträge und hält die Gesamtgrösse unter max_bytes."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM responses WHERE validated_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                to_delete = []
+                for url, size in self._conn.execute(
+                        "SELECT url, size FROM responses ORDER BY validated_at ASC"):
+                    if total <= self.max_bytes:
+                        break
+                    to_delete.append((url,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE url = ?", to_delete)
+                removed += len(to_delete)
+
+            self._conn.commit()
+            return removed
+
+    def iter_responses(self):
+        """Liefert (url, Response) für alle gespeicherten Seiten (Replay)."""
+        with self._lock:
+            urls = [row[0] for row in self._conn.execute("SELECT url FROM responses ORDER BY url")]
+        for url in urls:
+            entry = self.get(url)
+            if entry:
+                yield url, build_response(url, entry)
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter mit Cache und Conditional Requests für GET."""
+
+    def __init__(self, cache: HTTPCache, ttl: float = 300, **kwargs):
+        """
+        Args:
+            cache: Ablage für die Antworten
+            ttl: Sekunden, in denen eine Antwort ohne Nachfrage verwendet wird
+            **kwargs: Weiter an HTTPAdapter (z.B. pool_maxsize)
+        """
+        self.cache = cache
+        self.ttl = ttl
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET' or kwargs.get('stream'):
+            return super().send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        revalidate = 'no-cache' in request.headers.get('Cache-Control', '')
+        if entry and not revalidate and time.time() - entry['validated_at'] < self.ttl:
+            self.cache.hits += 1
+            return build_response(request.url, entry, request)
+
+        if entry:
+            headers = CaseInsensitiveDict(entry['headers'])
+            if 'ETag' in headers:
+                request.headers['If-None-Match'] = headers['ETag']
+            if 'Last-Modified' in headers:
+                request.headers['If-Modified-Since'] = headers['Last-Modified']
+
+        resp = super().send(request, **kwargs)
+
+        if resp.status_code == 304 and entry:
+            resp.close()
+            self.cache.revalidated += 1
+            self.cache.touch(request.url)
+            return build_response(request.url, entry, request)
+
+        self.cache.misses += 1
+        if resp.status_code == 200:
+            self.cache.put(request.url, resp.headers, resp.content)
+        return resp
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Persistenter Cache für LLM-Ergebnisse (bereinigte Artikel, Zusammenfassungen)."""
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+
+class LLMCache:
+    """
+    Content-adressierter Cache in einer SQLite-Datei.
+
+    Der Schlüssel ist ein Hash über alle Eingaben, die das Ergebnis bestimmen
+    (Modell, Prompt-Version, Art des Requests, Titel, Content). Ändert sich
+    eine davon, wird automatisch neu angefragt. Einträge werden nach Alter
+    und Gesamtgrösse verdrängt (zuletzt benutzte bleiben am längsten).
+    """
+
+    def __init__(self, path, max_bytes: int = 200 * 1024 * 1024, max_age_days: float = 90):
+        """
+        Args:
+            path: Pfad zur SQLite-Datei (wird bei Bedarf erstellt)
+            max_bytes: Maximale Gesamtgrösse der gespeicherten Ergebnisse
+            max_age_days: Maximales Alter eines Eintrags in Tagen
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 24 * 3600
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Erstellt den Cache-Schlüssel aus allen Eingaben."""
+        digest = hashlib.sha256()
+        for part in parts:
+            data = str(part).encode('utf-8')
+            # Längenpräfix, damit ('ab', 'c') und ('a', 'bc') verschieden sind
+            digest.update(len(data).to_bytes(8, 'big'))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Gibt das gespeicherte Ergebnis zurück oder None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.max_age:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value):
+        """Speichert ein Ergebnis (str oder JSON-serialisierbares Objekt)."""
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode('utf-8')), now, now)
+            )
+            self._conn.commit()
+            self._puts += 1
+
+        if self._puts % 100 == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Entfernt abgelaufene Einträge und hält die Gesamtgrösse unter max_bytes."""
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM entries WHERE created_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                to_delete = []
+                for key, size in self._conn.execute(
+                        "SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+                    if total <= self.max_bytes:
+                        break
+                    to_delete.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", to_delete)
+                removed += len(to_delete)
+
+            self._conn.commit()
+            return removed
+
+    def stats(self) -> dict:
+        """Gibt Treffer, Fehlschläge und Grösse des Caches zurück."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'bytes': size
+        }
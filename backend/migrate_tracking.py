@@ -1,15 +1,16 @@
 #!/usr/bin/env python3
 """
-Migration Script - Initialisiert Tracking-Datei aus bestehenden Artikeln.
+Migration Script - Initialisiert das Tracking aus bestehenden Artikeln.
 
 Dieses Script durchsucht alle bestehenden Artikel-Verzeichnisse und
-erstellt eine scraped_articles.json mit allen URLs, die bereits
-heruntergeladen wurden.
+füllt den Tracking-Store (tracking.db) mit allen URLs, die bereits
+heruntergeladen wurden. Eine vorhandene scraped_articles.json wird beim
+ersten Öffnen des Stores automatisch übernommen.
 """
 from pathlib import Path
-import json
 import re
-from datetime import datetime
+
+from tracking_store import TrackingStore
 
 
 def extract_url_from_markdown(md_file):
@@ -43,21 +44,22 @@ def extract_title_from_markdown(md_file):
 
 def main():
     output_dir = Path('./articles')
-    tracking_file = output_dir / 'scraped_articles.json'
+    tracking = TrackingStore(output_dir / 'tracking.db',
+                             legacy_json=output_dir / 'scraped_articles.json')
 
     print(f"\n{'='*50}")
     print("NZZ Scraper - Tracking Migration")
     print(f"{'='*50}\n")
 
-    # Prüfe ob Tracking-Datei bereits existiert
-    if tracking_file.exists():
-        print(f"⚠ Tracking-Datei existiert bereits: {tracking_file}")
+    # Prüfe ob bereits Artikel im Tracking sind
+    if len(tracking) > 0:
+        print(f"⚠ Tracking enthält bereits {len(tracking)} Artikel: {tracking.path}")
         response = input("  Überschreiben? (y/n): ")
         if response.lower() != 'y':
             print("✗ Migration abgebrochen")
             return
+        tracking.clear()
 
-    tracking = {'articles': [], 'last_updated': None}
     urls_seen = set()  # Zur Duplikatserkennung
 
     # Durchsuche alle Datum-Ordner (Format: 2026-02-17)
@@ -65,7 +67,7 @@ def main():
 
     if not date_folders:
         print("ℹ Keine bestehenden Artikel-Ordner gefunden")
-        print("✓ Leere Tracking-Datei wird erstellt")
+        print("✓ Leeres Tracking wird erstellt")
     else:
         print(f"ℹ {len(date_folders)} Datum-Ordner gefunden\n")
 
@@ -96,26 +98,23 @@ def main():
                     urls_seen.add(url)
                     title = extract_title_from_markdown(md_file)
 
-                    tracking['articles'].append({
-                        'url': url,
-                        'scraped_date': date_folder.name,
-                        'filename': f"{date_folder.name}/{category}/{md_file.name}",
-                        'title': title
-                    })
+                    tracking.add(
+                        url=url,
+                        scraped_date=date_folder.name,
+                        scraped_at=None,
+                        filename=f"{date_folder.name}/{category}/{md_file.name}",
+                        title=title
+                    )
 
                     articles_in_folder += 1
 
             print(f"  ✓ {articles_in_folder} Artikel gefunden\n")
 
-    # Tracking-Datei speichern
-    tracking['last_updated'] = datetime.now().isoformat()
-
-    with open(tracking_file, 'w', encoding='utf-8') as f:
-        json.dump(tracking, f, indent=2, ensure_ascii=False)
+    tracking.touch()
 
     print(f"{'='*50}")
-    print(f"✓ Tracking-Datei erstellt: {tracking_file}")
-    print(f"✓ {len(tracking['articles'])} Artikel zum Tracking hinzugefügt")
+    print(f"✓ Tracking erstellt: {tracking.path}")
+    print(f"✓ {len(tracking)} Artikel im Tracking")
     print(f"{'='*50}\n")
 
 
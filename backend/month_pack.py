@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Monats-Packs - Kaltlager für abgeschlossene Monate.
+
+Pro Tag liegen im Artikel-Verzeichnis ein Ordner mit den Markdown-Dateien
+und dem Manifest, das ZIP und die JSON-Bundles - jeden Tag ein paar Dutzend
+Dateien mehr, die jeder Verzeichnis-Scan mitlesen muss. pack_month() fasst
+einen abgeschlossenen Monat in einer Datei packs/<YYYY-MM>.pack zusammen und
+löscht die losen Dateien.
+
+Ein Pack ist ein ZIP, das Central Directory ist der Index:
+- <datum>.zip, <datum>.json.gz/.br/.dcz liegen unkomprimiert
+  darin (sie sind schon komprimiert) und werden per Byte-Range direkt aus
+  dem Pack ausgeliefert, einzelne Artikel direkt aus dem inneren ZIP
+- <datum>/manifest.json (Tages-Katalog für /api/list und /api/catalog)
+- Jeder Member trägt als Kommentar den ETag der losen Datei, Clients laden
+  nach dem Packen nichts neu herunter
+
+Die Server lesen zuerst die losen Dateien und fallen auf den Pack zurück
+(locate_day_file, open_day_member) - /api/list, /api/download/<datum> und
+/api/article/... funktionieren unverändert.
+
+Packen (z.B. nach jedem Scraper-Run, ohne abgeschlossene Monate passiert nichts):
+    python3 month_pack.py
+    python3 month_pack.py --month 2026-01
+"""
+import os
+import re
+import json
+import shutil
+import hashlib
+import zipfile
+from datetime import date as Date, timedelta
+from pathlib import Path
+
+from safe_io import atomic_file
+from zip_archive import FileWindow, read_member_raw, write_member_raw
+
+PACKS_DIR = 'packs'
+PACK_SUFFIX = '.pack'
+
+DAY = re.compile(r'^(\d{4}-\d{2})-\d{2}$')
+MONTH = re.compile(r'^\d{4}-\d{2}$')
+
+# Dateien eines Tages im Pack (alle schon komprimiert)
+PACKED_SUFFIXES = ('.zip', '.json.gz', '.json.br', '.json.dcz')
+# Das unkomprimierte Bundle kommt nicht in den Pack, der Server entpackt .json.gz
+LOOSE_SUFFIXES = PACKED_SUFFIXES + ('.json',)
+MANIFEST_NAME = 'manifest.json'
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def pack_path(articles_dir, day):
+    """Pfad des Packs für einen Tag oder Monat (None für ungültige Angaben)."""
+    month = day[:7]
+    if not MONTH.match(month) or not (day == month or DAY.match(day)):
+        return None
+    return Path(articles_dir) / PACKS_DIR / f"{month}{PACK_SUFFIX}"
+
+
+def list_packs(articles_dir):
+    """Alle Packs im Artikel-Verzeichnis."""
+    return sorted((Path(articles_dir) / PACKS_DIR).glob(f'*{PACK_SUFFIX}'))
+
+
+def read_pack_manifests(path):
+    """Liest die Tage eines Packs: {Datum: Manifest}."""
+    manifests = {}
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        for name in sorted(names):
+            day = name[:-len('.zip')]
+            if not name.endswith('.zip') or not DAY.match(day):
+                continue
+            manifest_name = f"{day}/{MANIFEST_NAME}"
+            manifests[day] = json.loads(zf.read(manifest_name)) if manifest_name in names else {}
+    return manifests
+
+
+class DayFile:
+    """Eine Datei eines Tages (<datum>.zip, <datum>.json.gz, ...) - lose oder im Pack."""
+
+    def __init__(self, path, offset, size, etag=None):
+        """
+        Args:
+            path: Lose Datei oder Pack
+            offset: Position der Daten in path (0 für lose Dateien)
+            size: Grösse in Bytes
+            etag: ETag aus dem Pack (lose Dateien: None, siehe
+                ArchiveCatalog.archive_etag)
+        """
+        self.path = Path(path)
+        self.offset = offset
+        self.size = size
+        self.etag = etag
+
+    @property
+    def packed(self):
+        return self.path.suffix == PACK_SUFFIX
+
+    def open(self):
+        """Öffnet die Datei zum Lesen (im Pack als FileWindow)."""
+        if not self.packed:
+            return open(self.path, 'rb')
+        return FileWindow(self.path, self.offset, self.size)
+
+
+def locate_day_file(articles_dir, zip_index, name):
+    """
+    Sucht eine Datei eines Tages, zuerst lose, dann im Monats-Pack.
+
+    Args:
+        articles_dir: Artikel-Verzeichnis
+        zip_index: ZipIndex (cacht das Central Directory der Packs)
+        name: Dateiname, z.B. "2026-01-05.zip"
+
+    Returns:
+        DayFile oder None
+    """
+    path = Path(articles_dir) / name
+    try:
+        return DayFile(path, 0, path.stat().st_size)
+    except FileNotFoundError:
+        pass
+
+    pack = pack_path(articles_dir, name.split('.', 1)[0])
+    located = zip_index.locate(pack, name) if pack else None
+    if located is None:
+        return None
+    info, offset = located
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    return DayFile(pack, offset, info.file_size, info.comment.decode('ascii') or None)
+
+
+def open_day_member(articles_dir, zip_index, date, name):
+    """Öffnet einen Artikel ("<datum>/<kategorie>/<datei>.md") aus dem Tages-ZIP - lose oder im Pack."""
+    member = zip_index.open_member(Path(articles_dir) / f"{date}.zip", name)
+    if member is None:
+        pack = pack_path(articles_dir, date)
+        if pack:
+            member = zip_index.open_member(pack, name, inner=f"{date}.zip")
+    return member
+
+
+def loose_days(articles_dir, month=None):
+    """Tage mit losen Dateien (ZIP oder Ordner), optional nur eines Monats."""
+    days = set()
+    for path in Path(articles_dir).glob(f"{month or '*'}-*"):
+        day = path.name.split('.', 1)[0]
+        if DAY.match(day) and (path.is_dir() or path.name == f"{day}.zip"):
+            days.add(day)
+    return sorted(days)
+
+
+def packable_months(articles_dir, keep_days=7, today=None):
+    """
+    Abgeschlossene Monate mit losen Dateien.
+
+    Ein Monat wird gepackt, wenn sein letzter Tag mehr als keep_days Tage
+    zurückliegt (--rescrape und Nachzügler betreffen nur die letzten Tage).
+    """
+    today = today or Date.today()
+    months = []
+    for month in sorted({day[:7] for day in loose_days(articles_dir)}):
+        year, number = map(int, month.split('-'))
+        next_month = Date(year + number // 12, number % 12 + 1, 1)
+        if (today - (next_month - timedelta(days=1))).days > keep_days:
+            months.append(month)
+    return months
+
+
+def _file_etag(path):
+    """Wie ArchiveCatalog.archive_etag: SHA-1 über den Inhalt."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:20]
+
+
+def _day_manifest(articles_dir, day):
+    """Manifest eines Tages aus dem Ordner (Scraper) oder aus dem Tages-ZIP (Server)."""
+    path = articles_dir / day / MANIFEST_NAME
+    if path.exists():
+        return path.read_bytes()
+    try:
+        with zipfile.ZipFile(articles_dir / f"{day}.zip") as zf:
+            return zf.read(f"{day}/{MANIFEST_NAME}")
+    except KeyError:
+        return None
+
+
+def pack_month(articles_dir, month):
+    """
+    Packt die losen Dateien eines Monats und löscht sie danach.
+
+    Tage, die schon im Pack liegen, werden übernommen bzw. durch die losen
+    Dateien ersetzt. Liegen alle losen Dateien bereits mit gleichem Inhalt
+    im Pack (z.B. auf dem Server nach dem Sync), wird der Pack nicht neu
+    geschrieben, nur die losen Dateien gelöscht.
+
+    Returns:
+        Dict mit gepackten Tagen ('days'), Dateien im Pack ('files'),
+        gelöschten losen Dateien ('removed') und Grösse des Packs ('size')
+    """
+    articles_dir = Path(articles_dir)
+    pack = pack_path(articles_dir, month)
+    if pack is None:
+        raise ValueError(f"Ungültiger Monat: {month}")
+
+    days = []
+    for day in loose_days(articles_dir, month):
+        if (articles_dir / f"{day}.zip").exists():
+            days.append(day)
+        else:
+            print(f"⚠ {day}: Kein ZIP, Tag bleibt lose")
+
+    stats = {'days': len(days), 'files': 0, 'removed': 0, 'size': 0}
+    if not days:
+        return stats
+
+    files = [(articles_dir / f"{day}{suffix}", f"{day}{suffix}")
+             for day in days for suffix in PACKED_SUFFIXES
+             if (articles_dir / f"{day}{suffix}").exists()]
+    etags = {arcname: _file_etag(path) for path, arcname in files}
+
+    # Bereits gepackt (gleicher ETag)?
+    packed = {}
+    if pack.exists():
+        with zipfile.ZipFile(pack) as zf:
+            packed = {info.filename: info.comment.decode('ascii') for info in zf.infolist()}
+    if any(packed.get(arcname) != etag for arcname, etag in etags.items()):
+        _write_pack(articles_dir, pack, days, files, etags)
+    else:
+        print(f"ℹ {month}: Alle Tage schon im Pack, lösche nur die losen Dateien")
+
+    # Erst nach dem Rename löschen - bis dahin liefern die Server die losen Dateien aus
+    for day in days:
+        for suffix in LOOSE_SUFFIXES:
+            path = articles_dir / f"{day}{suffix}"
+            if path.exists():
+                path.unlink()
+                stats['removed'] += 1
+        folder = articles_dir / day
+        if folder.is_dir():
+            stats['removed'] += sum(1 for _ in folder.rglob('*')) + 1
+            shutil.rmtree(folder)
+
+    with zipfile.ZipFile(pack) as zf:
+        stats['files'] = len(zf.infolist())
+    stats['size'] = pack.stat().st_size
+    return stats
+
+
+def _write_pack(articles_dir, pack, days, files, etags):
+    """Schreibt den Pack neu (temporäre Datei, Prüfung, Rename)."""
+    pack.parent.mkdir(parents=True, exist_ok=True)
+    repacked = set(days)
+
+    old_zf = zipfile.ZipFile(pack) if pack.exists() else None
+    try:
+        with atomic_file(pack, 'w+b') as f:
+            with zipfile.ZipFile(f, 'w') as zf:
+                if old_zf:
+                    for info in old_zf.infolist():
+                        # Neu gepackte Tage ganz ersetzen (auch Varianten, die es nicht mehr gibt)
+                        if info.filename.split('/')[0].split('.')[0] not in repacked:
+                            write_member_raw(zf, info, read_member_raw(old_zf, info))
+                            zf.filelist[-1].comment = info.comment
+
+                for path, arcname in files:
+                    zf.write(path, arcname, zipfile.ZIP_STORED)
+                    zf.getinfo(arcname).comment = etags[arcname].encode('ascii')
+
+                for day in days:
+                    manifest = _day_manifest(articles_dir, day)
+                    if manifest is not None:
+                        zf.writestr(f"{day}/{MANIFEST_NAME}", manifest, zipfile.ZIP_DEFLATED)
+
+            # Vor dem Ersetzen prüfen - eine Exception verwirft die temporäre Datei
+            f.seek(0)
+            with zipfile.ZipFile(f) as zf:
+                broken = zf.testzip()
+            if broken:
+                raise zipfile.BadZipFile(f"Pack fehlerhaft geschrieben ({broken})")
+    finally:
+        if old_zf:
+            old_zf.close()
+
+
+def main():
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    arg_parser = argparse.ArgumentParser(description='Abgeschlossene Monate in Monats-Packs verschieben')
+    arg_parser.add_argument('--articles', default=os.getenv('OUTPUT_DIR', './articles'),
+                            help='Artikel-Verzeichnis (Standard: OUTPUT_DIR)')
+    arg_parser.add_argument('--month', action='append',
+                            help='Nur diesen Monat packen (YYYY-MM, mehrfach möglich)')
+    arg_parser.add_argument('--keep-days', type=int, default=int(os.getenv('PACK_KEEP_DAYS', 7)),
+                            help='Tage, die mindestens lose bleiben (Standard: 7)')
+    arg_parser.add_argument('--dry-run', action='store_true',
+                            help='Nur anzeigen, welche Monate gepackt würden')
+    args = arg_parser.parse_args()
+
+    articles_dir = Path(args.articles)
+    months = args.month or packable_months(articles_dir, args.keep_days)
+    if not months:
+        print("ℹ Keine abgeschlossenen Monate mit losen Dateien")
+        return
+
+    if args.dry_run:
+        for month in months:
+            print(f"→ {month}: {len(loose_days(articles_dir, month))} Tage")
+        return
+
+    from article_index import ArticleIndex
+    index_path = articles_dir / 'search.db'
+    index = ArticleIndex(index_path) if index_path.exists() else None
+
+    for month in months:
+        stats = pack_month(articles_dir, month)
+        if not stats['days']:
+            print(f"ℹ {month}: Keine losen Tage")
+            continue
+        if index:
+            index.set_archive(month, f"{PACKS_DIR}/{month}{PACK_SUFFIX}")
+        print(f"✓ {month}: {stats['days']} Tage gepackt, {stats['removed']} lose Dateien gelöscht "
+              f"({stats['files']} Dateien im Pack, {stats['size'] / 1024 / 1024:.1f} MB)")
+
+    if index:
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
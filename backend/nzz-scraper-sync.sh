@@ -23,19 +23,33 @@ SCRAPER_EXIT=$?
 if [ $SCRAPER_EXIT -eq 0 ]; then
     echo "✓ Scraper erfolgreich" >> "$LOG_FILE"
     
+    # Abgeschlossene Monate in Monats-Packs verschieben
+    python month_pack.py >> "$LOG_FILE" 2>&1
+    
     # Neue .zip-Dateien auf Server kopieren
-    rsync -avz --progress "$LOCAL_DIR/articles/"*.zip "$REMOTE_USER@$REMOTE_HOST:$REMOTE_DIR/" >> "$LOG_FILE" 2>&1
+    rsync -avz --progress "$LOCAL_DIR/articles/"*.zip "$LOCAL_DIR/articles/"20*.json* "$REMOTE_USER@$REMOTE_HOST:$REMOTE_DIR/" >> "$LOG_FILE" 2>&1
     RSYNC_EXIT=$?
     
     if [ $RSYNC_EXIT -eq 0 ]; then
-        echo "✓ ZIP-Dateien auf Server kopiert" >> "$LOG_FILE"
+        echo "✓ ZIP-Dateien und JSON-Bundles auf Server kopiert" >> "$LOG_FILE"
+        
+        # Tracking-Datenbank und Suchindex erst nach den ZIPs: /api/sync liefert
+        # nur Artikel, die im Tages-ZIP auf dem Server liegen
+        rsync -avz "$LOCAL_DIR/articles/tracking.db" "$LOCAL_DIR/articles/search.db" "$REMOTE_USER@$REMOTE_HOST:$REMOTE_DIR/" >> "$LOG_FILE" 2>&1
     else
-        echo "✗ Fehler beim Kopieren (Exit: $RSYNC_EXIT)" >> "$LOG_FILE"
+        echo "✗ Fehler beim Kopieren (Exit: $RSYNC_EXIT), Tracking nicht synchronisiert" >> "$LOG_FILE"
+    fi
+    
+    # Kompressions-Wörterbücher (für .json.dcz) kopieren
+    if [ -d "$LOCAL_DIR/articles/dictionaries" ]; then
+        rsync -avz "$LOCAL_DIR/articles/dictionaries" "$REMOTE_USER@$REMOTE_HOST:$REMOTE_DIR/" >> "$LOG_FILE" 2>&1
     fi
     
-    # Auch scraped_articles.json und Manifeste synchronisieren
-    rsync -avz "$LOCAL_DIR/articles/scraped_articles.json" "$REMOTE_USER@$REMOTE_HOST:$REMOTE_DIR/" >> "$LOG_FILE" 2>&1
-    rsync -avz "$LOCAL_DIR/articles/"*/manifest.json "$REMOTE_USER@$REMOTE_HOST:$REMOTE_DIR/" 2>/dev/null || true
+    # Monats-Packs kopieren, danach auf dem Server die gepackten losen Dateien löschen
+    if [ -d "$LOCAL_DIR/articles/packs" ]; then
+        rsync -avz "$LOCAL_DIR/articles/packs" "$REMOTE_USER@$REMOTE_HOST:$REMOTE_DIR/" >> "$LOG_FILE" 2>&1 \
+            && ssh "$REMOTE_USER@$REMOTE_HOST" "cd '$REMOTE_DIR/..' && venv/bin/python month_pack.py" >> "$LOG_FILE" 2>&1
+    fi
     
 else
     echo "✗ Scraper fehlgeschlagen (Exit: $SCRAPER_EXIT)" >> "$LOG_FILE"
@@ -2,30 +2,121 @@
 """OpenRouter API Client für AI-basierte Textbereinigung."""
 import os
 import time
+import asyncio
+import threading
 import requests
+from functools import wraps
+from pathlib import Path
 from typing import Optional
 
+from llm_cache import LLMCache
+
+# Bei jeder Änderung an den Prompts erhöhen, damit der Cache neu befüllt wird
+PROMPT_VERSION = 1
+
+
+def cached(kind: str):
+    """Decorator: Ergebnis von method(self, content, title) im LLM-Cache ablegen."""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, content, title):
+            if not self.cache:
+                return method(self, content, title)
+
+            key = self.cache.make_key(self.model, PROMPT_VERSION, kind, title, content)
+            result = self.cache.get(key)
+            if result is not None:
+                return result
+
+            result = method(self, content, title)
+            if result is not None:
+                self.cache.put(key, result)
+            return result
+        return wrapper
+    return decorator
+
 
 class OpenRouterClient:
     """Client für OpenRouter API."""
 
-    def __init__(self, api_key: str = None, model: str = None):
+    # Trennmarken für die kombinierte Antwort (Bereinigung + Zusammenfassung)
+    SUMMARY_MARKER = '===ZUSAMMENFASSUNG==='
+    ARTICLE_MARKER = '===ARTIKEL==='
+
+    def __init__(self, api_key: str = None, model: str = None, cache_path: str = None):
         """
         Initialize OpenRouter client.
 
         Args:
             api_key: OpenRouter API key (falls None, wird aus .env gelesen)
             model: Model ID (default: google/gemini-2.5-flash-lite)
+            cache_path: SQLite-Datei für den LLM-Cache (default: LLM_CACHE_PATH
+                oder OUTPUT_DIR/llm_cache.db; LLM_CACHE=0 deaktiviert den Cache)
         """
         self.api_key = api_key or os.getenv('OPENROUTER_API_KEY')
         self.model = model or os.getenv('OPENROUTER_MODEL', 'google/gemini-2.5-flash-lite')
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
         self.last_request_time = 0
-        self.min_request_interval = 2.0  # Minimum 2 Sekunden zwischen Requests
+        # Minimum 2 Sekunden zwischen Requests (über OPENROUTER_MIN_INTERVAL anpassbar)
+        self.min_request_interval = float(os.getenv('OPENROUTER_MIN_INTERVAL', 2.0))
+        self._rate_lock = threading.Lock()
 
         if not self.api_key:
             raise ValueError("OpenRouter API key nicht gefunden. Bitte OPENROUTER_API_KEY in .env setzen.")
 
+        self.cache = None
+        if os.getenv('LLM_CACHE', '1').lower() not in ('0', 'false', 'no'):
+            cache_path = cache_path or os.getenv('LLM_CACHE_PATH') or \
+                Path(os.getenv('OUTPUT_DIR', './articles')) / 'llm_cache.db'
+            self.cache = LLMCache(
+                cache_path,
+                max_bytes=int(float(os.getenv('LLM_CACHE_MAX_MB', 200)) * 1024 * 1024),
+                max_age_days=float(os.getenv('LLM_CACHE_MAX_AGE_DAYS', 90))
+            )
+
+    def close(self):
+        """Gibt offene Verbindungen frei (hier keine, siehe AsyncOpenRouterClient)."""
+
+    def _wait_for_rate_limit(self):
+        """Wartet bis der nächste Request erlaubt ist (thread-safe)."""
+        with self._rate_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.min_request_interval:
+                time.sleep(self.min_request_interval - elapsed)
+            self.last_request_time = time.time()
+
+    def _chat(self, system: str, prompt: str, temperature: float) -> str:
+        """
+        Sendet einen Chat-Request und gibt den Antworttext zurück.
+
+        Raises:
+            requests.exceptions.RequestException: Bei Netzwerk- oder HTTP-Fehlern
+            KeyError, IndexError: Bei unerwartetem Response-Format
+        """
+        self._wait_for_rate_limit()
+        response = requests.post(
+            self.base_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt}
+                ],
+                "temperature": temperature,
+            },
+            timeout=30
+        )
+
+        response.raise_for_status()
+        result = response.json()
+
+        return result['choices'][0]['message']['content'].strip()
+
+    @cached('clean')
     def clean_article_content(self, raw_content: str, title: str) -> Optional[str]:
         """
         Bereinigt Artikelinhalt mit AI.
@@ -39,42 +130,12 @@ class OpenRouterClient:
         """
         prompt = self._build_cleaning_prompt(raw_content, title)
 
-        # Rate limiting: wait if needed
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-
         try:
-            self.last_request_time = time.time()
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "Du bist ein Experte für die Bereinigung von Nachrichtenartikeln. Deine Aufgabe ist es, nur den reinen Artikelinhalt zu extrahieren und schön zu formatieren."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.1,  # Low temperature für konsistente Ergebnisse
-                },
-                timeout=30
+            return self._chat(
+                "Du bist ein Experte für die Bereinigung von Nachrichtenartikeln. Deine Aufgabe ist es, nur den reinen Artikelinhalt zu extrahieren und schön zu formatieren.",
+                prompt,
+                temperature=0.1,  # Low temperature für konsistente Ergebnisse
             )
-
-            response.raise_for_status()
-            result = response.json()
-
-            cleaned_content = result['choices'][0]['message']['content'].strip()
-            return cleaned_content
-
         except requests.exceptions.Timeout:
             print(f"  ⚠ OpenRouter Timeout - verwende Original-Content")
             return None
@@ -85,8 +146,10 @@ class OpenRouterClient:
             print(f"  ⚠ Ungültiges Response-Format: {e}")
             return None
 
-    def _build_cleaning_prompt(self, raw_content: str, title: str) -> str:
-        """Erstellt den Prompt für die AI-Bereinigung."""
+    def _build_cleaning_prompt(self, raw_content: str, title: str, output: str = None) -> str:
+        """Erstellt den Prompt für die AI-Bereinigung (optional mit eigenem OUTPUT-Teil)."""
+        output = output or """**OUTPUT:**
+Gib NUR den bereinigten Markdown-Text zurück, OHNE zusätzliche Erklärungen oder Kommentare."""
         return f"""Bereinige den folgenden NZZ-Artikel und entferne alle unerwünschten Elemente.
 
 **ARTIKEL-TITEL:** {title}
@@ -121,9 +184,75 @@ class OpenRouterClient:
 - Listen mit `-` für Aufzählungen
 - Blockquotes mit `>`
 
+{output}"""
+
+    @cached('combined')
+    def clean_and_summarize(self, raw_content: str, title: str) -> Optional[dict]:
+        """
+        Bereinigt den Artikel und erstellt die Zusammenfassung in einem Request.
+
+        Args:
+            raw_content: Roher Markdown-Content vom Scraper
+            title: Artikel-Titel für Kontext
+
+        Returns:
+            Dict mit 'content' und 'summary' oder None, wenn der Request
+            fehlschlägt oder die Antwort nicht geparst werden kann
+        """
+        prompt = self._build_cleaning_prompt(raw_content, title, output=f"""**ZUSAMMENFASSUNG:**
+Erstelle zusätzlich eine Zusammenfassung des Artikels in 50-100 Wörtern auf Deutsch, in verständlichem, fließendem Deutsch, ohne Titel und ohne Überschriften.
+
 **OUTPUT:**
-Gib NUR den bereinigten Markdown-Text zurück, OHNE zusätzliche Erklärungen oder Kommentare."""
+Antworte EXAKT in diesem Format, OHNE zusätzliche Erklärungen oder Kommentare:
+
+{self.SUMMARY_MARKER}
+<Zusammenfassung als plain text>
+{self.ARTICLE_MARKER}
+<bereinigter Markdown-Text>""")
+
+        try:
+            response = self._chat(
+                "Du bist ein Experte für die Bereinigung und das Zusammenfassen von Nachrichtenartikeln auf Deutsch.",
+                prompt,
+                temperature=0.1,
+            )
+        except requests.exceptions.Timeout:
+            print(f"  ⚠ OpenRouter Timeout bei kombiniertem Request")
+            return None
+        except requests.exceptions.RequestException as e:
+            print(f"  ⚠ OpenRouter API Fehler bei kombiniertem Request: {e}")
+            return None
+        except (KeyError, IndexError) as e:
+            print(f"  ⚠ Ungültiges Response-Format bei kombiniertem Request: {e}")
+            return None
+
+        return self._parse_combined_response(response)
+
+    def _parse_combined_response(self, response: str) -> Optional[dict]:
+        """Zerlegt die kombinierte Antwort in Content und Zusammenfassung."""
+        summary_pos = response.find(self.SUMMARY_MARKER)
+        article_pos = response.find(self.ARTICLE_MARKER)
+        if summary_pos == -1 or article_pos == -1 or article_pos < summary_pos:
+            print(f"  ⚠ Kombinierte Antwort ohne erwartete Trennmarken")
+            return None
+
+        summary = response[summary_pos + len(self.SUMMARY_MARKER):article_pos].strip()
+        content = response[article_pos + len(self.ARTICLE_MARKER):].strip()
+
+        # Modelle verpacken die Antwort gelegentlich in einen Code-Block
+        if content.startswith('```'):
+            content = content.split('\n', 1)[-1]
+            if content.rstrip().endswith('```'):
+                content = content.rstrip()[:-3]
+            content = content.strip()
+
+        if not summary or not content or len(summary.split()) > 200:
+            print(f"  ⚠ Kombinierte Antwort unvollständig")
+            return None
 
+        return {'content': content, 'summary': summary}
+
+    @cached('summary')
     def generate_summary(self, content: str, title: str) -> Optional[str]:
         """
         Erstellt eine kurze Zusammenfassung des Artikels (50-100 Wörter).
@@ -135,11 +264,6 @@ Gib NUR den bereinigten Markdown-Text zurück, OHNE zusätzliche Erklärungen od
         Returns:
             Zusammenfassung als plain text oder None bei Fehler
         """
-        # Rate limiting: wait if needed
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-
         prompt = f"""Erstelle eine Zusammenfassung des folgenden Artikels in 50-100 Wörtern auf Deutsch.
 
 **ARTIKEL-TITEL:** {title}
@@ -153,36 +277,11 @@ Gib NUR den bereinigten Markdown-Text zurück, OHNE zusätzliche Erklärungen od
 - Gib NUR die Zusammenfassung zurück, ohne Titel, ohne Überschriften, ohne Erklärungen"""
 
         try:
-            self.last_request_time = time.time()
-            response = requests.post(
-                self.base_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "Du bist ein Experte für das Zusammenfassen von Nachrichtenartikeln auf Deutsch."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,
-                },
-                timeout=30
+            return self._chat(
+                "Du bist ein Experte für das Zusammenfassen von Nachrichtenartikeln auf Deutsch.",
+                prompt,
+                temperature=0.3,
             )
-
-            response.raise_for_status()
-            result = response.json()
-
-            summary = result['choices'][0]['message']['content'].strip()
-            return summary
-
         except requests.exceptions.Timeout:
             print(f"  ⚠ OpenRouter Timeout bei Zusammenfassung")
             return None
@@ -216,3 +315,196 @@ Gib NUR den bereinigten Markdown-Text zurück, OHNE zusätzliche Erklärungen od
         except Exception as e:
             print(f"OpenRouter Connection Test fehlgeschlagen: {e}")
             return False
+
+
+class TokenBucket:
+    """Token-Bucket für Requests und Tokens pro Minute (asyncio).
+
+    Wird von allen laufenden Requests eines Clients geteilt. Beide Budgets
+    füllen sich kontinuierlich auf; ein Request wartet, bis genug von beiden
+    vorhanden ist.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float = 0):
+        """
+        Args:
+            requests_per_minute: Maximale Requests pro Minute
+            tokens_per_minute: Maximale Tokens pro Minute (0 = unbegrenzt)
+        """
+        self.requests_per_minute = float(requests_per_minute)
+        self.tokens_per_minute = float(tokens_per_minute)
+        self._requests = self.requests_per_minute
+        self._tokens = self.tokens_per_minute
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.requests_per_minute,
+                             self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute,
+                               self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    async def acquire(self, tokens: int = 0):
+        """Wartet bis ein Request mit geschätzt `tokens` Tokens erlaubt ist."""
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                tokens_ok = not self.tokens_per_minute or self._tokens >= tokens
+                if self._requests >= 1 and tokens_ok:
+                    self._requests -= 1
+                    if self.tokens_per_minute:
+                        self._tokens -= tokens
+                    return
+
+                wait = (1 - self._requests) * 60 / self.requests_per_minute
+                if not tokens_ok:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+                await asyncio.sleep(max(wait, 0.01))
+
+    def correct(self, estimated: int, actual: int):
+        """Verrechnet die tatsächlich verbrauchten Tokens mit der Schätzung."""
+        if self.tokens_per_minute:
+            self._tokens -= actual - estimated
+
+
+class AsyncOpenRouterClient(OpenRouterClient):
+    """
+    OpenRouter-Client mit asyncio, gepoolter HTTP-Verbindung und Token-Bucket.
+
+    Ein Event-Loop läuft in einem Hintergrund-Thread. Die synchronen Methoden
+    (clean_article_content, generate_summary, ...) können so aus beliebig
+    vielen Worker-Threads gleichzeitig aufgerufen werden; die Requests laufen
+    parallel über eine Verbindung und teilen sich ein Rate-Limit.
+    """
+
+    def __init__(self, api_key: str = None, model: str = None,
+                 requests_per_minute: float = None, tokens_per_minute: float = None,
+                 max_connections: int = None, cache_path: str = None):
+        """
+        Initialize async OpenRouter client.
+
+        Args:
+            api_key: OpenRouter API key (falls None, wird aus .env gelesen)
+            model: Model ID (default: google/gemini-2.5-flash-lite)
+            requests_per_minute: Limit (default: OPENROUTER_RPM oder 60)
+            tokens_per_minute: Limit (default: OPENROUTER_TPM oder 0 = unbegrenzt)
+            max_connections: Grösse des Connection-Pools (default: OPENROUTER_MAX_CONNECTIONS oder 20)
+            cache_path: SQLite-Datei für den LLM-Cache (siehe OpenRouterClient)
+        """
+        super().__init__(api_key, model, cache_path)
+
+        self.requests_per_minute = float(requests_per_minute or os.getenv('OPENROUTER_RPM', 60))
+        self.tokens_per_minute = float(tokens_per_minute or os.getenv('OPENROUTER_TPM', 0))
+        self.max_connections = int(max_connections or os.getenv('OPENROUTER_MAX_CONNECTIONS', 20))
+        self._loop = None
+        self._start_lock = threading.Lock()
+        self._start()
+
+    def _start(self):
+        """Startet Event-Loop, Connection-Pool und Token-Bucket."""
+        import httpx
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True,
+                                        name='openrouter-async')
+        self._thread.start()
+
+        async def setup():
+            client = httpx.AsyncClient(
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=30,
+            )
+            return client, TokenBucket(self.requests_per_minute, self.tokens_per_minute)
+
+        self._http, self.bucket = asyncio.run_coroutine_threadsafe(setup(), self._loop).result()
+
+    def _run(self, coro):
+        """Führt eine Coroutine im Hintergrund-Loop aus und wartet auf das Ergebnis.
+
+        Nach close() wird der Loop beim nächsten Request neu gestartet.
+        """
+        with self._start_lock:
+            if self._loop is None:
+                self._start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _wait_for_rate_limit(self):
+        """Nicht benötigt - das Limit setzt der Token-Bucket durch."""
+
+    @staticmethod
+    def _estimate_tokens(system: str, prompt: str) -> int:
+        # Grobe Schätzung: ~4 Zeichen pro Token, Antwort etwa so lang wie die Eingabe
+        return (len(system) + len(prompt)) // 4 * 2
+
+    async def achat(self, system: str, prompt: str, temperature: float) -> str:
+        """
+        Async-Variante von _chat.
+
+        Läuft im Hintergrund-Loop dieses Clients (Token-Bucket und
+        Connection-Pool gehören zu diesem Loop) - von aussen über _chat
+        bzw. _run aufrufen, nicht aus einem anderen Event-Loop.
+
+        Raises:
+            requests.exceptions.RequestException: Bei Netzwerk- und HTTP-Fehlern
+                sowie unerwartetem Response-Format (wie _chat der Basisklasse)
+        """
+        import httpx
+
+        estimated = self._estimate_tokens(system, prompt)
+        await self.bucket.acquire(estimated)
+
+        try:
+            response = await self._http.post(
+                self.base_url,
+                json={
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": temperature,
+                },
+            )
+            response.raise_for_status()
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+
+        try:
+            result = response.json()
+            usage = result.get('usage') or {}
+            if 'total_tokens' in usage:
+                self.bucket.correct(estimated, usage['total_tokens'])
+            return result['choices'][0]['message']['content'].strip()
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            # Ungültiges JSON oder fehlende Felder: wie ein API-Fehler behandeln,
+            # damit der Aufrufer auf den Original-Content zurückfällt
+            raise requests.exceptions.RequestException(f"Ungültige Antwort: {e!r}") from e
+
+    def _chat(self, system: str, prompt: str, temperature: float) -> str:
+        return self._run(self.achat(system, prompt, temperature))
+
+    def close(self):
+        """Schliesst die HTTP-Verbindungen und stoppt den Event-Loop."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._http.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Streaming-Pipeline für den Scraper.
+
+Eine Pipeline besteht aus Stufen (z.B. Laden → Extrahieren → AI → Speichern),
+die über begrenzte Queues verbunden sind. Jede Stufe läuft in eigenen
+Threads, so dass sich die Stufen überlappen: Während ein Artikel bei der AI
+liegt, wird der nächste schon geladen und der vorherige bereits gespeichert.
+Die begrenzten Queues halten den Speicherbedarf konstant - ist eine Stufe
+langsamer, warten die vorderen, statt Artikel anzuhäufen.
+
+Die Quelle wird im aufrufenden Thread durchlaufen. Das erlaubt Quellen, die
+an einen Thread gebunden sind (Playwright).
+"""
+import queue
+import threading
+
+# Markiert das Ende des Datenstroms in einer Queue
+_DONE = object()
+
+
+class Stage:
+    """Eine Pipeline-Stufe: Funktion, Anzahl Threads und Eingangs-Queue."""
+
+    def __init__(self, name, func, workers, queue_size):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.dropped = 0
+        self._running = self.workers
+        self._lock = threading.Lock()
+
+
+class Pipeline:
+    """
+    Verkettete Verarbeitungsstufen mit begrenzten Queues.
+
+    Jede Stufenfunktion erhält ein Element und gibt das Element für die
+    nächste Stufe zurück. None (oder eine Exception) verwirft das Element;
+    der Fehler wird ausgegeben und die übrigen Elemente laufen weiter. Das
+    Ergebnis der letzten Stufe wird verworfen - sie ist typischerweise die
+    Senke (Speichern).
+    """
+
+    def __init__(self, queue_size: int = 8):
+        """
+        Args:
+            queue_size: Maximale Anzahl wartender Elemente pro Stufe
+        """
+        self.queue_size = max(1, queue_size)
+        self.stages = []
+
+    def add_stage(self, name, func, workers: int = 1):
+        """Hängt eine Stufe an (Verarbeitung in workers Threads)."""
+        self.stages.append(Stage(name, func, workers, self.queue_size))
+        return self
+
+    def run(self, source):
+        """
+        Schickt alle Elemente aus source durch die Stufen und wartet, bis
+        die letzte Stufe fertig ist.
+
+        Returns:
+            Dict {Stufenname: {'processed': n, 'dropped': n}}
+        """
+        if not self.stages:
+            raise ValueError("Pipeline ohne Stufen")
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            following = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(stage, following),
+                    name=f"{stage.name}-{n + 1}", daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        first = self.stages[0]
+        try:
+            for item in source:
+                first.inbox.put(item)
+        finally:
+            # Auch bei Abbruch der Quelle: Bereits angenommene Elemente
+            # laufen noch vollständig durch
+            for _ in range(first.workers):
+                first.inbox.put(_DONE)
+            for thread in threads:
+                thread.join()
+
+        return {stage.name: {'processed': stage.processed, 'dropped': stage.dropped}
+                for stage in self.stages}
+
+    def _work(self, stage, following):
+        """Thread-Schleife einer Stufe."""
+        while True:
+            item = stage.inbox.get()
+            if item is _DONE:
+                break
+
+            try:
+                result = stage.func(item)
+            except BaseException as e:
+                # Auch SystemExit & Co.: Ein beendeter Thread würde die
+                # vorderen Stufen an der vollen Queue blockieren
+                print(f"✗ Fehler in Stufe '{stage.name}': {e}")
+                result = None
+
+            with stage._lock:
+                if result is None:
+                    stage.dropped += 1
+                else:
+                    stage.processed += 1
+
+            if result is not None and following is not None:
+                following.inbox.put(result)
+
+        # Der letzte Thread einer Stufe beendet die nächste Stufe
+        with stage._lock:
+            stage._running -= 1
+            last = stage._running == 0
+        if last and following is not None:
+            for _ in range(following.workers):
+                following.inbox.put(_DONE)
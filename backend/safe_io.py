@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Sichere Dateischreibvorgänge - atomar, crashfest und mit Run-Journal.
+
+atomic_file() / atomic_write(): Geschrieben wird in eine temporäre Datei im
+selben Verzeichnis, danach fsync, Rename über die Zieldatei und fsync des
+Verzeichnisses. Nach einem Absturz liegt die Datei entweder alt oder neu
+vollständig vor, nie halb geschrieben. Alle Markdown-Dateien, Manifeste,
+ZIPs, Bundles, Packs und users.json werden so geschrieben; Tracking,
+Suchindex und Caches sind SQLite-Datenbanken mit eigenem Journal.
+
+RunJournal (articles/run_journal.json): Ein Scraper-Run notiert vor dem
+Schreiben, welche Tage er verändert. Erst wenn Manifest, ZIP und Bundle
+dieser Tage geschrieben sind, gilt der Run als abgeschlossen. Bricht er
+vorher ab, gleicht der nächste Run die Tage mit den gespeicherten Dateien ab
+und schreibt sie neu, bevor er neue Artikel lädt - bereits gespeicherte
+Artikel werden weder neu geladen noch neu an die AI geschickt.
+
+Zusätzlich merkt sich das Journal die Anzahl getrackter Artikel. Ist die
+Tracking-Datenbank plötzlich leer (gelöscht, falsch synchronisiert), bricht
+der Scraper ab, statt die ganze Historie neu zu scrapen.
+"""
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Rechte neuer Dateien (mkstemp legt 0600 an, die Server müssen lesen können)
+DEFAULT_MODE = 0o644
+
+
+def fsync_dir(path):
+    """Schreibt den Verzeichniseintrag (Rename) auf die Platte."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # z.B. Windows: Verzeichnisse lassen sich nicht öffnen
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_file(path, mode='wb', encoding=None, new_mode=DEFAULT_MODE):
+    """
+    Öffnet eine temporäre Datei, die beim Verlassen path ersetzt.
+
+    Bei einer Exception wird die temporäre Datei gelöscht und path bleibt
+    unverändert. Die Rechte einer bestehenden Datei bleiben erhalten.
+
+    Args:
+        mode: 'wb', 'w' oder 'w+b' (z.B. um vor dem Ersetzen zu prüfen)
+        new_mode: Rechte, falls path noch nicht existiert
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            file_mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            file_mode = new_mode
+        os.chmod(tmp_path, file_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    fsync_dir(path.parent)
+
+
+def atomic_write(path, data, new_mode=DEFAULT_MODE):
+    """Schreibt Bytes atomar nach path (siehe atomic_file)."""
+    with atomic_file(path, new_mode=new_mode) as f:
+        f.write(data)
+
+
+def atomic_write_json(path, data, new_mode=DEFAULT_MODE, **kwargs):
+    """Schreibt JSON atomar nach path (kwargs wie json.dump)."""
+    with atomic_file(path, 'w', encoding='utf-8', new_mode=new_mode) as f:
+        json.dump(data, f, **kwargs)
+
+
+class JournalError(Exception):
+    """Zustand auf der Platte passt nicht zum Journal (z.B. Tracking verloren)."""
+
+
+class RunJournal:
+    """Journal der Scraper-Runs (siehe Modul-Docstring)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            # Wird atomar geschrieben - kaputt nur bei Fremdeinwirkung
+            print(f"⚠ Run-Journal unlesbar, alle Tage werden geprüft: {self.path}")
+            return {'state': 'running', 'dates': None}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_json(self.path, self._data, indent=2)
+
+    @property
+    def tracked_articles(self):
+        """Anzahl getrackter Artikel am Ende des letzten abgeschlossenen Runs."""
+        return self._data.get('tracked_articles', 0)
+
+    @property
+    def interrupted(self):
+        """True, wenn der letzte Run nicht abgeschlossen wurde."""
+        return self._data.get('state') == 'running'
+
+    @property
+    def started_at(self):
+        return self._data.get('started_at')
+
+    def pending_dates(self, all_dates=()):
+        """
+        Tage, die der abgebrochene Run verändert hat.
+
+        Args:
+            all_dates: Alle Tage - falls das Journal selbst unlesbar war
+        """
+        if not self.interrupted:
+            return []
+        dates = self._data.get('dates')
+        return sorted(all_dates if dates is None else dates)
+
+    def begin(self, action, dates):
+        """Notiert vor dem Schreiben, welche Tage ein Run verändert."""
+        self._data.update({
+            'state': 'running',
+            'action': action,
+            'started_at': datetime.now().isoformat(),
+            'pid': os.getpid(),
+            'dates': sorted(set(dates) | set(self.pending_dates()))
+        })
+        self._save()
+
+    def finish(self, tracked_articles):
+        """Markiert den Run als abgeschlossen (alle Tage konsistent geschrieben)."""
+        self._data.update({
+            'state': 'done',
+            'finished_at': datetime.now().isoformat(),
+            'dates': [],
+            'tracked_articles': tracked_articles
+        })
+        self._save()
@@ -6,16 +6,29 @@ import os
 import sys
 import re
 import json
-import zipfile
+import sqlite3
+import time
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from dateutil import parser as date_parser
-from openrouter_client import OpenRouterClient
+from openrouter_client import OpenRouterClient, AsyncOpenRouterClient
+from tracking_store import TrackingStore
+from article_index import ArticleIndex
+from zip_archive import update_zip
+from day_bundle import parse_article_markdown, write_day_bundle
+from day_catalog import DayCatalog, catalog_entry
+from http_cache import HTTPCache, CachingAdapter
+from pipeline import Pipeline
+from fingerprint import MAX_DISTANCE, fingerprint, hamming_distance
+from safe_io import JournalError, RunJournal, atomic_write
 
 load_dotenv()
 
@@ -27,26 +40,106 @@ class NZZScraper:
         'lokal': ['zürich', 'schweiz', 'zuerich', 'bern', 'basel', 'genf'],
         'welt': ['international', 'ausland', 'europa', 'usa', 'asien']
     }
+
+    # Elemente, die vor der Markdown-Konvertierung entfernt werden
+    STRIP_TAGS = {'img', 'figure', 'script', 'style', 'noscript'}
+    AD_CLASS = re.compile('ad-|advertisement', re.I)
+    # Browser-Seiten enthalten zusätzlich Paywall- und Abo-Elemente im Artikel
+    BROWSER_NOISE_CLASS = re.compile('ad-|advertisement|paywall|subscribe', re.I)
+    PAYWALL_ID = re.compile('piano.*paywall', re.I)
+    PAYWALL_CLASS = re.compile('paywall|subscribe-wall', re.I)
+    # Content-Selektoren für Browser-Seiten in Prioritätsreihenfolge
+    # (CSS-Selektor zur Dokumentation, Prüfung für _find_content_candidates)
+    BROWSER_CONTENT_SELECTORS = (
+        ('article', lambda e, cls: e.name == 'article'),
+        ('[class*="articleContent"]', lambda e, cls: 'articleContent' in cls),
+        ('[class*="article-content"]', lambda e, cls: 'article-content' in cls),
+        ('[class*="ArticleContent"]', lambda e, cls: 'ArticleContent' in cls),
+        ('main [class*="content"]',
+         lambda e, cls: 'content' in cls and e.find_parent('main') is not None),
+        ('main', lambda e, cls: e.name == 'main'),
+        ('[role="main"]', lambda e, cls: e.get('role') == 'main'),
+        ('div[class*="article"]', lambda e, cls: e.name == 'div' and 'article' in cls),
+    )
     
-    def __init__(self):
+    def __init__(self, workers=None):
         self.email = os.getenv('NZZ_EMAIL')
         self.password = os.getenv('NZZ_PASSWORD')
         self.output_dir = Path(os.getenv('OUTPUT_DIR', './articles'))
         self.base_url = os.getenv('BASE_URL', 'https://www.nzz.ch/neueste-artikel')
-        self.tracking_file = self.output_dir / 'scraped_articles.json'
+        self.tracking_file = self.output_dir / 'tracking.db'
+        self.legacy_tracking_file = self.output_dir / 'scraped_articles.json'
+        self.tracking = None
+        self.journal = RunJournal(self.output_dir / 'run_journal.json')
+        self.article_index = None
+        self.day_catalogs = {}
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+
+        # Parallelität: Anzahl Worker und max. gleichzeitige Requests pro Host
+        self.workers = int(os.getenv('SCRAPER_WORKERS', 1) if workers is None else workers)
+        if self.workers < 1:
+            raise ValueError(f"Anzahl Worker muss mindestens 1 sein (ist {self.workers})")
+        self.max_per_host = max(1, int(os.getenv('SCRAPER_MAX_PER_HOST', 4)))
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+
+        # Connection-Pool gross genug für alle Worker, optional mit HTTP-Cache
+        # (Conditional Requests; HTTP_CACHE=0 deaktiviert ihn)
+        self.http_cache = None
+        # Alle Seiten nachfragen statt innerhalb der TTL aus dem Cache (--rescrape)
+        self.revalidate_cache = False
+        pool_size = max(10, self.workers)
+        if os.getenv('HTTP_CACHE', '1').lower() not in ('0', 'false', 'no'):
+            self.http_cache = HTTPCache(
+                os.getenv('HTTP_CACHE_PATH') or self.output_dir / 'http_cache.db',
+                max_bytes=int(float(os.getenv('HTTP_CACHE_MAX_MB', 500)) * 1024 * 1024),
+                max_age_days=float(os.getenv('HTTP_CACHE_MAX_AGE_DAYS', 30))
+            )
+            adapter = CachingAdapter(self.http_cache, ttl=float(os.getenv('HTTP_CACHE_TTL', 300)),
+                                     pool_connections=10, pool_maxsize=pool_size)
+        else:
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.use_browser = False
         self.browser = None
         self.browser_context = None
         self.browser_page = None
+        self.browser_pages = []
         self.playwright = None
+        # Anzahl Browser-Tabs für den authentifizierten Pfad (Standard: Anzahl Worker)
+        self.browser_page_count = max(1, int(os.getenv('BROWSER_PAGES', self.workers)))
+        # Wartezeit für dynamische Inhalte pro Artikel (ab dem load-Event der Seite)
+        self.browser_settle_ms = int(os.getenv('BROWSER_SETTLE_MS', 2000))
+
+        # Duplikat-Erkennung über Text-Fingerprints (FINGERPRINT_DEDUP=0 deaktiviert):
+        # maximale Anzahl unterschiedlicher SimHash-Bits (höchstens MAX_DISTANCE) und Mindestlänge
+        self.dedup = os.getenv('FINGERPRINT_DEDUP', '1').lower() not in ('0', 'false', 'no')
+        self.dedup_max_distance = min(MAX_DISTANCE, int(os.getenv('FINGERPRINT_MAX_DISTANCE', MAX_DISTANCE)))
+        self.dedup_min_words = int(os.getenv('FINGERPRINT_MIN_WORDS', 80))
+
+        # HTML-Parser für die Artikel-Extraktion. lxml ist deutlich schneller, repariert
+        # fehlerhaftes Markup aber anders (Text geht verloren) - erst umstellen, wenn
+        # verify_extraction.py mit HTML_PARSER=lxml keine Abweichungen mehr meldet
+        self.html_parser = os.getenv('HTML_PARSER', 'html.parser')
+
+        # Manifest beim Scrapen nur alle N gespeicherten Artikel schreiben (CATALOG_SAVE_EVERY),
+        # sonst wird der ganze Tages-Katalog pro Artikel neu serialisiert und ge-fsynct
+        self.catalog_save_every = max(1, int(os.getenv('CATALOG_SAVE_EVERY', 20)))
 
         # OpenRouter für AI-basierte Bereinigung
+        # OPENROUTER_COMBINED=1: Bereinigung und Zusammenfassung in einem Request
+        self.ai_combined = os.getenv('OPENROUTER_COMBINED', '').lower() in ('1', 'true', 'yes')
+
+        # OPENROUTER_ASYNC=1: viele gleichzeitige Requests mit Token-Bucket-Limit
         try:
-            self.ai_client = OpenRouterClient()
+            if os.getenv('OPENROUTER_ASYNC', '').lower() in ('1', 'true', 'yes'):
+                self.ai_client = AsyncOpenRouterClient()
+            else:
+                self.ai_client = OpenRouterClient()
             print("✓ OpenRouter AI-Client initialisiert")
         except ValueError as e:
             print(f"⚠ OpenRouter nicht verfügbar: {e}")
@@ -154,52 +247,176 @@ class NZZScraper:
             except:
                 pass
 
+    def _host_slot(self, url):
+        """Gibt die Semaphore zurück, die gleichzeitige Requests pro Host begrenzt."""
+        host = urlparse(url).hostname or ''
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    def fetch(self, url, timeout=30, revalidate=False):
+        """GET-Request über die Session, begrenzt durch das Host-Limit.
+
+        Args:
+            revalidate: Antwort nicht ungeprüft aus dem HTTP-Cache nehmen
+                (immer Conditional Request, auch innerhalb von HTTP_CACHE_TTL)
+        """
+        headers = None
+        if revalidate or self.revalidate_cache:
+            headers = {'Cache-Control': 'no-cache'}
+        with self._host_slot(url):
+            resp = self.session.get(url, timeout=timeout, headers=headers)
+        resp.raise_for_status()
+        return resp
+
     def load_tracked_articles(self):
-        """Lädt die Liste bereits gescrapter Artikel-URLs."""
-        if not self.tracking_file.exists():
-            return {'articles': [], 'last_updated': None}
+        """Öffnet den Tracking-Store (importiert beim ersten Mal scraped_articles.json).
 
-        try:
-            with open(self.tracking_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            print(f"⚠ Tracking-Datei beschädigt, erstelle neue")
-            return {'articles': [], 'last_updated': None}
+        Eine beschädigte oder unerwartet leere Datenbank bricht den Run ab
+        (JournalError), statt die ganze Historie neu zu scrapen.
+        """
+        if self.tracking is None:
+            try:
+                tracking = TrackingStore(self.tracking_file, legacy_json=self.legacy_tracking_file)
+                errors = tracking.check()
+            except sqlite3.DatabaseError as e:
+                raise JournalError(f"Tracking-Datenbank beschädigt ({self.tracking_file}): {e}")
+            if errors:
+                tracking.close()
+                raise JournalError(f"Tracking-Datenbank beschädigt ({self.tracking_file}): "
+                                   f"{'; '.join(errors[:3])}")
+
+            expected = self.journal.tracked_articles
+            if len(tracking) == 0 and expected:
+                tracking.close()
+                raise JournalError(
+                    f"Tracking-Datenbank leer, der letzte Run hat {expected} Artikel hinterlassen "
+                    f"({self.tracking_file}). Backup zurückspielen oder - um bewusst neu zu "
+                    f"beginnen - {self.journal.path} löschen."
+                )
+            self.tracking = tracking
+        return self.tracking
+
+    def recover(self, tracking_data):
+        """Stellt nach einem abgebrochenen Run einen konsistenten Zustand her.
+
+        Für jeden Tag aus dem Run-Journal wird der Katalog mit den
+        gespeicherten Markdown-Dateien abgeglichen, gespeicherte, aber nicht
+        getrackte Artikel werden ins Tracking übernommen und getrackte ohne
+        Datei (abgebrochenes --rescrape) entfernt, danach werden Manifest,
+        ZIP und Bundle neu geschrieben. Nichts wird neu geladen.
+
+        Returns:
+            Liste der wiederhergestellten Tage
+        """
+        if not self.journal.interrupted:
+            return []
 
-    def save_tracked_articles(self, tracking_data):
-        """Speichert die aktualisierte Tracking-Liste."""
-        tracking_data['last_updated'] = datetime.now().isoformat()
+        all_dates = [p.name for p in self.output_dir.iterdir()
+                     if p.is_dir() and re.fullmatch(r'\d{4}-\d{2}-\d{2}', p.name)]
+        dates = self.journal.pending_dates(all_dates)
+        print(f"⚠ Letzter Run wurde abgebrochen ({self.journal.started_at}), "
+              f"stelle {len(dates)} Tag(e) wieder her...")
+
+        missing = [article for article in tracking_data.articles()
+                   if article['scraped_date'] in dates
+                   and not (self.output_dir / (article['filename'] or '')).is_file()]
+        if missing:
+            tracking_data.remove([article['url'] for article in missing])
+            self.load_article_index().remove([article['filename'] for article in missing])
+            print(f"  ↷ {len(missing)} Artikel ohne Datei aus dem Tracking entfernt")
+
+        for date_str in dates:
+            date_folder = self.output_dir / date_str
+            if not date_folder.is_dir():
+                continue
+            catalog = self.load_day_catalog(date_folder)
+            stats = catalog.reconcile()
+
+            tracked = 0
+            for entry in catalog.articles:
+                if entry['url'] and entry['url'] not in tracking_data:
+                    path = self.output_dir / entry['member']
+                    tracking_data.add(
+                        url=entry['url'],
+                        scraped_date=date_str,
+                        scraped_at=datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+                        filename=entry['member'],
+                        title=entry['title']
+                    )
+                    data = path.read_bytes()
+                    article = parse_article_markdown(data.decode('utf-8'), entry['member'])
+                    self.index_article({**article, 'size': len(data)}, entry['member'])
+                    tracked += 1
+
+            print(f"  ↷ {date_str}: {stats['added']} Dateien aufgenommen, "
+                  f"{stats['removed']} entfernt, {tracked} ins Tracking übernommen")
+            self.update_manifest(date_folder)
+            self.create_zip(date_folder)
+            self.create_bundle(date_folder)
 
-        with open(self.tracking_file, 'w', encoding='utf-8') as f:
-            json.dump(tracking_data, f, indent=2, ensure_ascii=False)
+        self.save_tracked_articles(tracking_data)
+        self.journal.finish(len(tracking_data))
+        return dates
+
+    def load_article_index(self):
+        """Öffnet den Volltext-Index (search.db, siehe article_index.py)."""
+        if self.article_index is None:
+            self.article_index = ArticleIndex(self.output_dir / 'search.db')
+        return self.article_index
+
+    def load_day_catalog(self, date_folder):
+        """Gibt den Katalog (manifest.json) eines Tages-Ordners zurück."""
+        date_folder = Path(date_folder)
+        if date_folder not in self.day_catalogs:
+            self.day_catalogs[date_folder] = DayCatalog(date_folder)
+        return self.day_catalogs[date_folder]
+
+    def index_article(self, article, path):
+        """Nimmt einen gespeicherten Artikel in den Volltext-Index auf.
+
+        Fehler brechen das Speichern nicht ab - der Index lässt sich mit
+        article_index.py --rebuild jederzeit neu aufbauen.
+        """
+        try:
+            self.load_article_index().add({**article, 'path': path})
+        except Exception as e:
+            print(f"  ⚠ Suchindex nicht aktualisiert ({path}): {e}")
 
-        print(f"✓ Tracking aktualisiert: {len(tracking_data['articles'])} Artikel total")
+    def save_tracked_articles(self, tracking_data):
+        """Schliesst eine Tracking-Aktualisierung ab (Artikel sind bereits gespeichert)."""
+        tracking_data.touch()
+        print(f"✓ Tracking aktualisiert: {len(tracking_data)} Artikel total")
 
     def is_article_scraped(self, url, tracking_data):
-        """Prüft ob Artikel bereits gescrapt wurde."""
-        scraped_urls = {article['url'] for article in tracking_data['articles']}
-        return url in scraped_urls
+        """Prüft ob Artikel bereits gescrapt (oder als Duplikat erkannt) wurde."""
+        return url in tracking_data or tracking_data.is_duplicate(url)
 
     def add_to_tracking(self, tracking_data, article_info, date_str):
         """Fügt einen gescrapten Artikel zur Tracking-Liste hinzu."""
-        tracking_data['articles'].append({
-            'url': article_info['url'],
-            'scraped_date': date_str,
-            'scraped_at': datetime.now().isoformat(),
-            'filename': f"{date_str}/{article_info['category']}/{article_info.get('filename', 'unknown.md')}",
-            'title': article_info['title']
-        })
+        tracking_data.add(
+            url=article_info['url'],
+            scraped_date=date_str,
+            scraped_at=datetime.now().isoformat(),
+            filename=f"{date_str}/{article_info['category']}/{article_info.get('filename', 'unknown.md')}",
+            title=article_info['title']
+        )
 
     def delete_recent_articles(self, hours=12):
         """Löscht Artikel der letzten N Stunden und entfernt sie aus dem Tracking."""
         print(f"\n→ Lösche Artikel der letzten {hours} Stunden...")
         cutoff = datetime.now() - timedelta(hours=hours)
+        # Neu zu scrapende Seiten beim Server nachfragen, nicht aus dem TTL-Cache
+        self.revalidate_cache = True
 
         tracking_data = self.load_tracked_articles()
+        self.recover(tracking_data)
         urls_to_remove = set()
+        paths_to_remove = []
         affected_dates = set()
 
-        for article in tracking_data['articles']:
+        for article in tracking_data.articles():
             # Prüfe scraped_at Timestamp (neu) oder Datei-Mtime (alt)
             remove = False
             scraped_at = article.get('scraped_at')
@@ -218,49 +435,83 @@ class NZZScraper:
 
             if remove:
                 urls_to_remove.add(article['url'])
+                paths_to_remove.append(article.get('filename', ''))
                 affected_dates.add(article.get('scraped_date', ''))
-                # Datei löschen
-                filepath = self.output_dir / article.get('filename', '')
-                if filepath.exists():
-                    filepath.unlink()
-                    print(f"  ✗ Gelöscht: {filepath.name}")
-
-        # Tracking bereinigen
-        before = len(tracking_data['articles'])
-        tracking_data['articles'] = [
-            a for a in tracking_data['articles'] if a['url'] not in urls_to_remove
-        ]
-        removed = before - len(tracking_data['articles'])
+
+        # Betroffene Tage vor dem Löschen im Journal notieren
+        affected_dates.discard('')
+        self.journal.begin('rescrape', affected_dates)
+        for path in paths_to_remove:
+            filepath = self.output_dir / path
+            if path and filepath.exists():
+                filepath.unlink()
+                print(f"  ✗ Gelöscht: {filepath.name}")
+
+        # Tracking und Suchindex bereinigen
+        removed = tracking_data.remove(urls_to_remove)
+        self.load_article_index().remove(paths_to_remove)
         self.save_tracked_articles(tracking_data)
 
-        # ZIP und Manifest für betroffene Tage neu erstellen
+        # Katalog, ZIP und Bundle für betroffene Tage aktualisieren
         for date_str in affected_dates:
-            if not date_str:
-                continue
             date_folder = self.output_dir / date_str
             if date_folder.exists():
-                self.create_zip(date_folder)
+                self.load_day_catalog(date_folder).remove(
+                    [path for path in paths_to_remove if path.startswith(f"{date_str}/")]
+                )
                 self.update_manifest(date_folder)
+                self.create_zip(date_folder)
+                self.create_bundle(date_folder)
 
+        self.journal.finish(len(tracking_data))
         print(f"✓ {removed} Artikel gelöscht und aus Tracking entfernt")
         return removed
 
-    def clean_article_html(self, soup):
-        """Grundlegende HTML-Bereinigung (Bilder, Scripts, Ads)."""
-
-        # Bilder entfernen
-        for img in soup.find_all('img'):
-            img.decompose()
-        for figure in soup.find_all('figure'):
-            figure.decompose()
-
-        # Scripts und Styles entfernen
-        for elem in soup.find_all(['script', 'style', 'noscript']):
-            elem.decompose()
-
-        # Offensichtliche Ads entfernen
-        for elem in soup.find_all(class_=re.compile('ad-|advertisement', re.I)):
-            elem.decompose()
+    @staticmethod
+    def _class_matches(elem, pattern):
+        """Prüft die CSS-Klassen eines Elements wie find_all(class_=pattern)."""
+        classes = elem.get('class')
+        if not classes:
+            return False
+        if isinstance(classes, str):
+            classes = [classes]
+        return any(pattern.search(c) for c in classes) or bool(pattern.search(' '.join(classes)))
+
+    def _find_content_candidates(self, soup):
+        """Erster Treffer je BROWSER_CONTENT_SELECTORS-Eintrag (oder None).
+
+        Entspricht soup.select_one() für jeden Selektor, prüft aber alle
+        Selektoren in einem einzigen Durchlauf durch das Dokument.
+        """
+        matches = [None] * len(self.BROWSER_CONTENT_SELECTORS)
+        open_slots = len(matches)
+        for elem in soup.find_all(True):
+            classes = elem.get('class') or ''
+            if not isinstance(classes, str):
+                classes = ' '.join(classes)
+            for i, (_, check) in enumerate(self.BROWSER_CONTENT_SELECTORS):
+                if matches[i] is None and check(elem, classes):
+                    matches[i] = elem
+                    open_slots -= 1
+            if not open_slots:
+                break
+        return matches
+
+    def clean_article_html(self, soup, noise_class=None):
+        """Grundlegende HTML-Bereinigung (Bilder, Scripts, Ads) in einem Durchlauf.
+
+        Args:
+            soup: Zu bereinigendes Element (wird verändert)
+            noise_class: Regex für CSS-Klassen, die entfernt werden (Standard: AD_CLASS)
+        """
+        noise_class = noise_class or self.AD_CLASS
+
+        for elem in soup.find_all(True):
+            # Kinder bereits entfernter Elemente überspringen
+            if elem.decomposed:
+                continue
+            if elem.name in self.STRIP_TAGS or self._class_matches(elem, noise_class):
+                elem.decompose()
 
         return soup
 
@@ -272,17 +523,23 @@ class NZZScraper:
 
         return content.strip()
 
-    def is_paywalled(self, soup):
-        """Detect if article content is behind paywall."""
-        # Piano paywall indicators
-        paywall_indicators = [
-            soup.find(id=re.compile('piano.*paywall', re.I)),
-            soup.find(class_=re.compile('paywall|subscribe-wall', re.I)),
-            'Abonnieren Sie' in soup.get_text(),
-            'Jetzt abonnieren' in soup.get_text()
-        ]
+    def is_paywalled(self, soup, text=None):
+        """Detect if article content is behind paywall.
+
+        Args:
+            soup: Geparste Seite
+            text: Bereits berechnetes soup.get_text() (spart einen Durchlauf)
+        """
+        if text is None:
+            text = soup.get_text()
 
-        return any(paywall_indicators)
+        if 'Abonnieren Sie' in text or 'Jetzt abonnieren' in text:
+            return True
+
+        # Piano paywall indicators (ein Durchlauf, endet beim ersten Treffer)
+        indicator = soup.find(lambda tag: bool(self.PAYWALL_ID.search(tag.get('id') or ''))
+                              or self._class_matches(tag, self.PAYWALL_CLASS))
+        return indicator is not None
 
     def validate_content_length(self, content, url):
         """Check if content seems complete."""
@@ -293,8 +550,14 @@ class NZZScraper:
             return False
         return True
 
-    def extract_category(self, article_soup, url):
-        """Extrahiert die Kategorie aus dem Artikel."""
+    def extract_category(self, article_soup, url, text=None):
+        """Extrahiert die Kategorie aus dem Artikel.
+
+        Args:
+            article_soup: Geparste Seite
+            url: Artikel-URL
+            text: Bereits berechnetes article_soup.get_text() (spart einen Durchlauf)
+        """
         # Versuche aus Breadcrumbs oder Meta-Tags zu lesen
         category = 'allgemein'
         
@@ -308,7 +571,9 @@ class NZZScraper:
                     return cat_name
         
         # Aus Artikel-Text extrahieren
-        text_content = article_soup.get_text().lower()
+        if text is None:
+            text = article_soup.get_text()
+        text_content = text.lower()
         for cat_name, keywords in self.CATEGORIES.items():
             if any(kw in text_content[:500] for kw in keywords):
                 return cat_name
@@ -353,115 +618,243 @@ class NZZScraper:
         
         return '\n'.join(md_lines)
     
+    def process_with_ai(self, content, title):
+        """Bereinigt den Content mit AI und erstellt eine Zusammenfassung.
+
+        Im kombinierten Modus (OPENROUTER_COMBINED=1) erledigt ein einziger
+        Request beides; lässt sich die Antwort nicht parsen, folgen die zwei
+        einzelnen Requests.
+
+        Returns:
+            Tuple (content, summary) - Original-Content und leere
+            Zusammenfassung, wenn kein AI-Client verfügbar ist
+        """
+        summary = ''
+        if not self.ai_client:
+            return content, summary
+
+        if self.ai_combined:
+            print(f"    🤖 Bereinige und fasse zusammen mit AI (1 Request)...")
+            result = self.ai_client.clean_and_summarize(content, title)
+            if result:
+                print(f"    ✓ AI-Bereinigung und Zusammenfassung erfolgreich "
+                      f"({len(result['content'])}/{len(result['summary'])} Zeichen)")
+                return result['content'], result['summary']
+            print(f"    ⚠ Kombinierter Request fehlgeschlagen, verwende Einzel-Requests")
+
+        print(f"    🤖 Bereinige Inhalt mit AI...")
+        cleaned_content = self.ai_client.clean_article_content(content, title)
+
+        if cleaned_content:
+            content = cleaned_content
+            print(f"    ✓ AI-Bereinigung erfolgreich ({len(content)} Zeichen)")
+        else:
+            print(f"    ⚠ AI-Bereinigung fehlgeschlagen, verwende Original")
+
+        print(f"    🤖 Erstelle Zusammenfassung...")
+        generated_summary = self.ai_client.generate_summary(content, title)
+        if generated_summary:
+            summary = generated_summary
+            print(f"    ✓ Zusammenfassung erstellt ({len(summary)} Zeichen)")
+        else:
+            print(f"    ⚠ Zusammenfassung fehlgeschlagen")
+
+        return content, summary
+
+    def open_browser_pages(self, count):
+        """Öffnet zusätzliche Tabs im eingeloggten Browser-Context (Page-Pool)."""
+        self.browser_pages = [self.browser_page]
+        for _ in range(count - 1):
+            self.browser_pages.append(self.browser_context.new_page())
+        print(f"✓ {len(self.browser_pages)} Browser-Tabs bereit")
+
+    def wait_for_article(self, page, load_times=None):
+        """Wartet bis der Artikel geladen ist und gibt das HTML der Seite zurück.
+
+        Wie beim Laden in einem einzelnen Tab: load-Event, Artikel-Element
+        und danach BROWSER_SETTLE_MS für dynamische Inhalte. Die Wartezeit
+        zählt ab dem load-Event des Tabs (load_times, siehe
+        iter_browser_html), so dass sie sich bei mehreren Tabs überlappt
+        statt sich aufzusummieren.
+
+        Args:
+            load_times: Dict Tab -> Zeitpunkt (time.monotonic) des load-Events;
+                ohne Eintrag zählt die Wartezeit ab jetzt
+        """
+        page.wait_for_load_state('load', timeout=30000)
+        loaded_at = (load_times or {}).get(page, time.monotonic())
+
+        # Wait for article content to load
+        try:
+            page.wait_for_selector('article, main', timeout=5000)
+        except:
+            pass  # Continue anyway
+
+        # Brief wait for dynamic content
+        remaining = self.browser_settle_ms - (time.monotonic() - loaded_at) * 1000
+        if remaining > 0:
+            page.wait_for_timeout(remaining)
+
+        return page.content()
+
+    def iter_browser_html(self, links):
+        """Lädt Artikel über den Page-Pool und liefert (link, html).
+
+        Playwright wird ausschliesslich vom aufrufenden Thread bedient. Auf
+        jedem freien Tab wird zuerst die Navigation gestartet und erst danach
+        auf den ältesten Tab gewartet; der Browser lädt die übrigen Seiten
+        währenddessen im Hintergrund. Den Zeitpunkt des load-Events jedes
+        Tabs hält ein Listener fest (wird während jedes Playwright-Aufrufs
+        zugestellt, also höchstens später als das Event selbst).
+        """
+        pending = deque(links)
+        free_pages = deque(self.browser_pages)
+        in_flight = deque()
+        load_times = {}
+
+        def on_load(page):
+            load_times[page] = time.monotonic()
+
+        for page in self.browser_pages:
+            page.on('load', on_load)
+        try:
+            while pending or in_flight:
+                while free_pages and pending:
+                    page = free_pages.popleft()
+                    link = pending.popleft()
+                    load_times.pop(page, None)
+                    try:
+                        page.goto(link, wait_until='commit', timeout=30000)
+                        in_flight.append((page, link))
+                    except Exception as e:
+                        print(f"✗ Fehler beim Laden von {link}: {e}")
+                        free_pages.append(page)
+                        yield link, None
+
+                if not in_flight:
+                    continue
+
+                page, link = in_flight.popleft()
+                try:
+                    html = self.wait_for_article(page, load_times)
+                except Exception as e:
+                    print(f"✗ Fehler beim Laden von {link}: {e}")
+                    html = None
+                free_pages.append(page)
+                yield link, html
+        finally:
+            for page in self.browser_pages:
+                page.remove_listener('load', on_load)
+
     def scrape_article_with_browser(self, url):
         """Scrapt einen einzelnen Artikel mit Browser-Session."""
         try:
             # Use existing browser page
             page = self.browser_page
             page.goto(url, timeout=30000)
+            html = self.wait_for_article(page)
+        except Exception as e:
+            print(f"✗ Fehler beim Scrapen von {url}: {e}")
+            return None
 
-            # Wait for article content to load
-            try:
-                page.wait_for_selector('article, main', timeout=5000)
-            except:
-                pass  # Continue anyway
+        return self.parse_browser_article(html, url)
 
-            # Brief wait for dynamic content
-            page.wait_for_timeout(2000)
+    def extract_article(self, html, url, browser=False):
+        """Extrahiert Titel, Datum, Kategorie und Markdown-Content aus dem HTML.
 
-            # Get page HTML
-            html = page.content()
-            soup = BeautifulSoup(html, 'html.parser')
+        Die Seite wird einmal mit HTML_PARSER geparst, die Bereinigung läuft
+        in einem Durchlauf und der Seitentext für Kategorie- und
+        Paywall-Erkennung wird nur einmal berechnet.
 
-            # Titel extrahieren
-            title_tag = soup.find('h1') or soup.find('title')
-            title = title_tag.get_text(strip=True) if title_tag else "Unbekannter Titel"
+        Args:
+            html: HTML der Artikelseite
+            url: Artikel-URL
+            browser: Seite stammt aus der Browser-Session (andere Selektoren,
+                zusätzliche Bereinigung von Paywall-Elementen)
 
-            # Datum extrahieren
-            date = datetime.now()
-            time_tag = soup.find('time')
-            if time_tag and time_tag.get('datetime'):
-                try:
-                    date = date_parser.parse(time_tag['datetime'])
-                except:
-                    pass
+        Returns:
+            Dict mit title, url, date, category, content und paywalled
+            (noch ohne AI-Bereinigung)
+        """
+        soup = BeautifulSoup(html, self.html_parser)
 
-            # Artikel-Content finden - NZZ-specific selectors first
-            article = None
+        # Titel extrahieren
+        title_tag = soup.find('h1') or soup.find('title')
+        title = title_tag.get_text(strip=True) if title_tag else "Unbekannter Titel"
 
-            # Try NZZ-specific content selectors
-            content_selectors = [
-                'article',
-                '[class*="articleContent"]',
-                '[class*="article-content"]',
-                '[class*="ArticleContent"]',
-                'main [class*="content"]',
-                'main',
-                '[role="main"]',
-                'div[class*="article"]'
-            ]
-
-            for selector in content_selectors:
-                article = soup.select_one(selector)
+        # Datum extrahieren
+        date = datetime.now()
+        time_tag = soup.find('time')
+        if time_tag and time_tag.get('datetime'):
+            try:
+                date = date_parser.parse(time_tag['datetime'])
+            except:
+                pass
+
+        # Artikel-Content finden
+        if browser:
+            # NZZ-specific content selectors first
+            article = None
+            for article in self._find_content_candidates(soup):
                 if article and len(article.get_text(strip=True)) > 200:
                     break
+        else:
+            article = soup.find('article') or soup.find('main') or soup.find('div', class_=re.compile('article|content'))
 
-            if not article:
-                article = soup.find('body')
+        if not article:
+            article = soup.find('body')
 
-            # IMPORTANT: Clean unwanted content BEFORE removing images
-            article = self.clean_article_html(article)
+        # IMPORTANT: Clean unwanted content BEFORE removing images
+        article = self.clean_article_html(
+            article, self.BROWSER_NOISE_CLASS if browser else self.AD_CLASS
+        )
 
-            # Remove ads and other noise
-            for elem in article.find_all(class_=re.compile('ad-|advertisement|paywall|subscribe', re.I)):
-                elem.decompose()
+        # Content zu Markdown
+        content = self.html_to_markdown(article)
+        content = self.clean_text(content)
 
-            # Content zu Markdown
-            content = self.html_to_markdown(article)
-            content = self.clean_text(content)
+        # Basis-Bereinigung
+        content = self.clean_markdown_content(content)
 
-            # Basis-Bereinigung
-            content = self.clean_markdown_content(content)
+        # Seitentext einmal berechnen für Kategorie und Paywall-Erkennung
+        page_text = soup.get_text()
 
-            # AI-BASED CLEANING (NEW)
-            summary = ''
-            if self.ai_client:
-                print(f"    🤖 Bereinige Inhalt mit AI...")
-                cleaned_content = self.ai_client.clean_article_content(content, title)
-
-                if cleaned_content:
-                    content = cleaned_content
-                    print(f"    ✓ AI-Bereinigung erfolgreich ({len(content)} Zeichen)")
-                else:
-                    print(f"    ⚠ AI-Bereinigung fehlgeschlagen, verwende Original")
-
-                print(f"    🤖 Erstelle Zusammenfassung...")
-                generated_summary = self.ai_client.generate_summary(content, title)
-                if generated_summary:
-                    summary = generated_summary
-                    print(f"    ✓ Zusammenfassung erstellt ({len(summary)} Zeichen)")
-                else:
-                    print(f"    ⚠ Zusammenfassung fehlgeschlagen")
-
-            # Kategorie bestimmen
-            category = self.extract_category(soup, url)
-
-            # Add paywall detection
-            if self.is_paywalled(soup):
-                print(f"    ⚠ Paywall erkannt auf {url}")
-
-            # Validate content length
-            self.validate_content_length(content, url)
-
-            return {
-                'title': title,
-                'url': url,
-                'date': date.isoformat(),
-                'category': category,
-                'content': content,
-                'summary': summary
-            }
+        return {
+            'title': title,
+            'url': url,
+            'date': date.isoformat(),
+            'category': self.extract_category(soup, url, page_text),
+            'content': content,
+            'paywalled': self.is_paywalled(soup, page_text)
+        }
+
+    def complete_article(self, extracted):
+        """AI-Bereinigung, Zusammenfassung und Prüfungen für einen extrahierten Artikel."""
+        url = extracted['url']
+
+        # AI-BASED CLEANING (NEW)
+        content, summary = self.process_with_ai(extracted['content'], extracted['title'])
+
+        # Add paywall detection
+        if extracted['paywalled']:
+            print(f"    ⚠ Paywall erkannt auf {url}")
 
+        # Validate content length
+        self.validate_content_length(content, url)
+
+        return {
+            'title': extracted['title'],
+            'url': url,
+            'date': extracted['date'],
+            'category': extracted['category'],
+            'content': content,
+            'summary': summary
+        }
+
+    def parse_browser_article(self, html, url):
+        """Extrahiert einen Artikel aus dem HTML einer Browser-Seite."""
+        try:
+            return self.complete_article(self.extract_article(html, url, browser=True))
         except Exception as e:
             print(f"✗ Fehler beim Scrapen von {url}: {e}")
             return None
@@ -473,81 +866,141 @@ class NZZScraper:
             return self.scrape_article_with_browser(url)
 
         try:
-            resp = self.session.get(url, timeout=30)
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            
-            # Titel extrahieren
-            title_tag = soup.find('h1') or soup.find('title')
-            title = title_tag.get_text(strip=True) if title_tag else "Unbekannter Titel"
-            
-            # Datum extrahieren
-            date = datetime.now()
-            time_tag = soup.find('time')
-            if time_tag and time_tag.get('datetime'):
-                try:
-                    date = date_parser.parse(time_tag['datetime'])
-                except:
-                    pass
-            
-            # Artikel-Content finden
-            article = soup.find('article') or soup.find('main') or soup.find('div', class_=re.compile('article|content'))
-            if not article:
-                article = soup.find('body')
+            resp = self.fetch(url)
+            return self.complete_article(self.extract_article(resp.text, url))
+        except Exception as e:
+            print(f"✗ Fehler beim Scrapen von {url}: {e}")
+            return None
+
+    def _fetch_html(self, link):
+        """Pipeline-Stufe: Lädt die Artikelseite per HTTP."""
+        try:
+            return link, self.fetch(link).text
+        except Exception as e:
+            print(f"✗ Fehler beim Laden von {link}: {e}")
+            return None
+
+    def _extract(self, item):
+        """Pipeline-Stufe: Extrahiert den Artikel aus dem HTML."""
+        link, html = item
+        try:
+            return self.extract_article(html, link, browser=self.use_browser)
+        except Exception as e:
+            print(f"✗ Fehler beim Extrahieren von {link}: {e}")
+            return None
+
+    def _make_dedup_stage(self, tracking_data):
+        """
+        Pipeline-Stufe vor der AI: Verwirft Artikel, deren Text schon gespeichert ist.
+
+        Verglichen wird mit allen gespeicherten Artikeln (Tracking-Store) und
+        mit den bisherigen Artikeln dieses Runs. Duplikate werden mit Verweis
+        auf das Original gespeichert und beim nächsten Run nicht mehr geladen.
+        """
+        run_fingerprints = []  # (URL, Fingerprint) der Artikel dieses Runs
+
+        def dedup(extracted):
+            url = extracted['url']
+            fp = fingerprint(extracted['content'], self.dedup_min_words)
+            if fp is None:
+                return extracted
+
+            original = tracking_data.find_duplicate(fp, self.dedup_max_distance, exclude_url=url)
+            if original is None:
+                # Wie find_duplicate: nächster Treffer gewinnt, exakter Treffer vor gleicher Distanz
+                for other_url, other in run_fingerprints:
+                    exact = other['content_hash'] == fp['content_hash']
+                    distance = 0 if exact else hamming_distance(other['simhash'], fp['simhash'])
+                    if distance <= self.dedup_max_distance and (original is None or (
+                            (distance, not exact) < (original['distance'], not original['exact']))):
+                        original = {'url': other_url, 'filename': None,
+                                    'distance': distance, 'exact': exact}
+
+            if original is not None:
+                tracking_data.add_fingerprint(url, fp, duplicate_of=original['url'])
+                kind = 'identisch' if original['exact'] else 'fast gleich'
+                print(f"  ↷ Duplikat übersprungen ({kind}): {url} → {original['filename'] or original['url']}")
+                return None
+
+            run_fingerprints.append((url, fp))
+            extracted['fingerprint'] = fp
+            return extracted
+
+        return dedup
+
+    def _complete(self, extracted):
+        """Pipeline-Stufe: AI-Bereinigung und Zusammenfassung."""
+        try:
+            article = self.complete_article(extracted)
+            if extracted.get('fingerprint'):
+                article['fingerprint'] = extracted['fingerprint']
+            return article
+        except Exception as e:
+            print(f"✗ Fehler bei der AI-Verarbeitung von {extracted['url']}: {e}")
+            return None
+
+    def scrape_and_save(self, links, date_folder, tracking_data, date_str):
+        """Scrapt Artikel als Streaming-Pipeline und speichert jeden sofort.
 
-            # IMPORTANT: Clean unwanted content BEFORE removing images
-            article = self.clean_article_html(article)
+        Stufen: Laden → Extrahieren → Duplikate → AI → Speichern + Tracking, verbunden
+        über begrenzte Queues (PIPELINE_QUEUE_SIZE, Standard: 2 × Worker).
+        Jeder fertige Artikel wird direkt geschrieben und ins Tracking
+        übernommen - bei einem Abbruch bleiben alle bis dahin fertigen
+        Artikel erhalten. Mit Browser-Session lädt der Page-Pool die Seiten
+        im aufrufenden Thread (Playwright ist nicht thread-safe).
 
-            # Content zu Markdown
-            content = self.html_to_markdown(article)
-            content = self.clean_text(content)
+        Returns:
+            Anzahl gespeicherter Artikel
+        """
+        total = len(links)
+        saved = 0
 
-            # Basis-Bereinigung
-            content = self.clean_markdown_content(content)
+        def store(article):
+            nonlocal saved
+            # Die .md-Datei ist sofort atomar geschrieben, das Manifest nur alle
+            # catalog_save_every Artikel; den Rest schreibt run() per update_manifest()
+            # vor create_zip(). Bricht der Lauf dazwischen ab, steht der Schritt im
+            # Run-Journal offen und recover() gleicht den Katalog per reconcile()
+            # mit den .md-Dateien ab - es geht also kein Artikel verloren.
+            self.save_articles([article], date_folder, save_catalog=False)
+            self.add_to_tracking(tracking_data, article, date_str)
+            if article.get('fingerprint'):
+                tracking_data.add_fingerprint(article['url'], article['fingerprint'])
+            saved += 1
+            if saved % self.catalog_save_every == 0:
+                self.load_day_catalog(date_folder).save()
+            print(f"  [{saved}/{total}] ✓ {article['category']}/{article['filename']}")
+            return article
+
+        queue_size = int(os.getenv('PIPELINE_QUEUE_SIZE', 2 * self.workers))
+        pipeline = Pipeline(queue_size)
+
+        if self.use_browser:
+            if not self.browser_pages:
+                self.browser_pages = [self.browser_page]
+            print(f"→ Verwende {len(self.browser_pages)} Browser-Tabs und {self.workers} Worker")
+            source = ((link, html) for link, html in self.iter_browser_html(links) if html)
+        else:
+            print(f"→ Verwende {self.workers} Worker (max. {self.max_per_host} pro Host)")
+            pipeline.add_stage('laden', self._fetch_html, self.workers)
+            source = iter(links)
+
+        pipeline.add_stage('extrahieren', self._extract)
+        if self.dedup:
+            # Ein Thread, damit Duplikate innerhalb des Runs sicher erkannt werden
+            pipeline.add_stage('duplikate', self._make_dedup_stage(tracking_data))
+        pipeline.add_stage('ai', self._complete, self.workers)
+        # Nur ein Thread schreibt Dateien und Tracking
+        pipeline.add_stage('speichern', store)
 
-            # AI-BASED CLEANING (NEW)
-            summary = ''
+        try:
+            pipeline.run(source)
+        finally:
+            # Verbindungen und Event-Loop des AI-Clients freigeben (startet bei Bedarf neu)
             if self.ai_client:
-                print(f"    🤖 Bereinige Inhalt mit AI...")
-                cleaned_content = self.ai_client.clean_article_content(content, title)
-
-                if cleaned_content:
-                    content = cleaned_content
-                    print(f"    ✓ AI-Bereinigung erfolgreich ({len(content)} Zeichen)")
-                else:
-                    print(f"    ⚠ AI-Bereinigung fehlgeschlagen, verwende Original")
-
-                print(f"    🤖 Erstelle Zusammenfassung...")
-                generated_summary = self.ai_client.generate_summary(content, title)
-                if generated_summary:
-                    summary = generated_summary
-                    print(f"    ✓ Zusammenfassung erstellt ({len(summary)} Zeichen)")
-                else:
-                    print(f"    ⚠ Zusammenfassung fehlgeschlagen")
-
-            # Kategorie bestimmen
-            category = self.extract_category(soup, url)
-
-            # Add paywall detection
-            if self.is_paywalled(soup):
-                print(f"    ⚠ Paywall erkannt auf {url}")
-
-            # Validate content length
-            self.validate_content_length(content, url)
-
-            return {
-                'title': title,
-                'url': url,
-                'date': date.isoformat(),
-                'category': category,
-                'content': content,
-                'summary': summary
-            }
+                self.ai_client.close()
+        return saved
 
-        except Exception as e:
-            print(f"✗ Fehler beim Scrapen von {url}: {e}")
-            return None
-    
     def get_article_links_with_browser(self):
         """Holt Artikel-Links mit Browser und Scrolling für lazy-loaded content."""
         print(f"→ Lade Artikel-Liste von {self.base_url} (mit Scrolling)...")
@@ -612,8 +1065,8 @@ class NZZScraper:
         print(f"→ Lade Artikel-Liste von {self.base_url}...")
 
         try:
-            resp = self.session.get(self.base_url, timeout=30)
-            resp.raise_for_status()
+            # Die Artikel-Liste ändert sich ständig: nie ungeprüft aus dem Cache
+            resp = self.fetch(self.base_url, revalidate=True)
             soup = BeautifulSoup(resp.text, 'html.parser')
 
             links = set()
@@ -631,9 +1084,14 @@ class NZZScraper:
             print(f"✗ Fehler beim Laden der Artikel-Liste: {e}")
             return []
     
-    def save_articles(self, articles, date_folder):
-        """Speichert Artikel als Markdown-Dateien."""
+    def save_articles(self, articles, date_folder, save_catalog=True):
+        """Speichert Artikel als Markdown-Dateien und trägt sie in den Tages-Katalog ein.
+
+        Mit save_catalog=False wird das Manifest nicht geschrieben (der Aufrufer
+        speichert den Katalog selbst, z.B. gebündelt in scrape_and_save()).
+        """
         saved = 0
+        catalog = self.load_day_catalog(date_folder)
 
         for article in articles:
             if not article:
@@ -652,57 +1110,53 @@ class NZZScraper:
             article['filename'] = filename
 
             # Markdown-Datei schreiben
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# {article['title']}\n\n")
-                f.write(f"**[→ Original auf NZZ.ch öffnen]({article['url']})**\n\n")
-                f.write(f"**Datum:** {article['date']}\n\n")
-                f.write(f"**Kategorie:** {article['category']}\n\n")
-                if article.get('summary'):
-                    f.write(f"**Zusammenfassung:** {article['summary']}\n\n")
-                f.write(f"---\n\n")
-                f.write(article['content'])
-
+            markdown = f"# {article['title']}\n\n"
+            markdown += f"**[→ Original auf NZZ.ch öffnen]({article['url']})**\n\n"
+            markdown += f"**Datum:** {article['date']}\n\n"
+            markdown += f"**Kategorie:** {article['category']}\n\n"
+            if article.get('summary'):
+                markdown += f"**Zusammenfassung:** {article['summary']}\n\n"
+            markdown += f"---\n\n"
+            markdown += article['content']
+            data = markdown.encode('utf-8')
+            atomic_write(filepath, data)
+
+            member = f"{date_folder.name}/{article['category']}/{filename}"
+            catalog.add(catalog_entry(member, data, article))
+            self.index_article({**article, 'size': len(data)}, member)
             saved += 1
 
+        if saved and save_catalog:
+            catalog.save()
         return saved
     
     def create_zip(self, date_folder):
-        """Erstellt ein ZIP-Archiv des Tages."""
+        """Erstellt/aktualisiert das ZIP-Archiv des Tages.
+
+        Nur neue oder geänderte Dateien werden komprimiert, unveränderte
+        werden aus dem bestehenden Archiv übernommen (siehe zip_archive.py).
+        """
         zip_path = date_folder.with_suffix('.zip')
+        catalog = self.load_day_catalog(date_folder)
+        files = [date_folder.parent / member for member in catalog.members] + [catalog.path]
 
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for file_path in date_folder.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(date_folder.parent)
-                    zf.write(file_path, arcname)
+        stats = update_zip(zip_path, date_folder, date_folder.parent, files=files)
 
-        print(f"✓ ZIP erstellt: {zip_path}")
+        print(f"✓ ZIP erstellt: {zip_path} "
+              f"({stats['compressed']} komprimiert, {stats['reused']} übernommen)")
         return zip_path
 
-    def update_manifest(self, date_folder):
-        """Erstellt/aktualisiert Manifest für das Tages-Verzeichnis."""
-        # Zähle ALLE Artikel im Ordner (nicht nur neu gescrapte)
-        categories = {}
-        total = 0
-
-        for cat_folder in date_folder.iterdir():
-            if cat_folder.is_dir():
-                article_count = len(list(cat_folder.glob('*.md')))
-                if article_count > 0:
-                    categories[cat_folder.name] = article_count
-                    total += article_count
-
-        manifest = {
-            'date': date_folder.name,
-            'total_articles': total,
-            'categories': categories
-        }
-
-        manifest_path = date_folder / 'manifest.json'
-        with open(manifest_path, 'w', encoding='utf-8') as f:
-            json.dump(manifest, f, indent=2)
+    def create_bundle(self, date_folder):
+        """Schreibt das vorkomprimierte JSON-Bundle des Tages (siehe day_bundle.py)."""
+        stats = write_day_bundle(date_folder, self.load_day_catalog(date_folder).members)
+        sizes = ', '.join(f"{name} {size / 1024:.0f} KB" for name, size in stats['sizes'].items())
+        print(f"✓ JSON-Bundle erstellt: {stats['articles']} Artikel ({sizes})")
 
-        print(f"✓ Manifest aktualisiert: {manifest_path}")
+    def update_manifest(self, date_folder):
+        """Schreibt das Manifest (Tages-Katalog) des Tages-Verzeichnisses."""
+        catalog = self.load_day_catalog(date_folder)
+        manifest_path = catalog.save()
+        print(f"✓ Manifest aktualisiert: {manifest_path} ({len(catalog)} Artikel)")
 
     def run(self):
         """Hauptfunktion - Scrapt nur neue Artikel und archiviert sie."""
@@ -710,15 +1164,19 @@ class NZZScraper:
         print(f"NZZ Scraper - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
         print(f"{'='*50}\n")
 
-        # 1. Tracking laden
+        # 1. Tracking laden (und einen abgebrochenen Run abschliessen)
         tracking_data = self.load_tracked_articles()
-        print(f"ℹ {len(tracking_data['articles'])} Artikel bereits gescrapt")
+        print(f"ℹ {len(tracking_data)} Artikel bereits gescrapt")
+        self.recover(tracking_data)
 
         # 2. Login
         if not self.login():
             print("✗ Abbruch: Login fehlgeschlagen")
             return False
 
+        if self.use_browser and self.browser_page_count > 1:
+            self.open_browser_pages(self.browser_page_count)
+
         # 3. Artikel-Links holen
         all_links = self.get_article_links()
         if not all_links:
@@ -741,34 +1199,36 @@ class NZZScraper:
         date_folder = self.output_dir / today
         date_folder.mkdir(parents=True, exist_ok=True)
 
-        # 6. NUR NEUE Artikel scrapen
+        # 6.-8. NUR NEUE Artikel scrapen, jeden sofort speichern und tracken
+        self.journal.begin('scrape', [today])
         print(f"→ Scraping {len(new_links)} neue Artikel...")
-        articles = []
-        for i, link in enumerate(new_links, 1):
-            print(f"  [{i}/{len(new_links)}] {link}")
-            article = self.scrape_article(link)
-            if article:
-                articles.append(article)
-                # Sofort zum Tracking hinzufügen
-                self.add_to_tracking(tracking_data, article, today)
-
-        print(f"✓ {len(articles)} neue Artikel erfolgreich gescrapt")
-
-        # 7. Neue Artikel speichern
-        saved = self.save_articles(articles, date_folder)
+        saved = self.scrape_and_save(new_links, date_folder, tracking_data, today)
+        self.save_tracked_articles(tracking_data)
         print(f"✓ {saved} neue Artikel gespeichert in {date_folder}")
 
-        # 8. Tracking-Datei speichern
-        self.save_tracked_articles(tracking_data)
+        # 9. Manifest (Tages-Katalog) schreiben
+        self.update_manifest(date_folder)
 
-        # 9. ZIP für HEUTE erstellen (überschreibt bestehendes)
+        # 10. ZIP und JSON-Bundle für HEUTE erstellen (überschreibt bestehende)
         zip_path = self.create_zip(date_folder)
         print(f"✓ ZIP aktualisiert: {zip_path}")
-
-        # 10. Manifest aktualisieren
-        self.update_manifest(date_folder)
-
-        # 11. Browser aufräumen
+        self.create_bundle(date_folder)
+        self.journal.finish(len(tracking_data))
+
+        # 11. Caches aufräumen und Statistik ausgeben
+        if self.ai_client and self.ai_client.cache:
+            cache = self.ai_client.cache
+            cache.evict()
+            stats = cache.stats()
+            print(f"ℹ LLM-Cache: {stats['hits']} Treffer, {stats['misses']} Fehlschläge, "
+                  f"{stats['entries']} Einträge ({stats['bytes'] / 1024 / 1024:.1f} MB)")
+
+        if self.http_cache:
+            self.http_cache.evict()
+            print(f"ℹ HTTP-Cache: {self.http_cache.hits} Treffer, "
+                  f"{self.http_cache.revalidated} unverändert (304), {self.http_cache.misses} geladen")
+
+        # 12. Browser aufräumen
         self.cleanup_browser()
 
         print(f"\n{'='*50}")
@@ -789,14 +1249,30 @@ def main():
         metavar='STUNDEN',
         help='Löscht Artikel der letzten N Stunden und scrapt neu (Standard: 12)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        metavar='N',
+        help='Anzahl paralleler Worker beim Scrapen (Standard: SCRAPER_WORKERS oder 1)'
+    )
     args = parser.parse_args()
-
-    scraper = NZZScraper()
-
-    if args.rescrape is not None:
-        scraper.delete_recent_articles(hours=args.rescrape)
-
-    scraper.run()
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers muss mindestens 1 sein')
+
+    try:
+        scraper = NZZScraper(workers=args.workers)
+    except ValueError as e:
+        print(f"✗ Abbruch: {e}")
+        sys.exit(1)
+
+    try:
+        if args.rescrape is not None:
+            scraper.delete_recent_articles(hours=args.rescrape)
+
+        scraper.run()
+    except JournalError as e:
+        print(f"✗ Abbruch: {e}")
+        sys.exit(1)
 
 
 if __name__ == '__main__':
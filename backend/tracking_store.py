@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Tracking-Store - Persistente Liste aller gescrapten Artikel (SQLite).
+
+Ersetzt die frühere scraped_articles.json: Die URL ist indiziert, so dass
+"bereits gescrapt?" unabhängig von der Grösse der Historie schnell bleibt,
+und jeder Artikel wird einzeln eingefügt statt die ganze Liste neu zu
+schreiben.
+
+Zusätzlich liegen hier die Fingerprints der Artikeltexte (siehe
+fingerprint.py), um neu publizierte oder fast gleiche Artikel unter einer
+anderen URL zu erkennen. Als Duplikat erkannte URLs werden mit Verweis auf
+das Original gespeichert und nicht erneut verarbeitet.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from fingerprint import BANDS, MAX_DISTANCE, bands, hamming_distance
+
+_INT64 = 1 << 64
+
+
+def _to_signed(value):
+    """SQLite speichert nur vorzeichenbehaftete 64-Bit-Zahlen."""
+    return value - _INT64 if value >= _INT64 >> 1 else value
+
+
+class TrackingStore:
+    """Tracking gescrapter Artikel in einer SQLite-Datenbank."""
+
+    COLUMNS = ('url', 'scraped_date', 'scraped_at', 'filename', 'title')
+
+    def __init__(self, path, legacy_json=None):
+        """
+        Args:
+            path: Pfad zur SQLite-Datei (wird bei Bedarf erstellt)
+            legacy_json: Alte scraped_articles.json - wird beim ersten Öffnen
+                einer leeren Datenbank automatisch importiert
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        band_columns = ''.join(f"band{i} INTEGER NOT NULL, " for i in range(BANDS))
+        band_indexes = ''.join(
+            f"CREATE INDEX IF NOT EXISTS idx_fingerprints_band{i} ON fingerprints (band{i});"
+            for i in range(BANDS)
+        )
+
+        self._connect()
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL UNIQUE,
+                scraped_date TEXT,
+                scraped_at TEXT,
+                filename TEXT,
+                title TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_scraped_date ON articles (scraped_date);
+            CREATE INDEX IF NOT EXISTS idx_articles_scraped_at ON articles (scraped_at);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                simhash INTEGER NOT NULL,
+                {band_columns}
+                duplicate_of TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_fingerprints_hash ON fingerprints (content_hash);
+            {band_indexes}
+            CREATE INDEX IF NOT EXISTS idx_fingerprints_duplicate_of ON fingerprints (duplicate_of);
+        """)
+        self._conn.commit()
+
+        if legacy_json and Path(legacy_json).exists() and len(self) == 0:
+            self.migrate_json(legacy_json)
+
+    def _connect(self):
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._inode = self.path.stat().st_ino
+
+    def reopen(self):
+        """Öffnet eine neue Verbindung (z.B. nach fork(), SQLite-Verbindungen dürfen nicht geteilt werden)."""
+        with self._lock:
+            self._connect()
+
+    def refresh(self):
+        """Öffnet die Datenbank neu, falls die Datei ersetzt wurde (z.B. per rsync)."""
+        try:
+            inode = self.path.stat().st_ino
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if inode != self._inode:
+                self._conn.close()
+                self._connect()
+
+    def check(self):
+        """Prüft die Datenbank (PRAGMA quick_check) und gibt die Fehler zurück (leer = in Ordnung)."""
+        with self._lock:
+            rows = self._conn.execute("PRAGMA quick_check").fetchall()
+        return [row[0] for row in rows if row[0] != 'ok']
+
+    def __contains__(self, url):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM articles WHERE url = ?", (url,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def add(self, url, scraped_date, scraped_at, filename, title):
+        """Fügt einen Artikel hinzu (ersetzt einen bestehenden Eintrag mit gleicher URL)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM articles WHERE url = ?", (url,))
+            self._conn.execute(
+                "INSERT INTO articles (url, scraped_date, scraped_at, filename, title) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, scraped_date, scraped_at, filename, title)
+            )
+            self._conn.commit()
+
+    def remove(self, urls):
+        """Entfernt Artikel anhand ihrer URLs und gibt die Anzahl zurück.
+
+        Fingerprints der Artikel und Duplikat-Verweise auf sie werden mit
+        entfernt, damit die Duplikate beim nächsten Run neu geprüft werden.
+        """
+        params = [(url,) for url in urls]
+        with self._lock:
+            removed = self._conn.executemany("DELETE FROM articles WHERE url = ?", params).rowcount
+            self._conn.executemany(
+                "DELETE FROM fingerprints WHERE url = ? OR duplicate_of = ?",
+                [(url, url) for url in urls]
+            )
+            self._conn.commit()
+        return removed
+
+    def add_fingerprint(self, url, fingerprint, duplicate_of=None):
+        """Speichert den Fingerprint eines Artikels (optional als Duplikat eines anderen)."""
+        value = fingerprint['simhash']
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO fingerprints (url, content_hash, simhash, "
+                f"{', '.join(f'band{i}' for i in range(BANDS))}, duplicate_of) "
+                f"VALUES (?, ?, ?, {', '.join('?' * BANDS)}, ?)",
+                (url, fingerprint['content_hash'], _to_signed(value), *bands(value), duplicate_of)
+            )
+            self._conn.commit()
+
+    def find_duplicate(self, fingerprint, max_distance=MAX_DISTANCE, exclude_url=None):
+        """
+        Sucht einen gespeicherten Artikel mit gleichem oder fast gleichem Text.
+
+        Kandidaten sind Artikel mit gleichem content_hash oder mindestens
+        einem gleichen SimHash-Teil; bis MAX_DISTANCE (BANDS - 1) wird so
+        kein Treffer übersehen.
+
+        Returns:
+            Dict mit url, filename, scraped_date, distance (SimHash-Bits) und
+            exact (gleicher content_hash, also gleicher Text) oder None
+        """
+        value = fingerprint['simhash']
+        band_filter = ' OR '.join(f'f.band{i} = ?' for i in range(BANDS))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT f.url, f.content_hash, f.simhash, a.filename, a.scraped_date "
+                "FROM fingerprints f JOIN articles a ON a.url = f.url "
+                # "+": Index auf duplicate_of nicht verwenden, sonst keine Index-Suche über die Teile
+                f"WHERE +f.duplicate_of IS NULL AND f.url != ? AND (f.content_hash = ? OR {band_filter})",
+                (exclude_url or '', fingerprint['content_hash'], *bands(value))
+            ).fetchall()
+
+        best = None
+        for row in rows:
+            exact = row['content_hash'] == fingerprint['content_hash']
+            distance = 0 if exact else hamming_distance(row['simhash'] % _INT64, value)
+            # Exakter Treffer vor gleicher SimHash-Distanz
+            if distance <= max_distance and (
+                    best is None or (distance, not exact) < (best['distance'], not best['exact'])):
+                best = {'url': row['url'], 'filename': row['filename'],
+                        'scraped_date': row['scraped_date'], 'distance': distance, 'exact': exact}
+        return best
+
+    def is_duplicate(self, url):
+        """Prüft, ob eine URL als Duplikat eines gespeicherten Artikels erkannt wurde."""
+        with self._lock:
+            # Nur gültig, solange das Original gespeichert ist
+            row = self._conn.execute(
+                "SELECT 1 FROM fingerprints f JOIN articles a ON a.url = f.duplicate_of "
+                "WHERE f.url = ?", (url,)
+            ).fetchone()
+        return row is not None
+
+    def articles(self):
+        """Gibt alle Artikel als Liste von Dicts zurück (älteste zuerst)."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM articles ORDER BY id"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def articles_since(self, cursor=0, limit=200, scraped_date=None):
+        """Gibt Artikel zurück, die nach dem Cursor hinzugekommen sind.
+
+        Der Cursor ist die laufende ID der Tabelle: Neue und neu gescrapte
+        Artikel (add() ersetzt den Eintrag) erhalten immer eine höhere ID.
+
+        Returns:
+            Liste von Dicts inkl. 'id' (aufsteigend), höchstens limit Einträge
+        """
+        query = f"SELECT id, {', '.join(self.COLUMNS)} FROM articles WHERE id > ?"
+        params = [cursor]
+        if scraped_date:
+            query += " AND scraped_date = ?"
+            params.append(scraped_date)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    @property
+    def cursor(self):
+        """Höchste vergebene ID (Cursor für articles_since)."""
+        with self._lock:
+            row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'articles'").fetchone()
+        return row[0] if row else 0
+
+    @property
+    def last_updated(self):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+        return row[0] if row else None
+
+    def touch(self):
+        """Setzt den Zeitstempel der letzten Aktualisierung."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+                (datetime.now().isoformat(),)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Löscht alle Einträge."""
+        with self._lock:
+            self._conn.execute("DELETE FROM articles")
+            self._conn.execute("DELETE FROM fingerprints")
+            self._conn.commit()
+
+    def migrate_json(self, json_path):
+        """Importiert eine scraped_articles.json (Scraper oder migrate_tracking.py).
+
+        Die JSON-Datei wird danach in *.migrated umbenannt.
+        """
+        json_path = Path(json_path)
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        rows = []
+        for article in data.get('articles', []):
+            if not article.get('url'):
+                continue
+            rows.append(tuple(article.get(col) for col in self.COLUMNS))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO articles (url, scraped_date, scraped_at, filename, title) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            if data.get('last_updated'):
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+                    (data['last_updated'],)
+                )
+            self._conn.commit()
+
+        json_path.rename(json_path.with_name(json_path.name + '.migrated'))
+        print(f"✓ {len(rows)} Artikel aus {json_path.name} ins Tracking übernommen")
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
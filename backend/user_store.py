@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+User-Store - User aus users.json mit Index im Speicher.
+
+Die Datei wird nur neu gelesen, wenn sie sich geändert hat (mtime, Grösse
+oder Inode). Lookups nach Email und ID sind Dict-Zugriffe. Schreibzugriffe
+laufen unter einem Datei-Lock (mehrere Gunicorn-Worker), lesen den aktuellen
+Stand unter dem Lock neu ein und ersetzen die Datei atomar (temporäre Datei
++ Rename, siehe safe_io.py), so dass Leser nie eine halb geschriebene
+Datei sehen.
+"""
+import os
+import json
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows (nur Entwicklung): Lock nur innerhalb des Prozesses
+    fcntl = None
+
+from safe_io import atomic_write_json
+
+
+class UserStore:
+    """User-Verwaltung auf Basis von users.json."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Pfad zur users.json (wird beim ersten Schreiben erstellt)
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+        self._lock = threading.RLock()
+        self._signature = None
+        self._data = {'users': []}
+        self._by_email = {}
+        self._by_id = {}
+
+    def _file_signature(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load(self, signature):
+        """Liest die Datei und baut die Indexe neu auf."""
+        if signature is None:
+            data = {'users': []}
+        else:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+
+        self._data = data
+        self._by_email = {u['email']: u for u in data['users']}
+        self._by_id = {u['id']: u for u in data['users']}
+        self._signature = signature
+
+    def _refresh(self):
+        """Lädt neu, falls die Datei seit dem letzten Lesen geändert wurde."""
+        signature = self._file_signature()
+        if signature != self._signature:
+            self._load(signature)
+
+    @contextmanager
+    def _modify(self):
+        """Exklusiver Schreibzugriff: Lock, aktuellen Stand laden, atomar speichern."""
+        with self._lock:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, 'a') as lock_file:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    # Ein anderer Prozess könnte seit dem letzten Lesen geschrieben haben
+                    self._load(self._file_signature())
+                    before = json.dumps(self._data, sort_keys=True)
+                    yield self._data
+                    # Nur schreiben, wenn sich etwas geändert hat
+                    if json.dumps(self._data, sort_keys=True) != before:
+                        self._write(self._data)
+                finally:
+                    if fcntl:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, data):
+        """Schreibt die Datei atomar und aktualisiert die Indexe."""
+        # Passwort-Hashes: neue Datei nur für den Besitzer lesbar
+        atomic_write_json(self.path, data, new_mode=0o600, indent=2)
+        self._load(self._file_signature())
+
+    def find_by_email(self, email):
+        """Gibt den User mit dieser Email zurück oder None."""
+        with self._lock:
+            self._refresh()
+            return self._by_email.get(email)
+
+    def find_by_id(self, user_id):
+        """Gibt den User mit dieser ID zurück oder None."""
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(user_id)
+
+    def list(self):
+        """Gibt alle User zurück."""
+        with self._lock:
+            self._refresh()
+            return list(self._data['users'])
+
+    def create(self, email, password_hash, is_admin=False):
+        """Legt einen User an und gibt ihn zurück (None, wenn die Email vergeben ist)."""
+        with self._modify() as data:
+            if any(u['email'] == email for u in data['users']):
+                return None
+
+            max_id = max([int(u['id']) for u in data['users']], default=0)
+            user = {
+                'id': str(max_id + 1),
+                'email': email,
+                'password': password_hash,
+                'is_admin': is_admin,
+                'created_at': datetime.utcnow().isoformat() + 'Z'
+            }
+            data['users'].append(user)
+            return user
+
+    def set_password(self, user_id, password_hash):
+        """Setzt den Passwort-Hash eines Users. Gibt False zurück, wenn er nicht existiert."""
+        with self._modify() as data:
+            user = next((u for u in data['users'] if u['id'] == user_id), None)
+            if user:
+                user['password'] = password_hash
+            return user is not None
+
+    def delete(self, user_id):
+        """Löscht einen User. Gibt False zurück, wenn er nicht existiert."""
+        with self._modify() as data:
+            remaining = [u for u in data['users'] if u['id'] != user_id]
+            found = len(remaining) != len(data['users'])
+            data['users'] = remaining
+            return found
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Verifikation der Artikel-Extraktion gegen gespeicherte Seiten.
+
+Standard: Prüft NZZScraper.extract_article() gegen den eingecheckten
+Korpus in fixtures/extraction/. Zu jeder Seite (<name>.html) liegt in
+<name>.expected.json die Ausgabe des ursprünglichen Extraktors (Titel,
+Kategorie, Markdown-Content) sowie URL und Pfad (Requests oder Browser).
+Jede Abweichung wird mit Diff ausgegeben. Ein Wechsel des Parsers
+(HTML_PARSER) oder eine Änderung am Extraktor geht erst produktiv, wenn
+hier alle Seiten identisch sind.
+
+Mit --cache werden zusätzlich alle Artikelseiten aus dem HTTP-Cache
+(articles/http_cache.db) mit zwei Parsern durchgespielt und verglichen
+(inkl. Zeit pro Seite).
+
+Verwendung:
+    python verify_extraction.py [--parser lxml]
+    python verify_extraction.py --cache [--parsers lxml html.parser] [--browser]
+"""
+import os
+import re
+import sys
+import json
+import time
+import difflib
+import argparse
+from pathlib import Path
+from urllib.parse import urlparse
+
+from http_cache import HTTPCache
+from scraper import NZZScraper
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures' / 'extraction'
+# Felder, die der ursprüngliche Extraktor geliefert hat (Datum hängt bei fehlendem <time> von der Uhr ab)
+COMPARED_FIELDS = ('title', 'category', 'content')
+
+
+def is_article_url(url):
+    """Artikel-URLs haben die Form /<rubrik>/<slug>.<id> (wie beim Link-Sammeln)."""
+    return bool(re.match(r'^/[\w-]+/[\w-]+\.\d+$', urlparse(url).path))
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    """Liefert (name, html, expected) für alle Seiten des Korpus."""
+    for html_path in sorted(Path(fixtures_dir).glob('*.html')):
+        expected_path = html_path.with_name(html_path.stem + '.expected.json')
+        with open(expected_path, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+        yield html_path.stem, html_path.read_text(encoding='utf-8'), expected
+
+
+def verify_fixtures(scraper, fixtures_dir=FIXTURES_DIR):
+    """
+    Vergleicht extract_article() mit der erwarteten Ausgabe jeder Seite.
+
+    Returns:
+        Liste der Namen abweichender Seiten
+    """
+    mismatches = []
+    pages = 0
+    for name, html, expected in load_fixtures(fixtures_dir):
+        pages += 1
+        result = scraper.extract_article(html, expected['url'], browser=expected['browser'])
+        fields = [field for field in COMPARED_FIELDS if result[field] != expected[field]]
+        if not fields:
+            print(f"  ✓ {name}")
+            continue
+
+        mismatches.append(name)
+        print(f"  ✗ {name}: Abweichung in {', '.join(fields)}")
+        for field in fields:
+            diff = difflib.unified_diff(
+                str(expected[field]).splitlines(), str(result[field]).splitlines(),
+                fromfile=f"{field} (erwartet)", tofile=f"{field} ({scraper.html_parser})",
+                lineterm=''
+            )
+            for line in diff:
+                print(f"      {line}")
+
+    print(f"\n✓ {pages} Seiten geprüft" if pages else f"⚠ Keine Seiten in {fixtures_dir}")
+    return mismatches
+
+
+def compare_cache(scraper, cache_path, parsers, browser=False):
+    """
+    Spielt alle Artikelseiten aus dem HTTP-Cache mit zwei Parsern durch.
+
+    Returns:
+        Liste der URLs mit abweichender Extraktion
+    """
+    cache = HTTPCache(cache_path)
+    timings = {parser: 0.0 for parser in parsers}
+    pages = 0
+    mismatches = []
+
+    for url, resp in cache.iter_responses():
+        if not is_article_url(url):
+            continue
+
+        html = resp.text
+        results = {}
+        for parser in parsers:
+            scraper.html_parser = parser
+            started = time.perf_counter()
+            results[parser] = scraper.extract_article(html, url, browser=browser)
+            timings[parser] += time.perf_counter() - started
+
+        pages += 1
+        first, second = (results[p] for p in parsers)
+        first.pop('date')
+        second.pop('date')
+        if first != second:
+            fields = [key for key in first if first[key] != second[key]]
+            mismatches.append(url)
+            print(f"⚠ Abweichung in {', '.join(fields)}: {url}")
+
+    print(f"✓ {pages} Artikelseiten geprüft")
+    for parser, seconds in timings.items():
+        per_page = seconds / pages * 1000 if pages else 0
+        print(f"  {parser}: {seconds:.2f}s ({per_page:.1f} ms/Seite)")
+    return mismatches
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Artikel-Extraktion gegen gespeicherte Seiten prüfen')
+    arg_parser.add_argument('--parser', default=None,
+                            help='Zu prüfender Parser für den Korpus (Standard: HTML_PARSER)')
+    arg_parser.add_argument('--fixtures', default=FIXTURES_DIR,
+                            help='Verzeichnis mit dem Korpus (Standard: fixtures/extraction)')
+    arg_parser.add_argument('--cache', nargs='?', const='', default=None, metavar='PFAD',
+                            help='Zusätzlich zwei Parser auf dem HTTP-Cache vergleichen '
+                                 '(Standard: OUTPUT_DIR/http_cache.db)')
+    arg_parser.add_argument('--parsers', nargs=2, default=['lxml', 'html.parser'],
+                            metavar=('PARSER', 'REFERENZ'),
+                            help='Parser für --cache: zu prüfender Parser und Referenz-Parser')
+    arg_parser.add_argument('--browser', action='store_true',
+                            help='--cache: Selektoren und Bereinigung der Browser-Session verwenden')
+    args = arg_parser.parse_args()
+
+    scraper = NZZScraper()
+    if args.parser:
+        scraper.html_parser = args.parser
+
+    print(f"\n{'='*50}")
+    print(f"Extraktion ({scraper.html_parser}) gegen Korpus")
+    print(f"{'='*50}\n")
+    mismatches = verify_fixtures(scraper, args.fixtures)
+
+    if args.cache is not None:
+        cache_path = Path(args.cache or Path(os.getenv('OUTPUT_DIR', './articles')) / 'http_cache.db')
+        print(f"\n{'='*50}")
+        print(f"HTTP-Cache: {args.parsers[0]} vs. {args.parsers[1]}")
+        print(f"{'='*50}\n")
+        if not cache_path.exists():
+            print(f"✗ HTTP-Cache nicht gefunden: {cache_path}")
+            sys.exit(1)
+        mismatches += compare_cache(scraper, cache_path, args.parsers, args.browser)
+
+    print(f"\n{'='*50}")
+    if mismatches:
+        print(f"⚠ {len(mismatches)} Seiten mit abweichender Extraktion")
+    else:
+        print(f"✓ Keine Abweichungen")
+    print(f"{'='*50}\n")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+ZIP-Hilfsfunktionen für die Tages-Archive.
+
+Ein Tages-Archiv wird bei jedem Scraper-Run aktualisiert. Statt alle
+Dateien neu zu komprimieren, übernimmt update_zip() die bereits
+komprimierten Bytes unveränderter Dateien direkt aus dem alten Archiv und
+komprimiert nur neue oder geänderte Dateien. Das neue Archiv ersetzt das
+alte atomar (temporäre Datei + fsync + Rename, siehe safe_io.py).
+
+Für den Zugriff auf einzelne Artikel hält ZipIndex das Central Directory
+der Archive im Speicher. Ein Member kann so ohne Lesen des ganzen Archivs
+ausgeliefert werden - bei Deflate-Kompression sogar ohne Entpacken, indem
+die komprimierten Bytes in einen gzip-Rahmen gesetzt werden. Das gilt auch
+für Tages-ZIPs, die unkomprimiert in einem Monats-Pack liegen (siehe
+month_pack.py): FileWindow macht einen Member des Packs als eigene Datei
+lesbar.
+"""
+import io
+import os
+import time
+import zlib
+import struct
+import zipfile
+import threading
+from pathlib import Path
+
+from safe_io import atomic_file
+
+# Local File Header (siehe PKWARE APPNOTE 4.3.7)
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+_FILENAME_LENGTH = 10
+_EXTRA_LENGTH = 11
+
+# gzip-Header (RFC 1952): Magic, Deflate, keine Flags, keine mtime, kein Extra, OS unbekannt
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+_CHUNK_SIZE = 64 * 1024
+
+
+def _zip_date_time(mtime):
+    """Zeitstempel wie ihn ZIP speichert (lokale Zeit, 2-Sekunden-Auflösung)."""
+    t = time.localtime(mtime)
+    return t[:5] + (t[5] // 2 * 2,)
+
+
+def member_data_offset(fp, info, base=0):
+    """
+    Gibt die Position der komprimierten Daten eines Members in der Datei zurück.
+
+    Args:
+        base: Position des Archivs in der Datei (Archiv in einem Monats-Pack)
+    """
+    fp.seek(base + info.header_offset)
+    header = fp.read(_LOCAL_HEADER.size)
+    fields = _LOCAL_HEADER.unpack(header)
+    if fields[0] != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Ungültiger Local Header für {info.filename}")
+    return base + info.header_offset + _LOCAL_HEADER.size + fields[_FILENAME_LENGTH] + fields[_EXTRA_LENGTH]
+
+
+def read_member_raw(zf, info):
+    """Liest die komprimierten Bytes eines Members, ohne sie zu entpacken."""
+    fp = zf.fp
+    fp.seek(member_data_offset(fp, info))
+    return fp.read(info.compress_size)
+
+
+def write_member_raw(zf, info, raw):
+    """Schreibt einen bereits komprimierten Member unverändert in ein offenes ZIP."""
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+    zinfo.external_attr = info.external_attr
+
+    # Entspricht dem, was ZipFile.writestr() intern macht - nur ohne Kompression
+    with zf._lock:
+        zinfo.header_offset = zf.fp.tell()
+        zf.fp.write(zinfo.FileHeader())
+        zf.fp.write(raw)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+        zf._didModify = True
+
+
+def update_zip(zip_path, source_dir, arc_root, files=None):
+    """
+    Schreibt alle Dateien aus source_dir inkrementell nach zip_path.
+
+    Dateien, deren Grösse und Änderungszeit mit dem Eintrag im bestehenden
+    Archiv übereinstimmen, werden ohne erneute Kompression übernommen.
+    Gelöschte Dateien fehlen im neuen Archiv.
+
+    Args:
+        zip_path: Ziel-Archiv (wird atomar ersetzt)
+        source_dir: Verzeichnis mit den zu archivierenden Dateien
+        arc_root: Basis für die Pfade im Archiv
+        files: Optional die Liste der Dateien (z.B. aus dem Tages-Katalog),
+            sonst werden alle Dateien in source_dir gesucht
+
+    Returns:
+        Dict mit Anzahl übernommener ('reused') und neu komprimierter
+        ('compressed') Dateien
+    """
+    zip_path = Path(zip_path)
+    stats = {'reused': 0, 'compressed': 0}
+
+    old_zf = None
+    if zip_path.exists():
+        try:
+            old_zf = zipfile.ZipFile(zip_path, 'r')
+        except zipfile.BadZipFile:
+            print(f"⚠ Bestehendes ZIP beschädigt, erstelle neu: {zip_path}")
+
+    try:
+        with atomic_file(zip_path) as f, zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as new_zf:
+            paths = Path(source_dir).rglob('*') if files is None else map(Path, files)
+            for file_path in sorted(paths):
+                if not file_path.is_file():
+                    continue
+
+                arcname = file_path.relative_to(arc_root).as_posix()
+                st = file_path.stat()
+                old_info = old_zf.NameToInfo.get(arcname) if old_zf else None
+
+                if (old_info is not None
+                        and old_info.file_size == st.st_size
+                        and old_info.date_time == _zip_date_time(st.st_mtime)):
+                    write_member_raw(new_zf, old_info, read_member_raw(old_zf, old_info))
+                    stats['reused'] += 1
+                else:
+                    new_zf.write(file_path, arcname)
+                    stats['compressed'] += 1
+    finally:
+        if old_zf:
+            old_zf.close()
+
+    return stats
+
+
+class FileWindow(io.RawIOBase):
+    """
+    Ein Ausschnitt einer Datei als eigene, lesbare Datei.
+
+    Liest per pread, mehrere Fenster auf dieselbe Datei teilen sich keine
+    Position. Wird z.B. für unkomprimierte Member eines Monats-Packs
+    verwendet (Download mit Byte-Ranges, zipfile auf dem inneren ZIP).
+    """
+
+    def __init__(self, path, offset, size):
+        super().__init__()
+        self._fp = open(path, 'rb')
+        self.offset = offset
+        self.size = size
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += self.size
+        if pos < 0:
+            raise ValueError(f"Negative Position: {pos}")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        length = max(0, min(len(buffer), self.size - self._pos))
+        if not length:
+            return 0
+        data = os.pread(self._fp.fileno(), length, self.offset + self._pos)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._fp.close()
+        super().close()
+
+
+class ZipMember:
+    """Ein Member in einem geöffneten Archiv (siehe ZipIndex.open_member)."""
+
+    def __init__(self, fp, info, data_offset):
+        self.fp = fp
+        self.info = info
+        self.data_offset = data_offset
+
+    @property
+    def size(self):
+        return self.info.file_size
+
+    @property
+    def is_deflated(self):
+        return self.info.compress_type == zipfile.ZIP_DEFLATED
+
+    def gzip_size(self):
+        """Grösse von iter_gzip() in Bytes."""
+        return len(_GZIP_HEADER) + self.info.compress_size + 8
+
+    def _iter_raw(self):
+        remaining = self.info.compress_size
+        offset = self.data_offset
+        while remaining > 0:
+            chunk = os.pread(self.fp.fileno(), min(_CHUNK_SIZE, remaining), offset)
+            if not chunk:
+                raise zipfile.BadZipFile(f"Archiv zu kurz für {self.info.filename}")
+            offset += len(chunk)
+            remaining -= len(chunk)
+            yield chunk
+
+    def iter_gzip(self):
+        """Liefert den Member als gzip-Stream, ohne die Deflate-Daten anzufassen."""
+        try:
+            yield _GZIP_HEADER
+            yield from self._iter_raw()
+            yield struct.pack('<LL', self.info.CRC, self.info.file_size & 0xFFFFFFFF)
+        finally:
+            self.close()
+
+    def iter_content(self):
+        """Liefert den entpackten Inhalt des Members."""
+        try:
+            if self.info.compress_type == zipfile.ZIP_STORED:
+                yield from self._iter_raw()
+                return
+            if not self.is_deflated:
+                raise zipfile.BadZipFile(f"Kompression nicht unterstützt: {self.info.filename}")
+            inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+            for chunk in self._iter_raw():
+                data = inflater.decompress(chunk)
+                if data:
+                    yield data
+            data = inflater.flush()
+            if data:
+                yield data
+        finally:
+            self.close()
+
+    def close(self):
+        self.fp.close()
+
+
+class ZipIndex:
+    """
+    Cache der Central Directories mehrerer Archive.
+
+    Ein Archiv wird neu eingelesen, sobald sich Grösse, Änderungszeit oder
+    Inode der Datei ändern (update_zip ersetzt Archive per Rename). Die
+    Position der Daten eines Members wird beim ersten Zugriff ermittelt und
+    ebenfalls gemerkt. Ein unkomprimiertes ZIP in einem Archiv (Tages-ZIP
+    im Monats-Pack) wird wie ein eigenes Archiv behandelt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (Pfad, inneres ZIP) -> (Datei-Signatur, {Name: ZipInfo}, {Name: Offset}, Position)
+        self._archives = {}
+
+    def _members(self, path, fp, inner=None):
+        st = os.fstat(fp.fileno())
+        signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        key = (path, inner)
+
+        with self._lock:
+            cached = self._archives.get(key)
+        if cached and cached[0] == signature:
+            return cached
+
+        if inner is None:
+            base = 0
+            with zipfile.ZipFile(fp) as zf:
+                infos = {info.filename: info for info in zf.infolist()}
+        else:
+            located = self._data_offset(path, fp, inner)
+            if located is None:
+                return None
+            info, base = located
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise zipfile.BadZipFile(f"Inneres ZIP ist komprimiert: {inner}")
+            with FileWindow(path, base, info.file_size) as window, zipfile.ZipFile(window) as zf:
+                infos = {info.filename: info for info in zf.infolist()}
+
+        cached = (signature, infos, {}, base)
+        with self._lock:
+            self._archives[key] = cached
+        return cached
+
+    def _data_offset(self, path, fp, name, inner=None):
+        cached = self._members(path, fp, inner)
+        if cached is None:
+            return None
+        _, infos, offsets, base = cached
+        info = infos.get(name)
+        if info is None or info.is_dir():
+            return None
+
+        offset = offsets.get(name)
+        if offset is None:
+            offset = offsets[name] = member_data_offset(fp, info, base)
+        return info, offset
+
+    def locate(self, zip_path, name):
+        """
+        Sucht einen Member, ohne ihn zu öffnen.
+
+        Returns:
+            (ZipInfo, Position der Daten in der Datei) oder None
+        """
+        path = str(zip_path)
+        try:
+            with open(path, 'rb') as fp:
+                return self._data_offset(path, fp, name)
+        except FileNotFoundError:
+            return None
+
+    def open_member(self, zip_path, name, inner=None):
+        """
+        Öffnet einen Member zum Streamen.
+
+        Args:
+            inner: Optional ein unkomprimiertes ZIP in zip_path, in dem der
+                Member liegt (z.B. "<datum>.zip" in einem Monats-Pack)
+
+        Returns:
+            ZipMember (muss geschlossen bzw. vollständig gelesen werden) oder
+            None, wenn Archiv oder Member nicht existieren
+        """
+        path = str(zip_path)
+        try:
+            fp = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+
+        try:
+            located = self._data_offset(path, fp, name, inner)
+            if located is None:
+                fp.close()
+                return None
+            return ZipMember(fp, *located)
+        except BaseException:
+            fp.close()
+            raise
@@ -15,6 +15,7 @@ function ZipLoader({ onArticlesLoaded, onLoading, onError, onAvailableDatesLoade
   useEffect(() => {
     loadAvailableDates()
     loadLatestArticles()
+    registerDictionary()
   }, [])
 
   // Exportiere loadArticlesByDate Funktion
@@ -46,11 +47,125 @@ function ZipLoader({ onArticlesLoaded, onLoading, onError, onAvailableDatesLoade
     }
   }
 
+  // Kompressions-Wörterbuch einmal laden: Der Browser speichert es (Use-As-Dictionary)
+  // und holt Bundles danach wörterbuch-komprimiert (Content-Encoding: dcz).
+  // Browser ohne Unterstützung ignorieren es und laden weiter Brotli/gzip.
+  const registerDictionary = async () => {
+    try {
+      const response = await fetch(`${API_BASE}/dictionary`, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      })
+      if (!response.ok) return
+
+      const { url } = await response.json()
+      // Unveränderlich pro Version - kommt nach dem ersten Mal aus dem HTTP-Cache
+      await fetch(url, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      })
+    } catch (err) {
+      console.warn('Wörterbuch nicht geladen:', err)
+    }
+  }
+
+  // Neue Artikel mit den lokal gespeicherten zusammenführen
+  const mergeArticles = (articles) => {
+    articles.sort((a, b) => new Date(b.date) - new Date(a.date))
+
+    // Merge mit existierenden Artikeln
+    const existingArticles = JSON.parse(localStorage.getItem('nzz_articles') || '[]')
+    const mergedArticles = [...articles]
+    const newIds = new Set(articles.map(a => a.id))
+
+    // Füge Artikel hinzu die noch nicht vorhanden sind
+    existingArticles.forEach(existing => {
+      if (!newIds.has(existing.id)) {
+        mergedArticles.push(existing)
+      }
+    })
+
+    mergedArticles.sort((a, b) => new Date(b.date) - new Date(a.date))
+
+    // Speichere mit LocalStorage-Management
+    saveToLocalStorage('nzz_articles', JSON.stringify(mergedArticles))
+    onArticlesLoaded(mergedArticles)
+  }
+
+  // Aktueller Sync-Cursor des Servers (null falls nicht verfügbar)
+  const fetchSyncCursor = async () => {
+    try {
+      const response = await fetch(`${API_BASE}/sync`, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      })
+      if (!response.ok) return null
+      const data = await response.json()
+      return data.cursor
+    } catch (err) {
+      return null
+    }
+  }
+
+  // Holt nur die Artikel, die seit dem Cursor dazugekommen sind
+  const syncArticles = async (cursor) => {
+    try {
+      const articles = []
+      let more = true
+
+      while (more) {
+        const response = await fetch(`${API_BASE}/sync?since=${cursor}`, {
+          headers: {
+            'Authorization': `Bearer ${token}`
+          }
+        })
+        if (!response.ok) {
+          if (response.status === 401) { logout(); return true }
+          return false
+        }
+
+        const data = await response.json()
+        data.articles.forEach(entry => {
+          const article = parseMarkdown(entry.markdown, entry.path)
+          if (article) articles.push(article)
+        })
+        cursor = data.cursor
+        more = data.more
+      }
+
+      if (articles.length > 0) {
+        mergeArticles(articles)
+      }
+      saveToLocalStorage('nzz_sync_cursor', String(cursor))
+      return true
+    } catch (err) {
+      console.error('Fehler beim Sync:', err)
+      return false
+    }
+  }
+
   const loadArticlesByDate = async (dateString, silent = false) => {
     onLoading(true)
     if (!silent) onError(null)
 
     try {
+      // Bevorzugt das vorkomprimierte JSON-Bundle (kein ZIP, kein Parsen)
+      const bundleResponse = await fetch(`${API_BASE}/bundle/${dateString}`, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      })
+      if (bundleResponse.status === 401) { logout(); return }
+      if (bundleResponse.ok) {
+        const bundle = await bundleResponse.json()
+        mergeArticles(bundle.articles.map(buildArticle))
+        return
+      }
+
+      // Fallback: ZIP mit Markdown-Dateien (ältere Tage ohne Bundle)
       const downloadUrl = `${API_BASE}/download/${dateString}`
       const zipResponse = await fetch(downloadUrl, {
         headers: {
@@ -80,24 +195,7 @@ function ZipLoader({ onArticlesLoaded, onLoading, onError, onAvailableDatesLoade
       })
 
       await Promise.all(promises)
-      articles.sort((a, b) => new Date(b.date) - new Date(a.date))
-
-      // Merge mit existierenden Artikeln
-      const existingArticles = JSON.parse(localStorage.getItem('nzz_articles') || '[]')
-      const mergedArticles = [...articles]
-
-      // Füge Artikel hinzu die noch nicht vorhanden sind
-      existingArticles.forEach(existing => {
-        if (!mergedArticles.find(a => a.id === existing.id)) {
-          mergedArticles.push(existing)
-        }
-      })
-
-      mergedArticles.sort((a, b) => new Date(b.date) - new Date(a.date))
-
-      // Speichere mit LocalStorage-Management
-      saveToLocalStorage('nzz_articles', JSON.stringify(mergedArticles))
-      onArticlesLoaded(mergedArticles)
+      mergeArticles(articles)
 
     } catch (err) {
       console.error('Fehler beim Laden:', err)
@@ -142,6 +240,15 @@ function ZipLoader({ onArticlesLoaded, onLoading, onError, onAvailableDatesLoade
         return // Daten sind aktuell (und nicht von heute)
       }
 
+      // Gleicher Tag wie beim letzten Laden: nur neue Artikel holen statt ganzer ZIPs
+      const syncCursor = localStorage.getItem('nzz_sync_cursor')
+      if (lastUpdate === data.date && localArticles && syncCursor !== null) {
+        if (await syncArticles(syncCursor)) return
+      }
+
+      // Cursor vor dem Download holen, damit bis dahin neue Artikel beim nächsten Sync kommen
+      const startCursor = await fetchSyncCursor()
+
       // Lade ZIP
       await loadArticlesByDate(data.date)
       setLastUpdate(data.date)
@@ -155,6 +262,10 @@ function ZipLoader({ onArticlesLoaded, onLoading, onError, onAvailableDatesLoade
         await loadArticlesByDate(yesterdayStr, true)
       }
 
+      if (startCursor !== null) {
+        saveToLocalStorage('nzz_sync_cursor', String(startCursor))
+      }
+
     } catch (err) {
       console.error('Fehler beim Laden:', err)
       onError('Konnte keine neuen Artikel laden. Offline-Modus aktiv.')
@@ -197,6 +308,36 @@ function ZipLoader({ onArticlesLoaded, onLoading, onError, onAvailableDatesLoade
     }
   }
 
+  // Konvertiere Markdown zu HTML (einfache Version)
+  const markdownToHtml = (body) => {
+    return body
+      .replace(/^## (.*$)/gim, '<h2>$1</h2>')
+      .replace(/^### (.*$)/gim, '<h3>$1</h3>')
+      .replace(/^\* (.*$)/gim, '<li>$1</li>')
+      .replace(/^\- (.*$)/gim, '<li>$1</li>')
+      .replace(/\*\*(.*)\*\*/gim, '<strong>$1</strong>')
+      .replace(/\*(.*)\*/gim, '<em>$1</em>')
+      .replace(/\[([^\]]+)\]\(([^)]+)\)/gim, '<a href="$2" target="_blank">$1</a>')
+      .replace(/\n/gim, '<br>')
+  }
+
+  // Artikel-Objekt aus den Feldern eines Markdown-Artikels bzw. Bundle-Eintrags
+  const buildArticle = ({ path, title, date, category, url, summary, content }) => {
+    // Generiere ID aus URL oder Pfad
+    const id = url || path.replace(/[^a-zA-Z0-9]/g, '_')
+
+    return {
+      id,
+      title: title || 'Unbekannter Titel',
+      date: date || new Date().toISOString(),
+      category: (category || 'allgemein').toLowerCase(),
+      url: url || '',
+      content: markdownToHtml(content),
+      rawContent: content,
+      summary: summary || ''
+    }
+  }
+
   const parseMarkdown = (content, path) => {
     try {
       // Extrahiere Metadaten aus dem Markdown
@@ -260,30 +401,7 @@ function ZipLoader({ onArticlesLoaded, onLoading, onError, onAvailableDatesLoade
 
       const body = bodyLines.join('\n')
 
-      // Konvertiere Markdown zu HTML (einfache Version)
-      const htmlContent = body
-        .replace(/^## (.*$)/gim, '<h2>$1</h2>')
-        .replace(/^### (.*$)/gim, '<h3>$1</h3>')
-        .replace(/^\* (.*$)/gim, '<li>$1</li>')
-        .replace(/^\- (.*$)/gim, '<li>$1</li>')
-        .replace(/\*\*(.*)\*\*/gim, '<strong>$1</strong>')
-        .replace(/\*(.*)\*/gim, '<em>$1</em>')
-        .replace(/\[([^\]]+)\]\(([^)]+)\)/gim, '<a href="$2" target="_blank">$1</a>')
-        .replace(/\n/gim, '<br>')
-
-      // Generiere ID aus URL oder Pfad
-      const id = url || path.replace(/[^a-zA-Z0-9]/g, '_')
-
-      return {
-        id,
-        title: title || 'Unbekannter Titel',
-        date: date || new Date().toISOString(),
-        category: category.toLowerCase(),
-        url: url || '',
-        content: htmlContent,
-        rawContent: body,
-        summary: summary
-      }
+      return buildArticle({ path, title, date, category, url, summary, content: body })
 
     } catch (e) {
       console.error('Fehler beim Parsen:', e)